@@ -0,0 +1,324 @@
+from typing import Any, Dict, List, Mapping, Optional, Tuple, cast
+
+from apple import Apple
+from bomb import Bomb
+from events import AppleEaten, BoardFull, SnakeDied, SnakeGrew
+from game import Game
+from game_config import GameConfig
+from printable_object import PrintableObject
+from snake import Snake, Direction
+
+
+class Arena(Game):
+    """
+    a game of many snakes sharing a single board.
+
+    the board keeps, per cell, the elements occupying it, so all the
+    collisions of a turn are resolved in a single pass over the cells the
+    heads of the snakes have entered: a snake dies once its head shares a
+    cell with another snake (either its head or its body), with a bomb or
+    with the rest of its own body, or leaves the board. the cost of a turn
+    grows with the amount of snakes, rather than with the amount of pairs of
+    snakes.
+
+    the game ends once all the snakes have died. the score of the game is
+    the total score of all the snakes.
+    """
+    SNAKE_CRASH = "snake"
+    # how many random cells to try when placing a new snake.
+    SNAKE_PLACEMENT_ATTEMPTS = 64
+
+    def __init__(self,
+                 config: Optional[GameConfig] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        create a new arena, with no snakes.
+
+        :param config: the configuration of the arena (the default
+                       configuration if None).
+        :param seed: the seed of the random draws of the arena (None for a
+                     seed drawn by the operating system).
+        """
+        super().__init__(config, seed)
+        # snake id -> snake, only the snakes which are still alive.
+        self._snakes = {}  # type: Dict[int, Snake]
+        # id(snake) -> snake id, to identify the snakes found on the board.
+        self._snake_ids = {}  # type: Dict[int, int]
+        self._next_snake_id = 0
+        # snake id -> its score, of all the snakes ever added.
+        self._snake_scores = {}  # type: Dict[int, int]
+        # snake id -> why it have died.
+        self._snake_death_causes = {}  # type: Dict[int, str]
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._snake_ids = {
+            id(snake): snake_id for snake_id, snake in self._snakes.items()
+        }
+
+    def _clone_snakes(self,
+                      game: Game,
+                      replacements: Dict[int, PrintableObject]) -> None:
+        arena = cast(Arena, game)
+        arena._snakes = {}
+        arena._snake_ids = {}
+        for snake_id, snake in self._snakes.items():
+            snake_clone = snake.clone()
+            replacements[id(snake)] = snake_clone
+            arena._snakes[snake_id] = snake_clone
+            arena._snake_ids[id(snake_clone)] = snake_id
+        arena._snake_scores = dict(self._snake_scores)
+        arena._snake_death_causes = dict(self._snake_death_causes)
+
+    def _snakes_length(self) -> int:
+        return sum(snake.get_length() for snake in self._snakes.values())
+
+    def create_snake(self) -> None:
+        """
+        create a new snake at a random location (see "add_snake").
+        """
+        self.add_snake()
+
+    def add_snake(self,
+                  location: Optional[Tuple[int, int]] = None) -> Optional[int]:
+        """
+        add a new snake to the arena.
+
+        :param location: where to initially locate the head of the snake
+                         (the rest of its body is below it), a random
+                         location by default.
+        :return: the id of the new snake, or None if there is no room for it.
+        """
+        attempts = 1 if location is not None else \
+            self.SNAKE_PLACEMENT_ATTEMPTS
+
+        for _ in range(attempts):
+            head = location or self._board.random_empty_cell(self._random)
+            if head is None:
+                return None
+
+            snake = Snake(head)
+            if self._board.add_element(snake):
+                snake_id = self._next_snake_id
+                self._next_snake_id += 1
+                self._snakes[snake_id] = snake
+                self._snake_ids[id(snake)] = snake_id
+                self._snake_scores[snake_id] = 0
+                return snake_id
+
+        return None
+
+    def single_turn(self,
+                    directions: Mapping[int, Optional[Direction]]) -> None:
+        """
+        execute a single turn of all the snakes: each snake might change its
+        direction & moves, then the collisions are settled (see "Arena"),
+        the surviving snakes eat the apples their heads have reached & the
+        bombs are "detonated" (see "Game.single_turn"). when profiled, the
+        phases are recorded as "move", "collide", "eat" & "bombs" (see
+        "Game.set_profiler").
+
+        :param directions: snake id -> in which direction the snake should
+                           move (snakes which are missing keep their
+                           direction).
+        """
+        start = lap = self._profiler.clock() \
+            if self._profiler is not None else 0
+
+        # cell -> the snakes whose heads have entered it.
+        heads = {}  # type: Dict[Tuple[int, int], List[int]]
+        for snake_id, snake in self._snakes.items():
+            direction = directions.get(snake_id)
+            if direction is not None:
+                snake.change_direction(direction)
+            snake.move()
+            head = snake.get_head()
+            vacated = snake.get_vacated_cell()
+            self._board.move_element(snake,
+                                     [head],
+                                     [vacated] if vacated is not None else [])
+            if vacated is None and self._sinks:
+                self._emit(SnakeGrew(snake.get_length(), snake_id))
+            heads.setdefault(head, []).append(snake_id)
+        if self._profiler is not None:
+            lap = self._lap("move", lap)
+
+        deaths, eaten_apples = self._collide_heads(heads)
+        for snake_id, cause in deaths.items():
+            self._kill(snake_id, cause)
+        if self._profiler is not None:
+            lap = self._lap("collide", lap)
+        if deaths and not self._snakes:
+            # the game ends by the cause of the last snake to die, i.e. the
+            # last one killed in this turn.
+            self._end(deaths[next(reversed(deaths))])
+            if self._profiler is not None:
+                self._lap("turn", start)
+            return
+
+        for snake_id, apples in eaten_apples:
+            for apple in apples:
+                self._score += apple.get_score()
+                self._snake_scores[snake_id] += apple.get_score()
+                if self._sinks:
+                    self._emit(AppleEaten(apple.coordinate, apple.get_score(),
+                                          snake_id))
+                self._snakes[snake_id].eat_apple(self._config.apple_growth)
+        self._replace_apples([apple for _, apples in eaten_apples
+                              for apple in apples])
+        if self._profiler is not None:
+            lap = self._lap("eat", lap)
+        if not self._playing:
+            # the board is full.
+            if self._profiler is not None:
+                self._lap("turn", start)
+            return
+
+        self._detonate_bombs()
+        if self._profiler is not None:
+            self._lap("bombs", lap)
+            self._lap("turn", start)
+
+    def _collide_heads(
+            self,
+            heads: Dict[Tuple[int, int], List[int]]
+    ) -> Tuple[Dict[int, str], List[Tuple[int, List[Apple]]]]:
+        """
+        settle the collisions within the cells the heads of the snakes have
+        entered.
+
+        :param heads: cell -> the snakes whose heads have entered it.
+        :return: the snakes which have died & their death causes, & the
+                 apples eaten by each of the surviving snakes.
+        """
+        deaths = {}  # type: Dict[int, str]
+        eaten_apples = []  # type: List[Tuple[int, List[Apple]]]
+
+        for cell, snake_ids in heads.items():
+            if not self._board.is_cell_in_board(cell):
+                for snake_id in snake_ids:
+                    deaths[snake_id] = Game.WALL_CRASH
+                continue
+
+            snakes = 0
+            bomb_found = False
+            apples = []  # type: List[Apple]
+            for element in self._board.get_elements_at(cell):
+                if isinstance(element, Snake):
+                    snakes += 1
+                elif isinstance(element, Bomb):
+                    bomb_found = True
+                elif isinstance(element, Apple):
+                    apples.append(element)
+
+            for snake_id in snake_ids:
+                if bomb_found:
+                    deaths[snake_id] = Game.BOMB_CRASH
+                elif snakes > 1:
+                    deaths[snake_id] = Arena.SNAKE_CRASH
+                elif self._snakes[snake_id].get_occupancy(cell) > 1:
+                    deaths[snake_id] = Game.SELF_CRASH
+                elif apples:
+                    eaten_apples.append((snake_id, apples))
+
+        return deaths, eaten_apples
+
+    def _collide(
+            self,
+            cells: List[Tuple[int, int]]) -> Tuple[Optional[str], List[Apple]]:
+        """
+        settle the collisions within the cells the shock-wave ripples have
+        entered: the snakes found there are exploded, as well as the apples.
+
+        :param cells: the cells which have changed.
+        :return: the cause of the end of the game (None if some snake is
+                 still alive) & the apples that have been hit.
+        """
+        hit_apples = []  # type: List[Apple]
+        killed = False
+
+        for cell in cells:
+            apples = []  # type: List[Apple]
+            for element in self._board.get_elements_at(cell):
+                if isinstance(element, Snake):
+                    self._kill(self._snake_ids[id(element)], Game.BOMB_CRASH)
+                    killed = True
+                elif isinstance(element, Apple):
+                    apples.append(element)
+            hit_apples.extend(apples)
+
+        if killed and not self._snakes:
+            return Game.BOMB_CRASH, hit_apples
+        return None, hit_apples
+
+    def _shockwaves_hits(
+            self,
+            bombs: List[Bomb]) -> Tuple[Optional[str], List[Apple]]:
+        """
+        explode the snakes & the apples hit by the given bombs, without
+        evaluating the cells of their shock-wave ripples.
+
+        :param bombs: bombs which have just moved.
+        :return: the cause of the end of the game (None if some snake is
+                 still alive) & the apples that have been exploded.
+        """
+        exploded = [snake_id for snake_id, snake in self._snakes.items()
+                    if any(bomb.hits(cell)
+                           for cell in snake.get_coordinates()
+                           for bomb in bombs)]
+        for snake_id in exploded:
+            self._kill(snake_id, Game.BOMB_CRASH)
+
+        exploded_apples = [apple for apple in self._apples
+                           if any(bomb.hits(apple.coordinate)
+                                  for bomb in bombs)]
+
+        if exploded and not self._snakes:
+            return Game.BOMB_CRASH, exploded_apples
+        return None, exploded_apples
+
+    def _kill(self, snake_id: int, cause: str) -> None:
+        """
+        remove a snake from the arena.
+
+        :param snake_id: the id of the snake.
+        :param cause: why the snake have died.
+        """
+        snake = self._snakes.pop(snake_id)
+        del self._snake_ids[id(snake)]
+        self._snake_death_causes[snake_id] = cause
+        self._board.remove_element(snake)
+        if self._sinks:
+            self._emit(SnakeDied(cause, snake_id))
+
+    def _end(self, cause: str) -> None:
+        # the deaths of the snakes are emitted as they occur (see "_kill").
+        self._playing = False
+        self._death_cause = cause
+        if self._sinks and cause == Game.BOARD_FULL:
+            self._emit(BoardFull())
+
+    def get_snakes(self) -> Dict[int, Snake]:
+        """
+        return the snakes which are still alive, by their ids.
+        """
+        return dict(self._snakes)
+
+    def is_alive(self, snake_id: int) -> bool:
+        """
+        check if a snake is still alive.
+        """
+        return snake_id in self._snakes
+
+    def get_snake_score(self, snake_id: int) -> int:
+        """
+        return the score of a snake.
+        """
+        return self._snake_scores[snake_id]
+
+    def get_snake_death_cause(self, snake_id: int) -> Optional[str]:
+        """
+        return why a snake have died (see "Game.get_death_cause" &
+        "SNAKE_CRASH"), None if it's still alive.
+        """
+        return self._snake_death_causes.get(snake_id)
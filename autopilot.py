@@ -0,0 +1,678 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import engine
+
+from bomb import Bomb
+from game import Game
+from snake import Snake, Direction
+
+# the distance of the cells from which no source can be reached within the
+# horizon of the field (see "DistanceField").
+UNREACHABLE = 1 << 30
+
+# the shock-wave of a bomb (see "Autopilot._ripples").
+Ripple = Tuple[int, int, int, int]
+
+STEPS = {
+    Direction.UP: (0, 1),
+    Direction.DOWN: (0, -1),
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+}
+OPPOSITES = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.RIGHT: Direction.LEFT,
+    Direction.LEFT: Direction.RIGHT,
+}
+
+
+class DistanceField:
+    """
+    the distance of each cell of a board from its nearest source cell, through
+    cells which aren't blocked, up to a horizon: the cells farther than the
+    horizon from every source are unreachable.
+
+    the field is repaired rather than re-evaluated as cells are blocked &
+    freed & as sources come & go: the cells whose distances might have grown
+    (those which have lost every neighbor one step closer to a source) are
+    invalidated, then the invalidated cells & the cells which might have
+    come closer are settled outward in the order of their distances. the
+    cost of an update is about the amount of cells whose distances actually
+    change, which the horizon bounds by the area around the changed cells,
+    rather than the area of the board.
+
+    only the cells within the horizon of the sources & the blocked cells
+    are kept (the neighbors are evaluated on demand), so the field is as
+    sparse as the board.
+    """
+    HORIZON = 32
+
+    def __init__(self,
+                 length: int,
+                 height: int,
+                 horizon: int = HORIZON) -> None:
+        """
+        create a new field, with no sources & no blocked cells.
+
+        :param length: the length of the board.
+        :param height: the height of the board.
+        :param horizon: the largest distance kept by the field.
+        """
+        self._length = length
+        self._height = height
+        self._horizon = horizon
+        # cell index -> the amount of obstacles occupying the cell (only the
+        # blocked cells).
+        self._obstacles = {}  # type: Dict[int, int]
+        self._sources = set()  # type: Set[int]
+        # cell index -> its distance (only the reachable cells).
+        self._distances = {}  # type: Dict[int, int]
+
+    def index(self, cell: Tuple[int, int]) -> Optional[int]:
+        """
+        return the index of a cell, None if it's out of the bounds of the
+        board.
+        """
+        column, row = cell
+        if 0 <= column < self._length and 0 <= row < self._height:
+            return column * self._height + row
+        return None
+
+    def get_height(self) -> int:
+        """
+        return the height of the board.
+        """
+        return self._height
+
+    def get_horizon(self) -> int:
+        """
+        return the largest distance kept by the field.
+        """
+        return self._horizon
+
+    def get_distance(self, index: int) -> int:
+        """
+        return the distance of a cell from the nearest source ("UNREACHABLE"
+        if no source can be reached from the cell within the horizon).
+        """
+        return self._distances.get(index, UNREACHABLE)
+
+    def is_blocked(self, index: int) -> bool:
+        """
+        check if a cell is occupied by an obstacle.
+        """
+        return index in self._obstacles
+
+    def get_neighbors(self, index: int) -> List[int]:
+        """
+        return the indices of the neighbors of a cell, where the index of a
+        cell is column * height + row.
+        """
+        height = self._height
+        column, row = divmod(index, height)
+        neighbors = []  # type: List[int]
+        if column > 0:
+            neighbors.append(index - height)
+        if column < self._length - 1:
+            neighbors.append(index + height)
+        if row > 0:
+            neighbors.append(index - 1)
+        if row < height - 1:
+            neighbors.append(index + 1)
+        return neighbors
+
+    def update(self,
+               blocked: Iterable[int] = (),
+               freed: Iterable[int] = (),
+               added_sources: Iterable[int] = (),
+               removed_sources: Iterable[int] = ()) -> None:
+        """
+        apply a batch of changes & repair the distances.
+        a cell may be occupied by several obstacles, it's blocked as long as
+        any of them is still there.
+
+        :param blocked: cells an obstacle has entered.
+        :param freed: cells an obstacle has left.
+        :param added_sources: cells which have become sources.
+        :param removed_sources: cells which are no longer sources.
+        """
+        obstacles = self._obstacles
+        # cell -> whether or not it was blocked before the batch.
+        touched = {}  # type: Dict[int, bool]
+        for index in blocked:
+            touched.setdefault(index, index in obstacles)
+            obstacles[index] = obstacles.get(index, 0) + 1
+        for index in freed:
+            touched.setdefault(index, index in obstacles)
+            obstacles[index] -= 1
+            if obstacles[index] == 0:
+                del obstacles[index]
+
+        raised = []  # type: List[int]
+        lowered = []  # type: List[int]
+        for index, was_blocked in touched.items():
+            if index in obstacles and not was_blocked:
+                raised.append(index)
+            elif was_blocked and index not in obstacles:
+                lowered.append(index)
+        for index in removed_sources:
+            self._sources.discard(index)
+            raised.append(index)
+        for index in added_sources:
+            self._sources.add(index)
+            lowered.append(index)
+
+        self._settle(self._invalidate(raised) + lowered)
+
+    def _invalidate(self, raised: List[int]) -> List[int]:
+        """
+        forget the distances which might have grown.
+
+        :param raised: cells which have been blocked or are no longer
+                       sources.
+        :return: the cells whose distances were forgotten.
+        """
+        distances = self._distances
+        neighbors = self.get_neighbors
+        stack = []  # type: List[Tuple[int, int]]
+        for index in raised:
+            distance = distances.pop(index, None)
+            if distance is not None:
+                stack.append((index, distance))
+        invalidated = [index for index, _ in stack]
+
+        while stack:
+            index, distance = stack.pop()
+            for neighbor in neighbors(index):
+                if distances.get(neighbor) != distance + 1:
+                    continue
+                # the neighbor keeps its distance as long as another of its
+                # neighbors is as close as this cell was.
+                for other in neighbors(neighbor):
+                    if distances.get(other) == distance:
+                        break
+                else:
+                    del distances[neighbor]
+                    stack.append((neighbor, distance + 1))
+                    invalidated.append(neighbor)
+
+        return invalidated
+
+    def _settle(self, seeds: List[int]) -> None:
+        """
+        evaluate the distances of the given cells from their neighbors, &
+        propagate every distance which have shrunk, up to the horizon.
+
+        the edges are of a unit length, so rather than a priority queue,
+        the seeds are sorted once & merged with a breadth-first queue, whose
+        distances never decrease.
+        """
+        distances = self._distances
+        neighbors = self.get_neighbors
+        obstacles = self._obstacles
+        horizon = self._horizon
+        settled = []  # type: List[Tuple[int, int]]
+        for index in seeds:
+            if index in obstacles:
+                continue
+            if index in self._sources:
+                distance = 0
+            else:
+                distance = UNREACHABLE
+                for neighbor in neighbors(index):
+                    distance = min(distance,
+                                   distances.get(neighbor, UNREACHABLE))
+                distance += 1
+            if distance <= horizon and \
+                    distance < distances.get(index, UNREACHABLE):
+                distances[index] = distance
+                settled.append((distance, index))
+        settled.sort(reverse=True)
+
+        queue = deque()  # type: Deque[Tuple[int, int]]
+        while settled or queue:
+            if queue and (not settled or queue[0][0] <= settled[-1][0]):
+                distance, index = queue.popleft()
+            else:
+                distance, index = settled.pop()
+            if distance != distances.get(index) or distance == horizon:
+                continue
+            distance += 1
+            for neighbor in neighbors(index):
+                if distance < distances.get(neighbor, UNREACHABLE) and \
+                        neighbor not in obstacles:
+                    distances[neighbor] = distance
+                    queue.append((distance, neighbor))
+
+
+class Autopilot:
+    """
+    plays a snake by itself: each turn it heads toward the nearest reachable
+    apple, around the body of the snake & the blasts of the bombs, while
+    avoiding the pockets too small for the snake.
+
+    the distances from the apples are kept in a "DistanceField", which is
+    only updated with the cells which have changed since the previous turn
+    (the new head, the vacated tail, the bombs which have appeared or are
+    about to detonate, the faded shock-waves & the replaced apples), so a
+    decision costs about the same on any board size. beyond the horizon of
+    the field, the snake heads straight toward the nearest apple.
+
+    the whole blast of a bomb (every cell its shock-wave would reach) is
+    laid into the field once the body of the snake might still be within it
+    when the bomb detonates, i.e. as many turns before the detonation as it
+    takes the head to get out of the blast & the rest of the body (as long
+    as it's going to grow) to follow, so the paths lead the whole snake
+    around the blast, & is lifted once the shock-wave fades. beyond the
+    field, a move is never taken if a shock-wave would hit the body on the
+    cell it enters, if eating an apple there would keep the body within a
+    shock-wave, or if the snake would have too little room to go on without
+    being hit, counting in the turns it takes to get to each cell. still,
+    the body can't leave a cell faster than the tail gets there, so a snake
+    longer than the fuse of a bomb which appears next to its older cells
+    can't get away from it.
+
+    the room of the snake (the cells it might get to, which must be at
+    least as many as its cells) is flood filled only once in a while: a
+    fill counts up to a few times the length of the snake, & as long as the
+    head enters cells which leave the rest of the room in one piece, no
+    other cell is blocked & no shock-wave was in the way of the fill, the
+    room is known to shrink by a single cell per turn (see "_floor").
+
+    an autopilot is called with the game each turn (see "engine.Directions"
+    & "snake_main.AUTOPILOT"). it follows a single game, & starts over
+    whenever it's given another game or misses a turn.
+    """
+    # how many more turns than it takes the snake to get out of the blast of
+    # a bomb ahead of the detonation to keep away from the blast.
+    BLAST_MARGIN = 2
+    # how many times the length of the snake a flood fill of its room counts
+    # up to, i.e. for how many turns the fill lasts.
+    ROOM_SLACK = 3
+
+    def __init__(self) -> None:
+        self._game = None  # type: Optional[Game]
+        self._snake = None  # type: Optional[Snake]
+        self._field = DistanceField(0, 0)
+        # cell index -> the amount of elements occupying the cell, i.e. the
+        # snake & the bombs which haven't detonated yet (only the occupied
+        # cells).
+        self._occupied = {}  # type: Dict[int, int]
+        self._head = (0, 0)
+        self._length = 0
+        self._growth = 0
+        # the least amount of cells the head might get to, i.e. of the
+        # region of the free cells around it, None if unknown.
+        self._floor = None  # type: Optional[int]
+        # id(bomb) -> the bombs which haven't detonated yet.
+        self._bombs = {}  # type: Dict[int, Bomb]
+        # id(bomb) -> the bombs whose blasts are laid into the field.
+        self._blasts = {}  # type: Dict[int, Bomb]
+        # the apples, which are the sources of the field.
+        self._apples = set()  # type: Set[Tuple[int, int]]
+
+    def __call__(self, game: Game) -> Optional[Direction]:
+        return self.get_direction(game)
+
+    def get_field(self) -> DistanceField:
+        """
+        return the distances from the apples, as of the last decision.
+        """
+        return self._field
+
+    def get_direction(self, game: Game) -> Optional[Direction]:
+        """
+        pick the direction of the next turn of a game.
+
+        :param game: the game, before its next turn is played.
+        :return: the direction of the snake, None if it has no way out.
+        """
+        bombs = game.get_bombs()
+        self._sync(game, bombs)
+        ripples = self._ripples(bombs)
+
+        field = self._field
+        x, y = self._head
+        current = self._snake.get_direction()
+
+        options = []  # type: List[Tuple[int, int, bool, int, Direction]]
+        for direction, (dx, dy) in STEPS.items():
+            if direction is OPPOSITES[current]:
+                continue
+            cell = (x + dx, y + dy)
+            index = field.index(cell)
+            if index is None or index in self._occupied:
+                continue
+            # the body lies on the cell until the tail passes it.
+            lasting = self._length + self._growth
+            if cell in self._apples:
+                growth = game.get_config().apple_growth
+                if self._delays_body(ripples, growth):
+                    continue
+                lasting += growth
+            if self._is_doomed(ripples, cell, 0, lasting):
+                continue
+            options.append((self._exposure(cell),
+                            self._distance(cell, index),
+                            direction is not current,
+                            index,
+                            direction))
+        options.sort(key=lambda option: option[:3])
+
+        floor = self._floor
+        self._floor = None
+        best = None  # type: Optional[Direction]
+        best_room = -1
+        for *_, index, direction in options:
+            keeps_connected = self._keeps_connected(index)
+            if floor is not None and floor >= self._length and \
+                    keeps_connected:
+                # the cell itself is taken by the head.
+                self._floor = floor - 1
+                return direction
+            room, clear = self._room(ripples, index,
+                                     self.ROOM_SLACK * self._length)
+            if room >= self._length:
+                if keeps_connected and clear:
+                    self._floor = room - 1
+                return direction
+            if room > best_room:
+                best, best_room = direction, room
+        return best
+
+    def _distance(self, cell: Tuple[int, int], index: int) -> int:
+        """
+        return how far a cell is from the nearest apple: its distance in the
+        field, or beyond the horizon of the field, the horizon plus the
+        straight distance from the nearest apple.
+        """
+        distance = self._field.get_distance(index)
+        if distance == UNREACHABLE and self._apples:
+            column, row = cell
+            distance = self._field.get_horizon() + \
+                min(abs(column - x) + abs(row - y) for x, y in self._apples)
+        return distance
+
+    @staticmethod
+    def _ripples(bombs: List[Bomb]) -> List[Ripple]:
+        """
+        return the shock-waves of the bombs, each as the location of the
+        bomb, its reach & its delay: the shock-wave hits a cell within its
+        reach after as many turns as the delay plus the distance of the cell
+        from the bomb (a negative amount if it has already passed the cell).
+        """
+        ripples = []  # type: List[Ripple]
+        for bomb in bombs:
+            x, y = bomb.get_location()
+            if bomb.is_detonated():
+                delay = -bomb.get_radius()
+            else:
+                # the bomb itself is an obstacle, thus it's never stepped on.
+                delay = bomb.get_turns_until_explosion()
+            # the last ripple is one cell beyond the radius of the bomb (see
+            # "_blast_cells").
+            ripples.append((x, y, bomb.get_max_radius() + 1, delay))
+        return ripples
+
+    @staticmethod
+    def _is_doomed(ripples: List[Ripple],
+                   cell: Tuple[int, int],
+                   turn: int,
+                   lasting: int) -> bool:
+        """
+        check if a shock-wave would hit the body of the snake on a cell.
+
+        :param ripples: the shock-waves of the bombs.
+        :param cell: the cell.
+        :param turn: after how many turns the head enters the cell.
+        :param lasting: for how many turns the body lies on the cell.
+        """
+        column, row = cell
+        for x, y, reach, delay in ripples:
+            distance = abs(column - x) + abs(row - y)
+            if distance <= reach and \
+                    turn <= delay + distance <= turn + lasting:
+                return True
+        return False
+
+    def _delays_body(self, ripples: List[Ripple], growth: int) -> bool:
+        """
+        check if growing would keep the body of the snake within a
+        shock-wave, i.e. the shock-wave hits a cell of the body after the
+        tail would have left it, but before it leaves it once the snake
+        grows.
+
+        :param ripples: the shock-waves of the bombs.
+        :param growth: by how many more cells the snake would grow.
+        """
+        for position, cell in enumerate(self._snake.get_coordinates()):
+            # the cell is left after as many turns as there are cells behind
+            # it in the body, plus the growth.
+            if self._is_doomed(ripples, cell, position + self._growth + 1,
+                               growth - 1):
+                return True
+        return False
+
+    def _exposure(self, cell: Tuple[int, int]) -> int:
+        """
+        return how deep a cell is within the blasts whose shock-waves haven't
+        passed it yet (0 if it's out of them), the deeper the longer it
+        takes to get out.
+        """
+        exposure = 0
+        for bomb in self._blasts.values():
+            x, y = bomb.get_location()
+            distance = abs(cell[0] - x) + abs(cell[1] - y)
+            reach = bomb.get_max_radius() + 1
+            if distance > reach or \
+                    (bomb.is_detonated() and distance < bomb.get_radius()):
+                continue
+            exposure = max(exposure, reach + 1 - distance)
+        return exposure
+
+    def _room(self,
+              ripples: List[Ripple],
+              start: int,
+              limit: int) -> Tuple[int, bool]:
+        """
+        flood fill the cells which the head might get to from a cell it
+        enters, up to a limit: the cells which aren't occupied & aren't hit
+        by a shock-wave while the body would lie on them, were the head to
+        get there as soon as it may.
+
+        :param ripples: the shock-waves of the bombs.
+        :param start: the cell the head enters.
+        :param limit: the most cells to count.
+        :return: the amount of cells, & whether or not no cell was left out
+                 for a shock-wave.
+        """
+        height = self._field.get_height()
+        neighbors = self._field.get_neighbors
+        occupied = self._occupied
+        lasting = self._length + self._growth
+        clear = True
+        seen = {start}
+        frontier = deque([(start, 0)])  # type: Deque[Tuple[int, int]]
+        while frontier and len(seen) < limit:
+            index, turn = frontier.popleft()
+            turn += 1
+            for neighbor in neighbors(index):
+                if neighbor in seen or neighbor in occupied:
+                    continue
+                if ripples and self._is_doomed(
+                        ripples, divmod(neighbor, height), turn, lasting):
+                    clear = False
+                    continue
+                seen.add(neighbor)
+                frontier.append((neighbor, turn))
+        return len(seen), clear
+
+    def _keeps_connected(self, index: int) -> bool:
+        """
+        check if the head entering a cell leaves the rest of the region
+        around it in one piece, i.e. the cells around the cell (but the
+        head) are all free, so its neighbors stay connected around it.
+        """
+        field = self._field
+        column, row = divmod(index, field.get_height())
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                cell = (column + dx, row + dy)
+                if (dx or dy) and cell != self._head:
+                    around = field.index(cell)
+                    if around is None or around in self._occupied:
+                        return False
+        return True
+
+    def _sync(self, game: Game, bombs: List[Bomb]) -> None:
+        """
+        bring the field up to date with the game.
+
+        :param game: the game.
+        :param bombs: the bombs of the game.
+        """
+        snake = game.get_snake()
+        if game is not self._game or snake is not self._snake:
+            self._reset(game, bombs)
+            return
+
+        occupied = []  # type: List[int]
+        vacated_cells = []  # type: List[int]
+        head_index = None  # type: Optional[int]
+
+        head = snake.get_head()
+        if head != self._head:
+            vacated = snake.get_vacated_cell()
+            length = self._length + (1 if vacated is None else 0)
+            if snake.get_length() != length or \
+                    abs(head[0] - self._head[0]) + \
+                    abs(head[1] - self._head[1]) != 1:
+                # a turn was missed.
+                self._reset(game, bombs)
+                return
+            self._head = head
+            self._length = length
+            occupied.extend(self._indices([head]))
+            head_index = self._field.index(head)
+            if vacated is not None:
+                vacated_cells.extend(self._indices([vacated]))
+        if snake.get_growth_counter() > self._growth:
+            # an apple was eaten, so the body lies longer on every cell.
+            self._floor = None
+        self._growth = snake.get_growth_counter()
+
+        blocked = []  # type: List[int]
+        freed = []  # type: List[int]
+        unexploded = {}  # type: Dict[int, Bomb]
+        blasts = {}  # type: Dict[int, Bomb]
+        for bomb in bombs:
+            if not bomb.is_detonated():
+                unexploded[id(bomb)] = bomb
+                if self._bombs.pop(id(bomb), None) is None:
+                    occupied.extend(self._indices([bomb.get_location()]))
+            if self._is_blasting(bomb):
+                blasts[id(bomb)] = bomb
+                if self._blasts.pop(id(bomb), None) is None:
+                    blocked.extend(self._blast_cells(bomb))
+        # the bombs which have either detonated or been replaced.
+        for bomb in self._bombs.values():
+            vacated_cells.extend(self._indices([bomb.get_location()]))
+        for bomb in self._blasts.values():
+            freed.extend(self._blast_cells(bomb))
+        self._bombs = unexploded
+        self._blasts = blasts
+
+        # the room of the head is only known to lose the new head.
+        if any(index != head_index for index in blocked + occupied):
+            self._floor = None
+
+        for index in occupied:
+            self._occupied[index] = self._occupied.get(index, 0) + 1
+        for index in vacated_cells:
+            self._occupied[index] -= 1
+            if self._occupied[index] == 0:
+                del self._occupied[index]
+
+        apples = {apple.coordinate for apple in game.get_apples()}
+        self._field.update(blocked + occupied,
+                           freed + vacated_cells,
+                           self._indices(apples - self._apples),
+                           self._indices(self._apples - apples))
+        self._apples = apples
+
+    def _reset(self, game: Game, bombs: List[Bomb]) -> None:
+        """
+        evaluate the field of a game from scratch.
+
+        :param game: the game.
+        :param bombs: the bombs of the game.
+        """
+        config = game.get_config()
+        snake = game.get_snake()
+        self._game = game
+        self._snake = snake
+        self._field = DistanceField(config.length, config.height)
+        self._occupied = {}
+        self._head = snake.get_head()
+        self._length = snake.get_length()
+        self._growth = snake.get_growth_counter()
+        self._floor = None
+        self._bombs = {id(bomb): bomb for bomb in bombs
+                       if not bomb.is_detonated()}
+        self._blasts = {id(bomb): bomb for bomb in bombs
+                        if self._is_blasting(bomb)}
+        self._apples = {apple.coordinate for apple in game.get_apples()}
+
+        occupied = self._indices(snake.get_coordinates())
+        occupied.extend(self._indices(
+            [bomb.get_location() for bomb in self._bombs.values()]))
+        for index in occupied:
+            self._occupied[index] = self._occupied.get(index, 0) + 1
+        blocked = list(occupied)
+        for bomb in self._blasts.values():
+            blocked.extend(self._blast_cells(bomb))
+        self._field.update(blocked, (), self._indices(self._apples), ())
+
+    def _is_blasting(self, bomb: Bomb) -> bool:
+        """
+        check if the blast of a bomb should be kept away from.
+        """
+        return bomb.is_detonated() or \
+            bomb.get_turns_until_explosion() <= \
+            self._length + self._growth + bomb.get_max_radius() + 1 + \
+            self.BLAST_MARGIN
+
+    def _blast_cells(self, bomb: Bomb) -> List[int]:
+        """
+        return the indices of the cells within the board which the
+        shock-wave of a bomb would reach, up to where it fades out.
+        """
+        x, y = bomb.get_location()
+        reach = bomb.get_max_radius() + 1
+        cells = []  # type: List[Tuple[int, int]]
+        for dx in range(-reach, reach + 1):
+            span = reach - abs(dx)
+            cells.extend((x + dx, y + dy) for dy in range(-span, span + 1))
+        return self._indices(cells)
+
+    def _indices(self, cells: Iterable[Tuple[int, int]]) -> List[int]:
+        """
+        return the indices of the given cells which are within the board.
+        """
+        indices = []  # type: List[int]
+        for cell in cells:
+            index = self._field.index(cell)
+            if index is not None:
+                indices.append(index)
+        return indices
+
+
+def autopilot_policy(seed: int) -> engine.Directions:
+    """
+    a policy which plays the games by an autopilot (see "sweep.Policy").
+
+    :param seed: the seed of the game (the autopilot doesn't draw anything).
+    """
+    return Autopilot()
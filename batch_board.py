@@ -0,0 +1,676 @@
+import copy
+import random
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from apple import Apple
+from bitboard import BitBoard, random_set_bit
+from bomb import Bomb
+from bomb_field import ring_mask
+from game import Game
+from game_config import GameConfig
+from random_stream import RandomStream
+from snake import Snake, Direction
+
+# the directions are coded by single bytes, so the directions of all the
+# games are updated by translating a byte string. the codes of opposite
+# directions differ only by their lowest bit.
+UP, DOWN, RIGHT, LEFT, KEEP = range(5)
+DIRECTION_CODES = {
+    Direction.UP: UP,
+    Direction.DOWN: DOWN,
+    Direction.RIGHT: RIGHT,
+    Direction.LEFT: LEFT,
+    None: KEEP,
+}
+DIRECTIONS = (Direction.UP, Direction.DOWN, Direction.RIGHT, Direction.LEFT)
+
+# (current direction * 5 + requested direction) -> the new direction, the
+# snake keeps its direction if none is requested or if the requested
+# direction is the opposite one (like "Game" does).
+TURNS = bytes(requested if requested != KEEP and requested != current ^ 1
+              else current
+              for current in range(4) for requested in range(5)) + \
+    bytes(256 - 20)
+# translation tables of direction codes to their low & high bits.
+LOW_BITS = bytes(code & 1 for code in range(256))
+HIGH_BITS = bytes(code >> 1 & 1 for code in range(256))
+
+# translation table of bytes to whether or not they are non-zero.
+NON_ZERO = bytes([0]) + bytes([1]) * 255
+
+# the key, location, explosion radius & detonation step of a bomb.
+BombRecord = Tuple[int, Tuple[int, int], int, int]
+
+
+def _bits_of(mask: int) -> Iterator[int]:
+    """
+    iterate over the indices of the set bits of a bitmask, in increasing
+    order.
+    """
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for byte in _indices(data.translate(NON_ZERO)):
+        value = data[byte]
+        while value:
+            low = value & -value
+            yield byte * 8 + low.bit_length() - 1
+            value ^= low
+
+
+def _indices(flags: bytes) -> Iterator[int]:
+    """
+    iterate over the indices of the set flags of a byte string of flags
+    (zeros & ones), in increasing order.
+    """
+    index = flags.find(1)
+    while index >= 0:
+        yield index
+        index = flags.find(1, index + 1)
+
+
+class BatchBitBoard:
+    """
+    a batch of independent games played in lockstep, i.e. each call to
+    "step" executes a single turn of all the games at once.
+
+    the games enforce the same rules as "BitBoard", but their layers are
+    shared: each layer of the batch (e.g. the snake bodies) is a single
+    integer bitmask which holds the layers of all the games in consecutive
+    lanes of whole bytes, where the bit (column * height + row) of the lane
+    of a game represents the cell (column, row) of its board. thus each
+    phase of a turn is a handful of bitwise operations over all the games
+    at once: the heads & the tails of the snakes move by shifting the
+    layers, following the directions of the snakes (the tails follow link
+    layers, which mark for each cell of a body the direction of the next
+    cell towards the head), & the collisions are found by masking layers.
+    only the games in which an event occurs (an apple was eaten, a bomb
+    detonated or an apple exploded) are handled one by one.
+
+    the per-game state (directions, growth counters, scores, apples & bombs)
+    is kept in parallel arrays, like "BombField" does. a game which have
+    ended is replaced by a new game right away, so the batch always consists
+    of playing games.
+    """
+
+    def __init__(self,
+                 size: int,
+                 config: Optional[GameConfig] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        create a batch of new games.
+
+        :param size: the amount of games in the batch.
+        :param config: the configuration of the games (the default
+                       configuration if None).
+        :param seed: the seed of the seeds of the games, i.e. of all the
+                     random draws of the batch (None for a seed drawn by
+                     the operating system).
+        """
+        if size <= 0:
+            raise ValueError("size must be greater than zero")
+
+        config = self._config = config or GameConfig()
+        self._size = size
+        length, height = config.length, config.height
+        area = self._area = length * height
+        self._all_cells = (1 << area) - 1
+        # the width of a lane, in bytes & in bits.
+        self._lane_bytes = (area + 7) // 8
+        self._lane_bits = 8 * self._lane_bytes
+        self._span = size * self._lane_bytes
+
+        # direction -> its shift & the cells of each lane which it leads out
+        # of the board.
+        column_cells = (1 << height) - 1
+        edges = (
+            sum(1 << (column * height + height - 1)
+                for column in range(length)),
+            sum(1 << (column * height) for column in range(length)),
+            column_cells << ((length - 1) * height),
+            column_cells,
+        )
+        self._shifts = (1, -1, height, -height)
+        self._edges = [self._replicate(edge) for edge in edges]
+        self._inner = [self._replicate(self._all_cells & ~edge)
+                       for edge in edges]
+
+        # the snake of a new game, at the middle of the board: its body,
+        # head, tail & links (all upwards).
+        head = length // 2 * height + height // 2
+        self._snake_lane = 0b111 << (head - 2)
+        self._start_layers = [self._replicate(lane) for lane in (
+            self._snake_lane, 1 << head, 1 << (head - 2), 0b11 << (head - 2))]
+
+        # the layers of the batch.
+        self._body = 0
+        self._heads = 0
+        self._tails = 0
+        self._links = [0, 0, 0, 0]
+        self._apples = 0
+        self._bombs = 0
+        self._ripples = 0
+
+        # the per-game state.
+        self._directions = bytearray(size)
+        self._growth = array("i", bytes(4 * size))
+        self._growers = set()  # type: Set[int]
+        self._scores = array("i", bytes(4 * size))
+        self._starts = array("q", bytes(8 * size))
+        self._streams = [None] * size  # type: List[Optional[RandomStream]]
+        # game -> apple cell number -> its score, in the order the apples
+        # were created.
+        self._apple_scores = \
+            [{} for _ in range(size)]  # type: List[Dict[int, int]]
+        # game -> bomb key -> the bomb, in the order the bombs were created
+        # (& likewise for the detonated bombs alone).
+        self._bomb_records = \
+            [{} for _ in range(size)]  # type: List[Dict[int, BombRecord]]
+        self._detonated = {}  # type: Dict[int, Dict[int, BombRecord]]
+        # game -> the bitmask of the shock-wave ripples of its lane.
+        self._ripple_lanes = {}  # type: Dict[int, int]
+        # step -> the games & the keys of the bombs which detonate in it
+        # (keys of replaced games are stale).
+        self._wheel = {}  # type: Dict[int, List[Tuple[int, int]]]
+        self._next_key = 0
+
+        # the amount of steps taken.
+        self._turn = 0
+        self._seeds = random.Random(seed)
+        self._reset(range(size))
+        # the amount of games which have ended since the batch was created.
+        self._episodes = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _replicate(self, mask: int) -> int:
+        """
+        return a layer which holds the same bitmask in all the lanes.
+        """
+        return int.from_bytes(mask.to_bytes(self._lane_bytes, "little") *
+                              self._size, "little")
+
+    def _spread(self, flags: bytes) -> int:
+        """
+        return a layer whose lanes are either full or empty.
+
+        :param flags: a byte per game, whether or not its lane is full.
+        """
+        selected = bytearray(self._span)
+        selected[::self._lane_bytes] = flags
+        first_bits = int.from_bytes(selected, "little")
+        return (first_bits << self._lane_bits) - first_bits
+
+    def _lane(self, data: bytes, game: int) -> int:
+        """
+        return the bitmask of the lane of a game within a layer.
+
+        :param data: the bytes of the layer (see "_layer_bytes").
+        """
+        start = game * self._lane_bytes
+        return int.from_bytes(data[start:start + self._lane_bytes], "little")
+
+    def _layer_bytes(self, layer: int) -> bytes:
+        """
+        return the bytes of a layer, lane by lane.
+        """
+        return layer.to_bytes(self._span, "little")
+
+    def _layer(self, lanes: Dict[int, int]) -> int:
+        """
+        return a layer which holds the given lanes (the other lanes are
+        empty).
+
+        :param lanes: game -> the bitmask of its lane.
+        """
+        data = bytearray(self._span)
+        for game, mask in lanes.items():
+            start = game * self._lane_bytes
+            data[start:start + self._lane_bytes] = \
+                mask.to_bytes(self._lane_bytes, "little")
+        return int.from_bytes(data, "little")
+
+    def _apples_lane(self, game: int) -> int:
+        """
+        return the bitmask of the apples of a game.
+        """
+        mask = 0
+        for cell in self._apple_scores[game]:
+            mask |= 1 << cell
+        return mask
+
+    def _bombs_lane(self, game: int) -> int:
+        """
+        return the bitmask of the un-detonated bombs of a game.
+        """
+        height, turn = self._config.height, self._turn
+        mask = 0
+        for _, (column, row), _, detonation in \
+                self._bomb_records[game].values():
+            if detonation > turn:
+                mask |= 1 << (column * height + row)
+        return mask
+
+    def _add_bomb(self, game: int, cell: int) -> None:
+        """
+        add a bomb to a game, drawing its explosion radius & timing (like
+        "BitBoard.create_bomb" does).
+        """
+        radius, time_to_explode = self._streams[game].bomb_timing()
+        key = self._next_key
+        self._next_key += 1
+        # a bomb detonates in the step which follows its last countdown.
+        detonation = self._turn + \
+            max(time_to_explode - Bomb.EXPLOSION_THRESHOLD, 0) + 1
+        self._bomb_records[game][key] = \
+            (key, divmod(cell, self._config.height), radius, detonation)
+        self._wheel.setdefault(detonation, []).append((game, key))
+
+    def _reset(self, games: Sequence[int]) -> None:
+        """
+        replace games by new games, set up like "engine.setup_game" sets up
+        a game (a "BitBoard" of the same seed starts exactly alike).
+
+        :param games: the games to replace, in increasing order (each draws
+                      the seed of its new game in turn).
+        """
+        config = self._config
+        flags = bytearray(self._size)
+        apples_lanes = {}  # type: Dict[int, int]
+        bombs_lanes = {}  # type: Dict[int, int]
+
+        for game in games:
+            flags[game] = True
+            stream = self._streams[game] = RandomStream(
+                self._seeds.getrandbits(64), config.apple_scores,
+                config.bomb_radii, config.bomb_times)
+            self._directions[game] = UP
+            self._growth[game] = 0
+            self._growers.discard(game)
+            self._scores[game] = 0
+            self._starts[game] = self._turn
+            self._detonated.pop(game, None)
+            self._ripple_lanes.pop(game, None)
+            self._bomb_records[game] = {}
+            self._apple_scores[game] = {}
+
+            bombs = 0
+            cell = random_set_bit(self._all_cells & ~self._snake_lane,
+                                  self._area, stream)
+            if cell is not None:
+                self._add_bomb(game, cell)
+                bombs = bombs_lanes[game] = 1 << cell
+            for _ in range(config.apples):
+                occupied = self._snake_lane | bombs | apples_lanes.get(game, 0)
+                cell = self._create_apple(game, occupied)
+                if cell is None:
+                    break
+                apples_lanes[game] = apples_lanes.get(game, 0) | 1 << cell
+
+        # clear the lanes of the games, then lay the new games.
+        new = self._spread(flags)
+        kept = ~new
+        self._body = self._body & kept | self._start_layers[0] & new
+        self._heads = self._heads & kept | self._start_layers[1] & new
+        self._tails = self._tails & kept | self._start_layers[2] & new
+        links = self._links
+        self._links = [links[UP] & kept | self._start_layers[3] & new,
+                       links[DOWN] & kept, links[RIGHT] & kept,
+                       links[LEFT] & kept]
+        self._ripples &= kept
+        self._apples = self._apples & kept | self._layer(apples_lanes)
+        self._bombs = self._bombs & kept | self._layer(bombs_lanes)
+
+    def step(self, directions: Sequence[Optional[Direction]]
+             ) -> Tuple[array, bytearray]:
+        """
+        execute a single turn of all the games.
+
+        :param directions: in which direction the snake of each game should
+                           move (None keeps its current direction).
+        :return: the score gained by each game in this turn & whether or not
+                 each game have ended in this turn (it's already replaced by
+                 a new game).
+        """
+        if len(directions) != self._size:
+            raise ValueError(f"expected {self._size} directions, got "
+                             f"{len(directions)}")
+
+        rewards = array("i", bytes(4 * self._size))
+        ended = bytearray(self._size)
+
+        # turn the snakes, then move their heads & tails.
+        requested = bytes(map(DIRECTION_CODES.__getitem__, directions))
+        pairs = int.from_bytes(self._directions, "little") * 5 + \
+            int.from_bytes(requested, "little")
+        self._directions = bytearray(
+            pairs.to_bytes(self._size, "little").translate(TURNS))
+
+        leaving = self._tails
+        if self._growers:
+            flags = bytearray(self._size)
+            for game in self._growers:
+                flags[game] = True
+            leaving &= ~self._spread(flags)
+
+        # split the heads by the directions of the snakes.
+        heads = self._heads
+        high = self._spread(self._directions.translate(HIGH_BITS))
+        odd = heads & self._spread(self._directions.translate(LOW_BITS))
+        even = heads ^ odd
+        left = odd & high
+        right = even & high
+        split = (even ^ right, odd ^ left, right, left)
+
+        heads = tails = crashed = 0
+        for direction, shift in enumerate(self._shifts):
+            moving = split[direction]
+            crashed |= moving & self._edges[direction]
+            self._links[direction] |= moving
+            moving &= self._inner[direction]
+            heads |= moving << shift if shift > 0 else moving >> -shift
+
+            following = leaving & self._links[direction]
+            self._links[direction] ^= following
+            tails |= following << shift if shift > 0 else \
+                following >> -shift
+        self._tails ^= leaving ^ tails
+        self._body ^= leaving
+        for game in list(self._growers):
+            self._growth[game] -= 1
+            if not self._growth[game]:
+                self._growers.discard(game)
+
+        # the snakes crashed into a wall (their former heads are marked),
+        # into themselves or into a bomb, or ate an apple.
+        events = crashed | heads & (self._body | self._bombs |
+                                    self._ripples | self._apples)
+        self._heads = heads
+        self._body |= heads
+
+        turn = _Turn(self._layer_bytes(self._body), self._span, rewards,
+                     ended)
+        if events:
+            self._eat_apples(events, turn)
+        self._detonate_bombs(turn)
+
+        if turn.apples_toggled:
+            self._apples ^= int.from_bytes(turn.apples, "little")
+        if turn.bombs_toggled:
+            self._bombs ^= int.from_bytes(turn.bombs, "little")
+        self._ripples = self._layer(self._ripple_lanes) \
+            if self._ripple_lanes else 0
+
+        games = list(_indices(ended))
+        if games:
+            self._episodes += len(games)
+            self._reset(games)
+        return rewards, ended
+
+    def _body_lane(self, turn: '_Turn', game: int) -> int:
+        """
+        return the bitmask of the snake body of a game.
+        """
+        return self._lane(turn.body, game)
+
+    def _create_apple(self,
+                      game: int,
+                      occupied: int,
+                      turn: Optional['_Turn'] = None) -> Optional[int]:
+        """
+        create a new apple within a game, like "BitBoard.create_apple".
+
+        :param occupied: the bitmask of the occupied cells of the game.
+        :param turn: the turn whose changes the apple is added to.
+        :return: the cell number of the apple, or None if the board is full
+                 (the game ends).
+        """
+        stream = self._streams[game]
+        cell = random_set_bit(self._all_cells & ~occupied, self._area, stream)
+        if cell is not None:
+            self._apple_scores[game][cell] = stream.apple_score()
+            if turn is not None:
+                turn.toggle_apple(game * self._lane_bits + cell)
+        return cell
+
+    def _eat_apples(self, events: int, turn: '_Turn') -> None:
+        """
+        let the snakes eat the apples their heads reached & replace the
+        eaten apples, or end the games whose snakes crashed.
+
+        :param events: the bitmask of the cells where the heads of the
+                       snakes ate an apple or crashed.
+        :param turn: the changes of the turn.
+        """
+        lane_bits = self._lane_bits
+        growth = self._config.apple_growth
+
+        # an apple never shares its cell with a hazard, a body or the former
+        # head of a snake.
+        for bit in _bits_of(events):
+            game, cell = divmod(bit, lane_bits)
+            apple_scores = self._apple_scores[game]
+            if cell not in apple_scores:
+                turn.ended[game] = True
+                continue
+
+            score = apple_scores.pop(cell)
+            self._scores[game] += score
+            turn.rewards[game] += score
+            self._growth[game] += growth
+            if self._growth[game]:
+                self._growers.add(game)
+            turn.toggle_apple(bit)
+
+            occupied = self._body_lane(turn, game) | \
+                self._apples_lane(game) | self._bombs_lane(game) | \
+                self._ripple_lanes.get(game, 0)
+            if self._create_apple(game, occupied, turn) is None:
+                # the board is full.
+                turn.ended[game] = True
+
+    def _ripple_lane(self, game: int) -> Tuple[int, List[int]]:
+        """
+        combine the shock-wave ripples of the detonated bombs of a game.
+
+        :return: the bitmask of the ripples & the keys of the bombs whose
+                 shock-wave have faded.
+        """
+        length, height, turn = \
+            self._config.length, self._config.height, self._turn
+        mask = 0
+        faded = []  # type: List[int]
+        for key, location, max_radius, detonation in \
+                self._detonated[game].values():
+            radius = turn - detonation
+            mask |= ring_mask(length, height, location, radius)
+            if radius > max_radius:
+                faded.append(key)
+        return mask, faded
+
+    def _detonate_bombs(self, turn: '_Turn') -> None:
+        """
+        "detonate" each & every bomb of the playing games, then replace
+        exploded apples & faded-out bombs (like "BitBoard" does).
+
+        :param turn: the changes of the turn.
+        """
+        lane_bits, height = self._lane_bits, self._config.height
+        ended = turn.ended
+        self._turn += 1
+
+        for game, key in self._wheel.pop(self._turn, ()):
+            bomb = self._bomb_records[game].get(key)
+            if bomb is None or ended[game]:
+                # the bomb belongs to a replaced game.
+                continue
+            self._detonated.setdefault(game, {})[key] = bomb
+            column, row = bomb[1]
+            turn.toggle_bomb(game * lane_bits + column * height + row)
+
+        # only the games with detonated bombs have ripples.
+        for game in list(self._detonated):
+            if ended[game]:
+                continue
+            ripples, faded = self._ripple_lane(game)
+            self._ripple_lanes[game] = ripples
+            if self._body_lane(turn, game) & ripples:
+                ended[game] = True
+                continue
+            exploded = [cell for cell in self._apple_scores[game]
+                        if ripples >> cell & 1]
+            if faded or exploded:
+                # in the order the bombs were created.
+                self._replace(game, sorted(faded), exploded, turn)
+
+    def _replace(self,
+                 game: int,
+                 faded: List[int],
+                 exploded: List[int],
+                 turn: '_Turn') -> None:
+        """
+        replace the faded-out bombs & the exploded apples of a game.
+
+        :param faded: the keys of the faded-out bombs, in the order they
+                      were created.
+        :param exploded: the cell numbers of the exploded apples, in the
+                         order they were created.
+        :param turn: the changes of the turn.
+        """
+        offset = game * self._lane_bits
+        occupied = self._body_lane(turn, game) | self._apples_lane(game) | \
+            self._bombs_lane(game)
+        ripples = self._ripple_lanes[game]
+
+        for key in faded:
+            del self._bomb_records[game][key]
+            del self._detonated[game][key]
+            # the ripples of other bombs might share cells with its ripple.
+            ripples = self._ripple_lane(game)[0]
+            cell = random_set_bit(self._all_cells & ~(occupied | ripples),
+                                  self._area, self._streams[game])
+            if cell is not None:
+                self._add_bomb(game, cell)
+                occupied |= 1 << cell
+                turn.toggle_bomb(offset + cell)
+        if self._detonated[game]:
+            self._ripple_lanes[game] = ripples
+        else:
+            del self._detonated[game]
+            del self._ripple_lanes[game]
+
+        for cell in exploded:
+            del self._apple_scores[game][cell]
+            occupied ^= 1 << cell
+            turn.toggle_apple(offset + cell)
+            apple = self._create_apple(game, occupied | ripples, turn)
+            if apple is None:
+                # the board is full.
+                turn.ended[game] = True
+                break
+            occupied |= 1 << apple
+
+    def get_boards(self) -> List[BitBoard]:
+        """
+        return independent copies of the current games of the batch.
+        """
+        layers = [self._layer_bytes(layer)
+                  for layer in [self._tails] + self._links]
+        return [self._board(game, layers) for game in range(self._size)]
+
+    def _board(self, game: int, layers: List[bytes]) -> BitBoard:
+        """
+        convert the state of a game into a bit-board.
+
+        :param layers: the bytes of the tails & the link layers.
+        """
+        config, turn = self._config, self._turn
+        tail, *links = (self._lane(data, game) for data in layers)
+        # follow the links from the tail to the head.
+        body = []  # type: List[Tuple[int, int]]
+        cell = tail.bit_length() - 1
+        while True:
+            body.append(divmod(cell, config.height))
+            for direction, shift in enumerate(self._shifts):
+                if links[direction] >> cell & 1:
+                    cell += shift
+                    break
+            else:
+                break
+        snake = Snake.from_body(body, DIRECTIONS[self._directions[game]],
+                                self._growth[game])
+
+        apples = [Apple(divmod(cell, config.height), score)
+                  for cell, score in self._apple_scores[game].items()]
+        bombs = []  # type: List[Bomb]
+        for _, location, max_radius, detonation in \
+                self._bomb_records[game].values():
+            detonated = detonation <= turn
+            bombs.append(Bomb.restore(
+                location, max_radius,
+                Bomb.EXPLOSION_THRESHOLD if detonated else
+                detonation - turn + Bomb.EXPLOSION_THRESHOLD - 1,
+                detonated, turn - detonation if detonated else 0))
+        return BitBoard.from_game(Game.restore(
+            config, snake, apples, bombs, self._scores[game], True,
+            copy.copy(self._streams[game])))
+
+    def get_scores(self) -> array:
+        """
+        return the scores of the current games.
+        """
+        return array("i", self._scores)
+
+    def get_turns(self) -> array:
+        """
+        return how many turns each of the current games have lasted.
+        """
+        return array("i", (self._turn - start for start in self._starts))
+
+    def get_episodes(self) -> int:
+        """
+        return the amount of games which have ended since the batch was
+        created.
+        """
+        return self._episodes
+
+
+class _Turn:
+    """
+    the changes of a single step of a batch, which are gathered game by game
+    & applied to the layers of the batch at once.
+    """
+
+    def __init__(self,
+                 body: bytes,
+                 span: int,
+                 rewards: array,
+                 ended: bytearray) -> None:
+        """
+        :param body: the bytes of the snake bodies layer.
+        :param span: the size of a layer, in bytes.
+        :param rewards: the score gained by each game in this turn.
+        :param ended: whether or not each game have ended in this turn.
+        """
+        self.body = body
+        self.rewards = rewards
+        self.ended = ended
+        # the bits to toggle in the apples & bombs layers.
+        self.apples = bytearray(span)
+        self.bombs = bytearray(span)
+        self.apples_toggled = False
+        self.bombs_toggled = False
+
+    def toggle_apple(self, bit: int) -> None:
+        """
+        add or remove an apple (a bit of the apples layer).
+        """
+        self.apples[bit >> 3] ^= 1 << (bit & 7)
+        self.apples_toggled = True
+
+    def toggle_bomb(self, bit: int) -> None:
+        """
+        add or remove an un-detonated bomb (a bit of the bombs layer).
+        """
+        self.bombs[bit >> 3] ^= 1 << (bit & 7)
+        self.bombs_toggled = True
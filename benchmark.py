@@ -0,0 +1,505 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from itertools import product
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, \
+    Tuple
+
+from apple import Apple
+from bomb import Bomb
+from game import Game
+from game_config import GameConfig
+from game_display import GameDisplay
+from random_stream import RandomStream
+from snake import Snake, Direction
+
+# where the baseline results are stored by default.
+BASELINE_PATH = "benchmark_baseline.json"
+BASELINE_VERSION = 1
+# a case regresses once it is slower than its baseline by more than this
+# fraction.
+TOLERANCE = 0.15
+# each case is measured by several runs, each lasting at least this many
+# seconds, & the fastest run is kept.
+REPEATS = 5
+MIN_RUN_TIME = 0.05
+SEED = 2024
+
+# the scaling axes of the cases.
+BOARD_SIZES = ((40, 30), (128, 128), (512, 512))
+SNAKE_LENGTHS = (3, 100, 1000)
+# amounts of apples & bombs.
+POPULATIONS = ((3, 1), (30, 10))
+BOMB_RADII = (2, 5, 20, 100)
+# amounts of cells drawn per round.
+DRAWN_CELLS = (2, 64, 1024)
+
+# given an amount of operations, execute them & return how many seconds
+# the operations themselves (without their preparations) have taken.
+Run = Callable[[int], float]
+
+
+class Case(NamedTuple):
+    """
+    a single benchmark: an operation under a single point of the scaling
+    axes.
+    """
+    # the operation & the point, e.g. "board.update 40x30 snake=3".
+    name: str
+    # prepare the operation (untimed), return how to run it.
+    setup: Callable[[], Run]
+
+
+class Result(NamedTuple):
+    """
+    the measurement of a single case.
+    """
+    name: str
+    # the time of a single operation, in seconds.
+    seconds: float
+    # the time of a single operation in the baseline (None if the case is
+    # missing from the baseline).
+    baseline: Optional[float]
+
+    def get_ratio(self) -> Optional[float]:
+        """
+        return how many times slower the case is than its baseline.
+        """
+        if not self.baseline:
+            return None
+        return self.seconds / self.baseline
+
+    def is_regression(self, tolerance: float = TOLERANCE) -> bool:
+        """
+        check if the case is slower than its baseline beyond the tolerance.
+        """
+        ratio = self.get_ratio()
+        return ratio is not None and ratio > 1 + tolerance
+
+
+def _serpentine(length: int,
+                height: int,
+                cells: int) -> Tuple[List[Tuple[int, int]], Direction]:
+    """
+    lay a path back & forth along the columns of a board, starting at its
+    bottom-left corner.
+
+    :return: the cells of the path, from its start to its end, & the
+             direction of its last step.
+    """
+    path = []  # type: List[Tuple[int, int]]
+    column = 0
+    while len(path) < cells and column < length:
+        rows = range(height) if column % 2 == 0 else range(height - 1, -1, -1)
+        path.extend((column, row) for row in rows)
+        column += 1
+    if len(path) < cells:
+        raise ValueError(f"no room for {cells} cells")
+    path = path[:cells]
+
+    (x, y), (head_x, head_y) = path[-2], path[-1]
+    steps = {
+        (0, 1): Direction.UP,
+        (0, -1): Direction.DOWN,
+        (1, 0): Direction.RIGHT,
+        (-1, 0): Direction.LEFT,
+    }
+    return path, steps[(head_x - x, head_y - y)]
+
+
+def scenario(length: int,
+             height: int,
+             snake_length: int,
+             apples: int,
+             bombs: int,
+             seed: int = SEED) -> Game:
+    """
+    create a game in the middle of its course: a snake of the given length
+    laid along the columns of the board, with apples & bombs at random
+    cells.
+
+    :param length: the length of the board.
+    :param height: the height of the board.
+    :param snake_length: the amount of cells of the snake.
+    :param apples: the amount of apples.
+    :param bombs: the amount of bombs.
+    :param seed: the seed of the random draws of the game.
+    """
+    config = GameConfig(length, height, apples=apples)
+    body, direction = _serpentine(length, height, snake_length)
+    snake = Snake.from_body(body, direction, 0)
+    stream = RandomStream(seed, config.apple_scores, config.bomb_radii,
+                          config.bomb_times)
+    game = Game.restore(config, snake, [], [], 0, True, stream)
+    for _ in range(bombs):
+        game.create_bomb()
+    for _ in range(apples):
+        game.create_apple()
+    return game
+
+
+def _fits(size: Tuple[int, int], snake_length: int) -> bool:
+    """
+    check if a snake leaves at least half of a board empty.
+    """
+    length, height = size
+    return snake_length <= length * height // 2
+
+
+def _timed_loop(operation: Callable[[], Any]) -> Run:
+    """
+    run an operation back to back.
+    """
+    def run(operations: int) -> float:
+        start = time.perf_counter()
+        for _ in range(operations):
+            operation()
+        return time.perf_counter() - start
+    return run
+
+
+def _board_update(size: Tuple[int, int],
+                  snake_length: int,
+                  apples: int,
+                  bombs: int) -> Run:
+    game = scenario(*size, snake_length, apples, bombs)
+    return _timed_loop(game.get_board().update)
+
+
+def _board_is_full(size: Tuple[int, int], snake_length: int) -> Run:
+    game = scenario(*size, snake_length, 0, 0)
+    return _timed_loop(game.get_board().is_full)
+
+
+def _board_add_element(size: Tuple[int, int], snake_length: int) -> Run:
+    game = scenario(*size, snake_length, 0, 0)
+    board = game.get_board()
+    rng = random.Random(SEED)
+    apples = []  # type: List[Apple]
+    batch = 256
+
+    def run(operations: int) -> float:
+        elapsed = 0.0
+        while operations > 0:
+            count = min(batch, operations)
+            cells = set()
+            while len(cells) < count:
+                cells.add(board.random_empty_cell(rng))
+            apples[:] = [Apple(cell, 1) for cell in cells]
+
+            start = time.perf_counter()
+            for apple in apples:
+                board.add_element(apple)
+            elapsed += time.perf_counter() - start
+
+            for apple in apples:
+                board.remove_element(apple)
+            operations -= count
+        return elapsed
+    return run
+
+
+def _shockwave_ripples(radius: int) -> Run:
+    bomb = Bomb((0, 0), radius, 20)
+    return _timed_loop(lambda: bomb.shockwave_ripples(radius))
+
+
+def _safe_direction(game: Game) -> Optional[Direction]:
+    """
+    keep the direction of the snake, unless its next cell is out of the
+    board or taken by the snake or a bomb.
+    """
+    snake = game.get_snake()
+    board = game.get_board()
+    x, y = snake.get_head()
+    steps = {
+        Direction.UP: (x, y + 1),
+        Direction.DOWN: (x, y - 1),
+        Direction.RIGHT: (x + 1, y),
+        Direction.LEFT: (x - 1, y),
+    }
+    current = snake.get_direction()
+    for direction in [current] + [other for other in Direction
+                                  if other is not current]:
+        cell = steps[direction]
+        if board.is_cell_in_board(cell) and \
+                all(isinstance(element, Apple)
+                    for element in board.get_elements_at(cell)):
+            return direction
+    return None
+
+
+def _single_turn(size: Tuple[int, int],
+                 snake_length: int,
+                 apples: int,
+                 bombs: int) -> Run:
+    initial = scenario(*size, snake_length, apples, bombs)
+    initial.get_board().set_change_tracking(False)
+    games = [initial.clone()]
+
+    def run(operations: int) -> float:
+        elapsed = 0
+        clock = time.perf_counter_ns
+        for _ in range(operations):
+            game = games[0]
+            if not game.is_playing():
+                game = games[0] = initial.clone()
+            direction = _safe_direction(game)
+            start = clock()
+            game.single_turn(direction)
+            elapsed += clock() - start
+        return elapsed / 1e9
+    return run
+
+
+def _clone_and_turn(size: Tuple[int, int],
+                    snake_length: int,
+                    apples: int,
+                    bombs: int) -> Run:
+    """
+    clone a game & play a single turn of the clone (as searches over the
+    future of a game do), so the original game never changes.
+    """
+    game = scenario(*size, snake_length, apples, bombs)
+    game.get_board().set_change_tracking(False)
+    direction = _safe_direction(game)
+    return _timed_loop(lambda: game.clone().single_turn(direction))
+
+
+class _StubCanvas:
+    """
+    stands for a tk canvas, so drawing is measured without a display.
+    """
+
+    def __init__(self) -> None:
+        self._items = 0
+
+    def create_rectangle(self, *args: Any, **kwargs: Any) -> int:
+        self._items += 1
+        return self._items
+
+    def delete(self, item: int) -> None:
+        pass
+
+
+def _update_drawing(size: Tuple[int, int], drawn_cells: int) -> Run:
+    length, height = size
+    config = GameConfig(length, height)
+    # a display without a window (see "_StubCanvas").
+    display = GameDisplay.__new__(GameDisplay)
+    display._config = config
+    display._canvas = _StubCanvas()
+    display._to_draw = []
+    display._already_drawn = {}
+
+    rng = random.Random(SEED)
+    colors = [color for color, _ in config.color_strengths] + [None]
+    rounds = [[(rng.randrange(length), rng.randrange(height),
+                rng.choice(colors)) for _ in range(drawn_cells)]
+              for _ in range(64)]
+
+    def run(operations: int) -> float:
+        elapsed = 0.0
+        for operation in range(operations):
+            display._to_draw = list(rounds[operation % len(rounds)])
+            start = time.perf_counter()
+            display._update_drawing()
+            elapsed += time.perf_counter() - start
+        return elapsed
+    return run
+
+
+def cases() -> Iterator[Case]:
+    """
+    yield all the benchmarks, along all their scaling axes.
+    """
+    def label(size: Tuple[int, int]) -> str:
+        return f"{size[0]}x{size[1]}"
+
+    for size, snake_length, (apples, bombs) in product(
+            BOARD_SIZES, SNAKE_LENGTHS, POPULATIONS):
+        if _fits(size, snake_length):
+            yield Case(f"board.update {label(size)} snake={snake_length} "
+                       f"apples={apples} bombs={bombs}",
+                       lambda size=size, snake_length=snake_length,
+                       apples=apples, bombs=bombs:
+                       _board_update(size, snake_length, apples, bombs))
+
+    for size, snake_length in product(BOARD_SIZES, SNAKE_LENGTHS):
+        if _fits(size, snake_length):
+            yield Case(f"board.add_element {label(size)} "
+                       f"snake={snake_length}",
+                       lambda size=size, snake_length=snake_length:
+                       _board_add_element(size, snake_length))
+            yield Case(f"board.is_full {label(size)} snake={snake_length}",
+                       lambda size=size, snake_length=snake_length:
+                       _board_is_full(size, snake_length))
+
+    for radius in BOMB_RADII:
+        yield Case(f"bomb.shockwave_ripples radius={radius}",
+                   lambda radius=radius: _shockwave_ripples(radius))
+
+    for size, snake_length, (apples, bombs) in product(
+            BOARD_SIZES, SNAKE_LENGTHS, POPULATIONS):
+        if _fits(size, snake_length):
+            yield Case(f"game.single_turn {label(size)} "
+                       f"snake={snake_length} apples={apples} bombs={bombs}",
+                       lambda size=size, snake_length=snake_length,
+                       apples=apples, bombs=bombs:
+                       _single_turn(size, snake_length, apples, bombs))
+            yield Case(f"game.clone_and_turn {label(size)} "
+                       f"snake={snake_length} apples={apples} bombs={bombs}",
+                       lambda size=size, snake_length=snake_length,
+                       apples=apples, bombs=bombs:
+                       _clone_and_turn(size, snake_length, apples, bombs))
+
+    for size, drawn_cells in product(BOARD_SIZES, DRAWN_CELLS):
+        yield Case(f"display.update_drawing {label(size)} "
+                   f"cells={drawn_cells}",
+                   lambda size=size, drawn_cells=drawn_cells:
+                   _update_drawing(size, drawn_cells))
+
+
+def measure(case: Case,
+            repeats: int = REPEATS,
+            min_run_time: float = MIN_RUN_TIME) -> float:
+    """
+    measure a single case: the amount of operations per run is doubled
+    until a run lasts long enough, then the fastest of several runs is
+    kept.
+
+    :return: the time of a single operation, in seconds.
+    """
+    run = case.setup()
+    operations = 1
+    while True:
+        elapsed = run(operations)
+        if elapsed >= min_run_time:
+            break
+        operations *= 2
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        best = min(best, run(operations))
+    return best / operations
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    """
+    read stored results (see "save_baseline").
+
+    :return: case name -> the time of a single operation, in seconds.
+    """
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version "
+                         f"{baseline.get('version')}")
+    return baseline["results"]
+
+
+def save_baseline(path: str, results: List[Result]) -> None:
+    """
+    store results as a json baseline, along with the interpreter they were
+    measured by.
+    """
+    baseline = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": {result.name: result.seconds for result in results},
+    }
+    with open(path, "w") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+
+
+def run_cases(selected: List[Case],
+              baseline: Optional[Dict[str, float]] = None,
+              repeats: int = REPEATS,
+              min_run_time: float = MIN_RUN_TIME) -> Iterator[Result]:
+    """
+    measure the given cases, one after the other.
+
+    :param selected: the cases to measure.
+    :param baseline: case name -> the time of a single operation to compare
+                     with.
+    :param repeats: the amount of runs per case.
+    :param min_run_time: the minimal duration of a run, in seconds.
+    """
+    baseline = baseline or {}
+    for case in selected:
+        yield Result(case.name,
+                     measure(case, repeats, min_run_time),
+                     baseline.get(case.name))
+
+
+def format_result(result: Result, tolerance: float = TOLERANCE) -> str:
+    """
+    return a report line of a single case (times are in microseconds).
+    """
+    line = f"{result.name:<58}{result.seconds * 1e6:>12.3f}"
+    ratio = result.get_ratio()
+    if ratio is not None:
+        line += f"{result.baseline * 1e6:>12.3f}{ratio:>8.2f}x"
+        if result.is_regression(tolerance):
+            line += "  REGRESSION"
+    return line
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    run the benchmarks & compare them against a baseline.
+
+    :return: the exit status: 1 if any case has regressed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        description="benchmark the hot paths of the game")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="the baseline to compare with / to save")
+    parser.add_argument("--save", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--filter", default="",
+                        help="only run the cases whose names contain this")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="the allowed slowdown before a case regresses")
+    parser.add_argument("--quick", action="store_true",
+                        help="shorter & fewer runs, for a rough estimate")
+    args = parser.parse_args(argv)
+
+    baseline = None  # type: Optional[Dict[str, float]]
+    if not args.save:
+        try:
+            baseline = load_baseline(args.baseline)
+        except FileNotFoundError:
+            print(f"no baseline at {args.baseline}, use --save to store one")
+
+    repeats, min_run_time = (2, 0.01) if args.quick else \
+        (REPEATS, MIN_RUN_TIME)
+    selected = [case for case in cases() if args.filter in case.name]
+
+    print(f"{'case':<58}{'us/op':>12}{'baseline':>12}{'ratio':>9}")
+    results = []  # type: List[Result]
+    for result in run_cases(selected, baseline, repeats, min_run_time):
+        print(format_result(result, args.tolerance), flush=True)
+        results.append(result)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    regressions = [result for result in results
+                   if result.is_regression(args.tolerance)]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond "
+              f"{args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+import copy
+import random
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from apple import Apple
+from bomb import Bomb
+from bomb_field import BombField
+from game import Game
+from game_config import GameConfig
+from random_stream import RandomStream
+from snake import Snake, Direction
+
+OPPOSITE_DIRECTIONS = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.RIGHT: Direction.LEFT,
+    Direction.LEFT: Direction.RIGHT,
+}
+
+DIRECTION_STEPS = {
+    Direction.UP: (0, 1),
+    Direction.DOWN: (0, -1),
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+}
+
+
+def popcount(mask: int) -> int:
+    """
+    count the set bits of a bitmask.
+    """
+    return mask.bit_count()
+
+
+def random_set_bit(mask: int,
+                   width: int,
+                   generator: random.Random) -> Optional[int]:
+    """
+    draw a set bit of a bitmask uniformly at random: the set bit of a random
+    rank, counting the set bits from the least significant one.
+
+    :param mask: a bitmask.
+    :param width: the amount of bits of the bitmask.
+    :param generator: the random generator to draw with.
+    :return: the index of the drawn bit, or None if no bit is set.
+    """
+    amount = popcount(mask)
+    if amount == 0:
+        return None
+
+    # binary search for the bit of that rank, within [low, high).
+    rank = generator.randrange(amount)
+    low, high = 0, width
+    while high - low > 1:
+        middle = (low + high) // 2
+        below = popcount(mask >> low & ((1 << (middle - low)) - 1))
+        if rank < below:
+            high = middle
+        else:
+            rank -= below
+            low = middle
+    return low
+
+
+class BitBoard:
+    """
+    a representation of the state of a game as integer bitmasks, one bit per
+    cell of the board, which enforces the same rules as "Game".
+
+    the cell (column, row) is represented by the bit column * height + row,
+    so collisions, apple pickups & checking if the board is full are all
+    bitwise operations over the layers of the board: the snake body, its
+    head, the apples, the un-detonated bombs & the shock-wave ripples (both
+    kept by a "BombField").
+    """
+
+    def __init__(self,
+                 config: Optional[GameConfig] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        create an empty bit-board.
+
+        :param config: the configuration of the game (the default
+                       configuration if None).
+        :param seed: the seed of the random draws of the game (None for a
+                     seed drawn by the operating system).
+        """
+        self._config = config or GameConfig()
+        length = self._length = self._config.length
+        height = self._height = self._config.height
+        self._all_cells = (1 << (length * height)) - 1
+
+        self._snake_mask = 0
+        self._head_mask = 0
+        self._apples_mask = 0
+
+        # the snake body, from its tail to its head.
+        self._body = deque()  # type: Deque[Tuple[int, int]]
+        self._direction = Direction.UP
+        self._growth_counter = 0
+        # apple cell -> its score, in the order the apples were created.
+        self._apples = {}  # type: Dict[Tuple[int, int], int]
+        self._bombs = BombField(length, height)
+        self._score = 0
+        self._playing = True
+        self._random = RandomStream(seed,
+                                    self._config.apple_scores,
+                                    self._config.bomb_radii,
+                                    self._config.bomb_times)
+
+    @classmethod
+    def from_game(cls, game: Game) -> 'BitBoard':
+        """
+        convert the state of a game into a bit-board.
+        """
+        bits = cls(game.get_config())
+
+        snake = game.get_snake()
+        bits._body = deque(snake.get_coordinates())
+        bits._direction = snake.get_direction()
+        bits._growth_counter = snake.get_growth_counter()
+        for cell in bits._body:
+            bits._snake_mask |= bits.cell_mask(cell)
+        bits._head_mask = bits.cell_mask(snake.get_head())
+
+        for apple in game.get_apples():
+            cell = apple.get_coordinates()[0]
+            bits._apples[cell] = apple.get_score()
+            bits._apples_mask |= bits.cell_mask(cell)
+
+        for bomb in game.get_bombs():
+            bits._bombs.add(bomb.get_location(),
+                            bomb.get_max_radius(),
+                            bomb.get_turns_until_explosion(),
+                            bomb.is_detonated(),
+                            bomb.get_radius())
+
+        bits._score = game.get_score()
+        bits._playing = game.is_playing()
+        bits._random = copy.copy(game.get_random())
+        return bits
+
+    def to_game(self) -> Game:
+        """
+        convert the bit-board back into a game.
+        """
+        snake = Snake.from_body(list(self._body),
+                                self._direction,
+                                self._growth_counter)
+        apples = [Apple(cell, score) for cell, score in self._apples.items()]
+        bombs = [Bomb.restore(*self._bombs.get(index))
+                 for index in range(len(self._bombs))]
+        return Game.restore(self._config, snake, apples, bombs, self._score,
+                            self._playing, copy.copy(self._random))
+
+    def clone(self) -> 'BitBoard':
+        """
+        create an independent copy of the bit-board.
+        """
+        bits = copy.copy(self)
+        bits._body = deque(self._body)
+        bits._apples = dict(self._apples)
+        bits._bombs = self._bombs.copy()
+        bits._random = copy.copy(self._random)
+        return bits
+
+    def cell_mask(self, cell: Tuple[int, int]) -> int:
+        """
+        :return: the bitmask of a single cell (0 if it's out of the bounds
+                 of the board).
+        """
+        column, row = cell
+        if 0 <= column < self._length and 0 <= row < self._height:
+            return 1 << (column * self._height + row)
+        return 0
+
+    def get_snake_mask(self) -> int:
+        """
+        return the bitmask of the cells occupied by the snake body.
+        """
+        return self._snake_mask
+
+    def get_head_mask(self) -> int:
+        """
+        return the bitmask of the cell occupied by the snake's head.
+        """
+        return self._head_mask
+
+    def get_apples_mask(self) -> int:
+        """
+        return the bitmask of the cells occupied by apples.
+        """
+        return self._apples_mask
+
+    def get_bombs_mask(self) -> int:
+        """
+        return the bitmask of the cells occupied by un-detonated bombs.
+        """
+        return self._bombs.get_bombs_mask()
+
+    def get_shockwave_mask(self) -> int:
+        """
+        return the bitmask of the cells occupied by shock-wave ripples.
+        """
+        return self._bombs.get_shockwave_mask()
+
+    def get_score(self) -> int:
+        """
+        return the player score.
+        """
+        return self._score
+
+    def get_snake_length(self) -> int:
+        """
+        return the amount of cells the snake body consists of.
+        """
+        return len(self._body)
+
+    def is_playing(self) -> bool:
+        """
+        check if the game is still playing.
+        """
+        return self._playing
+
+    def _occupied_mask(self) -> int:
+        """
+        return the bitmask of all the occupied cells.
+        """
+        return (self._snake_mask | self._apples_mask |
+                self._bombs.get_hazard_mask())
+
+    def is_full(self) -> bool:
+        """
+        check if there are no empty cells in the board.
+        """
+        return self._occupied_mask() == self._all_cells
+
+    def create_snake(self) -> None:
+        """
+        create a new snake at the middle of the board, exactly like
+        "Game.create_snake".
+        """
+        x, y = self._length // 2, self._height // 2
+        self._body = deque([(x, y - 2), (x, y - 1), (x, y)])
+        self._direction = Direction.UP
+        self._growth_counter = 0
+        self._snake_mask = 0
+        for cell in self._body:
+            self._snake_mask |= self.cell_mask(cell)
+        self._head_mask = self.cell_mask((x, y))
+        if not all(self.cell_mask(cell) for cell in self._body):
+            # the snake doesn't fit into the board.
+            self._playing = False
+
+    def create_apple(self) -> None:
+        """
+        create a new apple, or end the game if the board is full.
+        """
+        cell = self._random_empty_cell()
+        if cell is None:
+            self._playing = False
+            return
+
+        self._apples[cell] = self._random.apple_score()
+        self._apples_mask |= self.cell_mask(cell)
+
+    def create_bomb(self) -> None:
+        """
+        create a new bomb, unless the board is full.
+        """
+        cell = self._random_empty_cell()
+        if cell is None:
+            return
+
+        radius, time_to_explode = self._random.bomb_timing()
+        self._bombs.add(cell, radius, time_to_explode)
+
+    def _random_empty_cell(self) -> Optional[Tuple[int, int]]:
+        """
+        draw an empty cell uniformly at random: the empty cell of a random
+        rank, counting the empty cells column by column, exactly like
+        "Board.random_empty_cell".
+
+        :return: the coordinates of the drawn cell, or None if the board
+                 is full.
+        """
+        index = random_set_bit(self._all_cells & ~self._occupied_mask(),
+                               self._length * self._height, self._random)
+        if index is None:
+            return None
+        return divmod(index, self._height)
+
+    def single_turn(self, direction: Optional[Direction]) -> None:
+        """
+        execute a single turn, exactly like "Game.single_turn".
+
+        :param direction: in which direction the snake should move.
+        """
+        if direction is not None and \
+                direction is not OPPOSITE_DIRECTIONS[self._direction]:
+            self._direction = direction
+
+        # move the snake.
+        if self._growth_counter == 0:
+            tail = self._body.popleft()
+            self._snake_mask &= ~self.cell_mask(tail)
+        else:
+            self._growth_counter -= 1
+
+        column, row = self._body[-1]
+        step_column, step_row = DIRECTION_STEPS[self._direction]
+        head = (column + step_column, row + step_row)
+        self._body.append(head)
+        self._head_mask = self.cell_mask(head)
+
+        # the snake crashed into a wall, into himself or into a bomb.
+        if not self._head_mask or \
+                self._head_mask & (self._snake_mask |
+                                   self._bombs.get_hazard_mask()):
+            self._snake_mask |= self._head_mask
+            self._playing = False
+            return
+        self._snake_mask |= self._head_mask
+
+        if self._head_mask & self._apples_mask:
+            self._score += self._apples.pop(head)
+            self._growth_counter += self._config.apple_growth
+            self._apples_mask &= ~self._head_mask
+            self.create_apple()
+            if not self._playing:
+                # the board is full.
+                return
+
+        self._detonate_bombs()
+
+    def _detonate_bombs(self) -> None:
+        """
+        "detonate" each & every bomb, then replace exploded apples & faded-out
+        bombs.
+        """
+        faded_bombs = self._bombs.step()
+
+        hazard = self._bombs.get_hazard_mask()
+        if self._snake_mask & hazard:
+            self._playing = False
+            return
+
+        exploded_apples = []  # type: List[Tuple[int, int]]
+        if self._apples_mask & hazard:
+            exploded_apples = [cell for cell in self._apples
+                               if self.cell_mask(cell) & hazard]
+
+        # each removal shifts the indices of the following bombs.
+        for removed, index in enumerate(faded_bombs):
+            self._bombs.remove(index - removed)
+            self.create_bomb()
+
+        for cell in exploded_apples:
+            del self._apples[cell]
+            self._apples_mask &= ~self.cell_mask(cell)
+            self.create_apple()
+            if not self._playing:
+                # the board is full.
+                return
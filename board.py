@@ -1,16 +1,62 @@
-from typing import List, Tuple, Optional, Dict, cast
+import copy
+import random
+from functools import lru_cache
+from typing import List, Tuple, Optional, Dict, Iterable, NamedTuple, Set
+from cell_table import CellTable
 from printable_object import PrintableObject
+from game_config import GameConfig
+
+
+class BoardChanges(NamedTuple):
+    """
+    the cells of a board which have changed since the previous changeset.
+    """
+    # newly occupied cells & their colors.
+    occupied: Dict[Tuple[int, int], str]
+    # cells which have become empty.
+    vacated: List[Tuple[int, int]]
+    # cells which remained occupied, but changed their colors.
+    recolored: Dict[Tuple[int, int], str]
+
+
+@lru_cache(maxsize=16)
+def board_cells(length: int, height: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    evaluate the coordinates of all the cells of a board, column by column.
+    evaluated once per board size & shared by all the boards of that size.
+
+    :param length: the length of the board.
+    :param height: the height of the board.
+    """
+    return tuple((column, row)
+                 for column in range(length)
+                 for row in range(height))
 
 
 class Board:
     """
     A class which is responsible for evaluating how to display the board-game.
     """
+    MAX_CODES = 256
+    # the length & height of a tile of a sparse compact board.
+    TILE_SIZE = 64
+    # tables which are shared between a board & its clones until altered
+    # (the tables of the cells are shared chunk by chunk, see "CellTable").
+    SHARED_TABLES = (
+        "_grid",
+        "_changes",
+        "_tiles",
+        "_tile_counts",
+        "_element_codes",
+        "_element_cells",
+    )
 
     def __init__(self,
                  length: int,
                  height: int,
-                 color_stengths: Dict[str, int]) -> None:
+                 color_stengths: Dict[str, int],
+                 compact: bool = False,
+                 sparse: bool = False) -> None:
         """
         create a new board.
 
@@ -18,16 +64,202 @@ class Board:
         :param height: desired height of the board.
         :param color_stengths: a mapping between colors to their displaying
                                precedences.
+        :param compact: whether or not to maintain a compact grid of color
+                        codes (see "grid").
+        :param sparse: whether or not the memory & time consumed by a compact
+                       board should scale with the amount of occupied cells
+                       rather than with the area of the board, which suits
+                       huge boards with few elements. a sparse compact board
+                       keeps its grid in tiles (see "get_tiles").
         """
         if length <= 0:
             raise ValueError("length must be greater than zero")
         if height <= 0:
             raise ValueError("height must be greater than zero")
-        self._elements = []  # type: List[PrintableObject]
+        # handle -> element, in the order the elements were added.
+        self._elements = {}  # type: Dict[int, PrintableObject]
         self._length = length
         self._height = height
         self._colors_stengths = color_stengths
-        self._occupied_cells = {} # type: Dict[Tuple[int, int], str]
+        self._always_overridden = min(color_stengths.values()) - 1
+
+        # colors are interned into small integer codes, ordered by their
+        # displaying precedence, so the "strongest" color is the maximal code.
+        # code 0 stands for an empty cell.
+        self._code_colors = [None]  # type: List[Optional[str]]
+        self._color_codes = {}  # type: Dict[str, int]
+        for color in sorted(color_stengths, key=color_stengths.__getitem__):
+            self._color_codes[color] = len(self._code_colors)
+            self._code_colors.append(color)
+        if len(self._code_colors) > self.MAX_CODES:
+            raise ValueError(f"at most {self.MAX_CODES - 1} colors are "
+                             f"supported")
+
+        self._grid = None  # type: Optional[bytearray]
+        # tile -> its grid, only tiles with occupied cells are allocated.
+        self._tiles = None  # type: Optional[Dict[Tuple[int, int], bytearray]]
+        # tile -> amount of occupied cells within it.
+        self._tile_counts = {}  # type: Dict[Tuple[int, int], int]
+        if compact and sparse:
+            self._tiles = {}
+        elif compact:
+            self._grid = bytearray(length * height)
+
+        # cell -> its color before it was first changed since the last
+        # changeset.
+        self._changes = {}  # type: Dict[Tuple[int, int], Optional[str]]
+        self._track_changes = True
+
+        # incremental occupancy bookkeeping.
+        # elements aren't hashable, so each added element gets a handle.
+        self._next_handle = 0
+        self._handles = {}  # type: Dict[int, int]
+        self._element_codes = {}  # type: Dict[int, int]
+        # handle -> {cell: how many times the element occupies the cell}
+        self._element_cells = {}  # type: Dict[int, Dict[Tuple[int, int], int]]
+        # cell -> {handle: how many times the element occupies the cell},
+        # only the occupied cells, whose colors are evaluated from their
+        # elements (see "_color").
+        self._cell_owners = CellTable(length, height)
+
+        # copy-on-write bookkeeping (see "clone").
+        # names of the tables shared with another board.
+        self._shared = set()  # type: Set[str]
+        # the handles & cells whose nested tables were copied since the
+        # board was last cloned (None if it was never cloned).
+        self._private_handles = None  # type: Optional[Set[int]]
+        self._private_cells = None  # type: Optional[Set[Tuple[int, int]]]
+        self._private_tiles = None  # type: Optional[Set[Tuple[int, int]]]
+
+    @classmethod
+    def from_config(cls,
+                    config: GameConfig,
+                    compact: bool = False,
+                    sparse: bool = False) -> 'Board':
+        """
+        create a new board of a game configuration (see "__init__").
+
+        :param config: the configuration of the game.
+        :param compact: whether or not to maintain a compact grid of color
+                        codes.
+        :param sparse: whether or not the board should be kept sparse.
+        """
+        return cls(config.length, config.height,
+                   config.get_color_strengths(), compact, sparse)
+
+    def clone(self,
+              replacements: Optional[Dict[int, PrintableObject]] = None
+              ) -> 'Board':
+        """
+        create a copy of the board.
+        the copy shares its tables with this board until either of them is
+        altered, & the tables of the cells are shared chunk by chunk, so
+        cloning costs about the amount of elements on the board, while any
+        further change costs about the amount of state which actually
+        diverges, regardless of the area of the board.
+
+        :param replacements: mapping between ids of elements on this board
+                             to the elements which should replace them on
+                             the copy (elements which aren't replaced are
+                             shared by both boards).
+        :return: the copy.
+        """
+        replacements = replacements or {}
+        board = copy.copy(self)
+        board._elements = {
+            handle: replacements.get(id(element), element)
+            for handle, element in self._elements.items()
+        }
+        board._handles = {
+            id(element): handle for handle, element in board._elements.items()
+        }
+        board._cell_owners = self._cell_owners.copy()
+
+        for clone in (self, board):
+            clone._shared = set(self.SHARED_TABLES)
+            clone._private_handles = set()
+            clone._private_cells = set()
+            clone._private_tiles = set()
+
+        return board
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> 'Board':
+        """
+        create a deep copy of the board, which doesn't share any of its
+        tables (elements are identified by their ids, which differ between
+        the copies).
+        """
+        board = Board.__new__(Board)
+        memo[id(self)] = board
+        for name, value in self.__dict__.items():
+            setattr(board, name, copy.deepcopy(value, memo))
+
+        board._handles = {
+            id(element): handle for handle, element in board._elements.items()
+        }
+        board._shared = set()
+        board._private_handles = None
+        board._private_cells = None
+        board._private_tiles = None
+        return board
+
+    def __getstate__(self) -> Dict[str, object]:
+        """
+        the state of a pickled board, which doesn't share any of its tables
+        (elements are identified by their ids, which differ once unpickled).
+        """
+        state = dict(self.__dict__)
+        del state["_handles"]
+        state["_shared"] = set()
+        state["_private_handles"] = None
+        state["_private_cells"] = None
+        state["_private_tiles"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._handles = {
+            id(element): handle for handle, element in self._elements.items()
+        }
+
+    def _own(self, table: str) -> None:
+        """
+        make sure a table isn't shared with another board before altering it.
+        """
+        if table in self._shared:
+            self._shared.discard(table)
+            setattr(self, table, copy.copy(getattr(self, table)))
+
+    def _own_element_cells(self,
+                           handle: int) -> Dict[Tuple[int, int], int]:
+        """
+        :return: the cells of the element of the given handle, ready to be
+                 altered.
+        """
+        self._own("_element_cells")
+        cells = self._element_cells[handle]
+        if self._private_handles is not None and \
+                handle not in self._private_handles:
+            cells = dict(cells)
+            self._element_cells[handle] = cells
+            self._private_handles.add(handle)
+        return cells
+
+    def _own_cell_owners(self, cell: Tuple[int, int]) -> Dict[int, int]:
+        """
+        :return: the elements occupying the given cell, ready to be altered.
+        """
+        owners = self._cell_owners.get(cell)
+        if owners is None:
+            owners = {}
+            self._cell_owners.set(cell, owners)
+        elif self._private_cells is not None and \
+                cell not in self._private_cells:
+            owners = dict(owners)
+            self._cell_owners.set(cell, owners)
+        if self._private_cells is not None:
+            self._private_cells.add(cell)
+        return owners
 
     def get_length(self) -> int:
         """
@@ -64,18 +296,9 @@ class Board:
         """
         board = self._empty_board()
 
-        for element in self._elements:
-            for cell in element.get_coordinates():
-                column, row = cell
-                color = element.get_color()
-                if not self.is_cell_in_board(cell):
-                    continue
-                # current cell isn't empty
-                # use the "stronger" color.
-                if board[column][row] is not None:
-                    current_color = cast(str, board[column][row])
-                    color = self.determine_color(current_color, color)
-                board[column][row] = color
+        for cell, color in self.get_cells().items():
+            column, row = cell
+            board[column][row] = color
 
         return board
 
@@ -90,44 +313,101 @@ class Board:
         :param color: a color candidate for the same cell within board.
         :return: color to display.
         """
-        current_color_stength = self._color_stength(current_color)
-        color_stength = self._color_stength(color)
+        if self._color_stength(color) >= self._color_stength(current_color):
+            return color
+        return current_color
 
-        colors = {
-            current_color_stength: current_color,
-            color_stength: color,
-        }
+    def grid(self) -> memoryview:
+        """
+        export the compact grid of the board (without copying it).
 
-        return colors[max([current_color_stength, color_stength])]
+        the grid holds a single byte per cell, ordered column by column (the
+        cell (column, row) is at index column * height + row), which is the
+        color code of the cell (see "get_color_codes") or 0 if it's empty.
+        the view reflects any further change to the board.
+        """
+        if self._tiles is not None:
+            raise ValueError("the grid of a sparse board is kept in tiles")
+        if self._grid is None:
+            raise ValueError("the board wasn't created in compact mode")
+        return memoryview(self._grid)
 
-    def cells_list(self) -> List[Tuple[int, int]]:
+    def get_tiles(self) -> Dict[Tuple[int, int], memoryview]:
         """
-        return a list of all the board cells coordinates.
+        export the compact grid of a sparse board (without copying it).
+
+        the tile (i, j) covers the cells (column, row) where
+        column // TILE_SIZE == i and row // TILE_SIZE == j. each tile is laid
+        out just like the grid of a board of TILE_SIZE * TILE_SIZE cells (see
+        "grid"). tiles which aren't returned are entirely empty.
         """
-        cells = []  # type: List[Tuple[int, int]]
+        if self._tiles is None:
+            raise ValueError("the board wasn't created in sparse compact "
+                             "mode")
+        return {tile: memoryview(cells) for tile, cells in self._tiles.items()}
 
-        for column in range(self._length):
-            for row in range(self._height):
-                cells.append((column, row))
+    def get_color_codes(self) -> Dict[str, int]:
+        """
+        return a mapping between colors to their codes within the grid.
+        a stronger color always has a greater code.
+        """
+        return dict(self._color_codes)
 
-        return cells
+    def _color_code(self, color: str) -> int:
+        """
+        :param color: a color name.
+        :return: the code of that color.
+        """
+        code = self._color_codes.get(color)
+        if code is None:
+            raise ValueError(f"color {color} has no displaying precedence")
+        return code
+
+    def get_copied_chunks(self) -> Set[int]:
+        """
+        get the chunks of the table of the cells which the board has copied
+        since it was last cloned (see "CellTable.get_copied_chunks").
+        """
+        return self._cell_owners.get_copied_chunks()
+
+    def cells_list(self) -> List[Tuple[int, int]]:
+        """
+        return a list of all the board cells coordinates.
+        note that this scales with the area of the board, even if it's sparse.
+        """
+        return list(board_cells(self._length, self._height))
 
     def is_full(self) -> bool:
         """
         check if there are no empty cells in the board.
         """
-        for cell in self.cells_list():
-            if self.cell_is_empty(cell):
-                return False
-        return True
+        return len(self._cell_owners) == self._length * self._height
+
+    def random_empty_cell(self, rng: Optional[random.Random] = None
+                          ) -> Optional[Tuple[int, int]]:
+        """
+        draw an empty cell of the board uniformly at random: the empty cell
+        of a random rank, counting the empty cells column by column (the
+        same way as "BitBoard" draws its empty cells).
+
+        :param rng: the random generator to draw with (the global one by
+                    default).
+        :return: the coordinates of the drawn cell, or None if the board
+                 is full.
+        """
+        if self.is_full():
+            return None
+        generator = rng or random
+
+        empty = self._length * self._height - len(self._cell_owners)
+        return self._cell_owners.missing_cell(generator.randrange(empty))
 
     def _color_stength(self, color: str) -> int:
         """
         :param color: a color name.
         :return: the precedence of that color.
         """
-        always_overridden = min(self._colors_stengths.values())
-        return self._colors_stengths.get(color, always_overridden - 1)
+        return self._colors_stengths.get(color, self._always_overridden)
 
     def is_cell_in_board(self, cell: Tuple[int, int]) -> bool:
         """
@@ -146,7 +426,20 @@ class Board:
         column, row = cell
         return self.board()[column][row]
         """
-        return self._occupied_cells.get(cell)
+        owners = self._cell_owners.get(cell)
+        return self._color(owners) if owners is not None else None
+
+    def get_elements_at(self,
+                        cell: Tuple[int, int]) -> List[PrintableObject]:
+        """
+        retrieve the elements occupying the cell pointed by the given
+        coordinates.
+
+        :param cell: coordinates of a cell.
+        :return: list of the elements occupying the cell (each one once).
+        """
+        return [self._elements[handle]
+                for handle in self._cell_owners.get(cell, ())]
 
     def cell_is_empty(self, cell: Tuple[int, int]) -> bool:
         """
@@ -156,11 +449,16 @@ class Board:
         """
         return self.get_cell(cell) is None
 
-    def add_element(self, element: PrintableObject) -> bool:
+    def add_element(self,
+                    element: PrintableObject,
+                    allow_overlap: bool = False) -> bool:
         """
         add a printable element/object to the board.
 
         :param element: an element to add to the board.
+        :param allow_overlap: whether or not the element may occupy cells
+                              which are occupied or out of the bounds of the
+                              board (e.g. when restoring a saved game).
         :return: whether or not the adding action was successful.
 
         NOTE:
@@ -171,11 +469,13 @@ class Board:
             3) at-least one of the cells occupied by the given element are
                already occupied by another element.
         """
-        self.update()
-
-        if element in self._elements:
+        if id(element) in self._handles:
             return False
 
+        if allow_overlap:
+            self._place(element)
+            return True
+
         cells = element.get_coordinates()
         for cell in cells:
             if not self.is_cell_in_board(cell):
@@ -185,33 +485,295 @@ class Board:
             if not self.cell_is_empty(cell):
                 return False
 
-        self._elements.append(element)
+        self._place(element)
         return True
 
     def remove_element(self, element: PrintableObject) -> None:
         """
         remove an element from the board.
         """
-        if element in self._elements:
-            self._elements.remove(element)
+        if id(element) in self._handles:
+            self._unplace(element)
+
+    def move_element(self,
+                     element: PrintableObject,
+                     entered: Iterable[Tuple[int, int]],
+                     vacated: Iterable[Tuple[int, int]]
+                     ) -> List[Tuple[int, int]]:
+        """
+        notify the board that an element have moved, by specifying only the
+        cells the element have entered & the cells it have left.
+
+        :param element: an element previously added to the board.
+        :param entered: cells newly occupied by the element.
+        :param vacated: cells no longer occupied by the element.
+        :return: the in-board cells newly occupied by the element.
+        """
+        handle = self._handles[id(element)]
+        code = self._color_code(element.get_color())
+        if self._element_codes[handle] != code:
+            return self.refresh_element(element)
+
+        for cell in vacated:
+            if self.is_cell_in_board(cell):
+                self._vacate(handle, cell)
+        occupied = []  # type: List[Tuple[int, int]]
+        for cell in entered:
+            if self.is_cell_in_board(cell):
+                self._occupy(handle, cell)
+                occupied.append(cell)
+        return occupied
+
+    def refresh_element(self,
+                        element: PrintableObject) -> List[Tuple[int, int]]:
+        """
+        re-evaluate the cells occupied by a single element, updating only the
+        cells which have actually changed.
+
+        :param element: an element previously added to the board.
+        :return: the in-board cells newly occupied by the element (or
+                 re-colored by it).
+        """
+        handle = self._handles[id(element)]
+        old_cells = self._element_cells[handle]
+        new_cells = self._count_cells(element)
+
+        code = self._color_code(element.get_color())
+        if self._element_codes[handle] != code:
+            # every cell of the element changes color.
+            for cell, count in list(old_cells.items()):
+                for _ in range(count):
+                    self._vacate(handle, cell)
+            self._own("_element_codes")
+            self._element_codes[handle] = code
+            old_cells = self._element_cells[handle]
+
+        for cell, count in list(old_cells.items()):
+            for _ in range(count - new_cells.get(cell, 0)):
+                self._vacate(handle, cell)
+        occupied = []  # type: List[Tuple[int, int]]
+        for cell, count in new_cells.items():
+            for _ in range(count - old_cells.get(cell, 0)):
+                self._occupy(handle, cell)
+                occupied.append(cell)
+        return occupied
 
     def update(self) -> None:
         """
-        re-evaluate the occupied cells.
+        re-evaluate the occupied cells of every element.
+
+        the board is kept up to date incrementally (see "move_element" &
+        "refresh_element"), so this is only required for elements which have
+        moved without notifying the board.
+        """
+        for element in list(self._elements.values()):
+            self.refresh_element(element)
+
+    def _count_cells(self,
+                     element: PrintableObject) -> Dict[Tuple[int, int], int]:
+        """
+        :return: mapping between the in-board cells occupied by the element to
+                 the amount of times the element occupies them.
+        """
+        cells = {}  # type: Dict[Tuple[int, int], int]
+        for cell in element.get_coordinates():
+            if self.is_cell_in_board(cell):
+                cells[cell] = cells.get(cell, 0) + 1
+        return cells
+
+    def _place(self, element: PrintableObject) -> None:
+        """
+        register a newly added element & occupy its cells.
+        """
+        code = self._color_code(element.get_color())
+        handle = self._next_handle
+        self._next_handle += 1
+        self._handles[id(element)] = handle
+        self._elements[handle] = element
+        self._own("_element_codes")
+        self._element_codes[handle] = code
+        self._own("_element_cells")
+        self._element_cells[handle] = {}
+        if self._private_handles is not None:
+            self._private_handles.add(handle)
+
+        for cell, count in self._count_cells(element).items():
+            for _ in range(count):
+                self._occupy(handle, cell)
+
+    def _unplace(self, element: PrintableObject) -> None:
+        """
+        vacate all the cells of a removed element & forget about it.
+        """
+        handle = self._handles.pop(id(element))
+        for cell, count in list(self._element_cells[handle].items()):
+            for _ in range(count):
+                self._vacate(handle, cell)
+        self._own("_element_cells")
+        del self._element_cells[handle]
+        self._own("_element_codes")
+        del self._element_codes[handle]
+        del self._elements[handle]
+
+    def _occupy(self, handle: int, cell: Tuple[int, int]) -> None:
+        """
+        mark a cell as occupied (once more) by the element of the handle.
+        """
+        cells = self._own_element_cells(handle)
+        cells[cell] = cells.get(cell, 0) + 1
+
+        owners = self._own_cell_owners(cell)
+        if self._track_changes and cell not in self._changes:
+            self._track(cell, owners)
+        owners[handle] = owners.get(handle, 0) + 1
+        self._repaint(cell, owners)
+
+    def _vacate(self, handle: int, cell: Tuple[int, int]) -> None:
+        """
+        mark a cell as occupied once less by the element of the handle.
+        """
+        cells = self._own_element_cells(handle)
+        cells[cell] -= 1
+        if cells[cell] == 0:
+            del cells[cell]
+
+        owners = self._own_cell_owners(cell)
+        if self._track_changes and cell not in self._changes:
+            self._track(cell, owners)
+        owners[handle] -= 1
+        if owners[handle] == 0:
+            del owners[handle]
+        if not owners:
+            self._cell_owners.pop(cell)
+        self._repaint(cell, owners)
+
+    def _color(self, owners: Dict[int, int]) -> Optional[str]:
         """
-        self._occupied_cells.clear()
-        b = self.board()
+        evaluate the displayed color of a cell, i.e. the "strongest" color
+        of the elements occupying it.
 
-        for cell in self.cells_list():
+        :param owners: the elements occupying the cell.
+        :return: the color, None if the cell is empty.
+        """
+        return self._code_colors[self._code(owners)]
+
+    def _code(self, owners: Dict[int, int]) -> int:
+        """
+        :param owners: the elements occupying a cell.
+        :return: the code of the displayed color of the cell (0 if it's
+                 empty).
+        """
+        code = 0
+        for handle in owners:
+            candidate = self._element_codes[handle]
+            if candidate > code:
+                code = candidate
+        return code
+
+    def _track(self, cell: Tuple[int, int], owners: Dict[int, int]) -> None:
+        """
+        record the color of a cell before it first changes since the last
+        changeset.
+
+        :param cell: coordinates of the cell.
+        :param owners: the elements occupying the cell, before the change.
+        """
+        self._own("_changes")
+        self._changes[cell] = self._color(owners)
+
+    def _repaint(self, cell: Tuple[int, int], owners: Dict[int, int]) -> None:
+        """
+        update the color code of a single cell within the compact grid (if
+        the board is compact).
+
+        :param cell: coordinates of the cell.
+        :param owners: the elements occupying the cell.
+        """
+        if self._grid is not None:
+            self._own("_grid")
             column, row = cell
-            if b[column][row] is not None:
-                self._occupied_cells[cell] = b[column][row]
+            self._grid[column * self._height + row] = self._code(owners)
+        elif self._tiles is not None:
+            self._paint_tile(cell, self._code(owners))
+
+    def _paint_tile(self, cell: Tuple[int, int], code: int) -> None:
+        """
+        set the code of a cell of a sparse compact board, allocating or
+        releasing its tile as needed.
+        """
+        column, row = cell
+        tile = (column // self.TILE_SIZE, row // self.TILE_SIZE)
+        index = (column % self.TILE_SIZE) * self.TILE_SIZE + \
+            row % self.TILE_SIZE
+        self._own("_tiles")
+        self._own("_tile_counts")
+
+        cells = self._tiles.get(tile)
+        if cells is None:
+            if code == 0:
+                return
+            cells = bytearray(self.TILE_SIZE * self.TILE_SIZE)
+            self._tiles[tile] = cells
+        elif self._private_tiles is not None and \
+                tile not in self._private_tiles:
+            cells = bytearray(cells)
+            self._tiles[tile] = cells
+        if self._private_tiles is not None:
+            self._private_tiles.add(tile)
+
+        if cells[index] == 0 and code != 0:
+            self._tile_counts[tile] = self._tile_counts.get(tile, 0) + 1
+        elif cells[index] != 0 and code == 0:
+            self._tile_counts[tile] -= 1
+            if self._tile_counts[tile] == 0:
+                del self._tile_counts[tile]
+                del self._tiles[tile]
+                return
+        cells[index] = code
+
+    def pop_changes(self) -> BoardChanges:
+        """
+        collect the cells which have changed since the previous call (or
+        since the board was created) & start a new changeset.
+
+        cells which have changed back to their original color aren't
+        reported.
+        """
+        changes = BoardChanges({}, [], {})
+
+        for cell, old_color in self._changes.items():
+            color = self.get_cell(cell)
+            if color == old_color:
+                continue
+            if color is None:
+                changes.vacated.append(cell)
+            elif old_color is None:
+                changes.occupied[cell] = color
+            else:
+                changes.recolored[cell] = color
+
+        self._changes = {}
+        self._shared.discard("_changes")
+        return changes
+
+    def set_change_tracking(self, enabled: bool) -> None:
+        """
+        turn the recording of changesets (see "pop_changes") on or off.
+        boards which are never drawn (e.g. of headless games) shouldn't
+        accumulate changes.
+
+        :param enabled: whether or not to record the changed cells. turning
+                        the recording off discards the current changeset.
+        """
+        self._track_changes = enabled
+        if not enabled:
+            self._changes = {}
+            self._shared.discard("_changes")
 
     def get_cells(self) -> Dict[Tuple[int, int], Optional[str]]:
         """
         get a dict of all occupied cells coordinates & their
         respective colors.
         """
-        # might do a copy hear so self._occupied_cells can't be affected
-        # from outside.
-        return self._occupied_cells
\ No newline at end of file
+        return {cell: self._color(owners)
+                for cell, owners in self._cell_owners.items()}
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import Tuple, List, Set
+import copy
+from typing import Tuple, List, Dict
 from moving import Moving
 
 
@@ -10,6 +11,9 @@ class Bomb(Moving):
     EXPLOSION_THRESHOLD = 1
     COLOR_BEFORE_DETONATION = "red"
     COLOR_AFTER_DETONATION = "orange"
+    # radius -> offsets of the cells of a shock-wave ripple of that radius,
+    # shared by all the bombs.
+    _RING_OFFSETS = {}  # type: Dict[int, Tuple[Tuple[int, int], ...]]
 
     def __init__(self,
                  location: Tuple[int, int],
@@ -33,6 +37,43 @@ class Bomb(Moving):
         self._radius = 0
         self._turns_until_explosion = turns_until_explosion
         self._location = location
+        # the whole lifecycle of the bomb is known in advance: the cells
+        # occupied by the bomb at each radius, from the bomb itself (0) up
+        # to the faded-out shock-wave (max radius + 1).
+        self._timeline = [
+            self.shockwave_ripples(ripple_radius)
+            for ripple_radius in range(radius + 2)
+        ]  # type: List[List[Tuple[int, int]]]
+
+    @classmethod
+    def restore(cls,
+                location: Tuple[int, int],
+                radius: int,
+                turns_until_explosion: int,
+                detonated: bool,
+                current_radius: int) -> 'Bomb':
+        """
+        create a bomb in the middle of a game (e.g. when restoring a saved
+        game).
+
+        :param location: the bomb coordinates.
+        :param radius: the bomb explosion radius.
+        :param turns_until_explosion: how many turns are left before the bomb
+                                      detonation.
+        :param detonated: whether or not the bomb have already detonated.
+        :param current_radius: the current radius of the shock-wave.
+        """
+        bomb = cls(location, radius, cls.EXPLOSION_THRESHOLD + 1)
+        bomb._turns_until_explosion = turns_until_explosion
+        bomb._detonated = detonated
+        bomb._radius = current_radius
+        return bomb
+
+    def clone(self) -> 'Bomb':
+        """
+        create an independent copy of the bomb.
+        """
+        return copy.copy(self)
 
     def _radius_invalid(self, radius: int) -> bool:
         return radius < self.MININAL_RADIUS
@@ -40,6 +81,36 @@ class Bomb(Moving):
     def _invalid_turns_until_explosion(self, turns: int) -> bool:
         return turns <= self.EXPLOSION_THRESHOLD
 
+    def get_location(self) -> Tuple[int, int]:
+        """
+        return the coordinates of the bomb itself.
+        """
+        return self._location
+
+    def get_max_radius(self) -> int:
+        """
+        return the bomb explosion radius.
+        """
+        return self._max_radius
+
+    def get_radius(self) -> int:
+        """
+        return the current radius of the shock-wave.
+        """
+        return self._radius
+
+    def get_turns_until_explosion(self) -> int:
+        """
+        return how many turns are left before the bomb detonation.
+        """
+        return self._turns_until_explosion
+
+    def is_detonated(self) -> bool:
+        """
+        check whether or not the bomb have already detonated.
+        """
+        return self._detonated
+
     def get_color(self) -> str:
         """
         return the color of the bomb.
@@ -70,18 +141,49 @@ class Bomb(Moving):
             # advance the shock-wave
             self._radius = self._radius + 1
 
+    def advance(self, turns: int) -> None:
+        """
+        "move" the bomb several times at once.
+
+        :param turns: amount of turns, i.e. calls to "move".
+        """
+        countdown = self._turns_until_explosion - self.EXPLOSION_THRESHOLD
+        if turns <= countdown:
+            self._turns_until_explosion -= turns
+            return
+
+        self._turns_until_explosion = self.EXPLOSION_THRESHOLD
+        turns -= max(countdown, 0)
+        if not self._detonated:
+            # the detonation itself takes a single turn.
+            self._detonated = True
+            self._radius = 0
+            turns -= 1
+        self._radius += turns
+
+    def turns_until_change(self) -> int:
+        """
+        return after how many turns, i.e. calls to "move", the bomb would
+        change either its color or the cells it occupies.
+        """
+        if not self._detonated:
+            # the count-down is invisible, only the detonation is noticeable.
+            return self._turns_until_explosion - self.EXPLOSION_THRESHOLD + 1
+        return 1
+
     def get_coordinates(self) -> List[Tuple[int, int]]:
         """
         return the coordinates of cells occupied either by the bomb itself
         before detonation or cell occupied by the explosion shock-wave ripples.
 
         :return: list of cells coordinates occupied by the bomb.
+                 the list is shared, thus must not be altered, & remains the
+                 same list object as long as the bomb doesn't move.
         """
-
-        if self._detonated:
-            return self.shockwave_ripples(self._radius)
-        else:
-            return self.shockwave_ripples(0)
+        radius = self._radius if self._detonated else 0
+        if radius < len(self._timeline):
+            return self._timeline[radius]
+        return self.shockwave_ripples(radius)
 
     def shockwave_ripples(self, radius: int) -> List[Tuple[int, int]]:
         """
@@ -92,17 +194,110 @@ class Bomb(Moving):
         :return: list of coordinates of cells currently occupied by the
                  shock-wave ripples.
         """
-        points = set()  # type: Set[Tuple[int, int]]
         x, y = self._location
+        return [(x + dx, y + dy) for dx, dy in self.ring_offsets(radius)]
+
+    @classmethod
+    def ring_offsets(cls, radius: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        :param radius: explosion radius.
+        :return: the offsets, relative to the bomb location, of the cells
+                 occupied by the shock-wave ripples of the given radius, i.e.
+                 all the cells at a manhattan distance of exactly radius.
+        """
+        offsets = cls._RING_OFFSETS.get(radius)
+        if offsets is None:
+            points = []  # type: List[Tuple[int, int]]
+            for k in range(0, radius + 1, 1):  # [0 , radius]
+                for point in ((k, radius - k), (k, k - radius),
+                              (-k, radius - k), (-k, k - radius)):
+                    if point not in points:
+                        points.append(point)
+            offsets = tuple(points)
+            cls._RING_OFFSETS[radius] = offsets
+        return offsets
+
+    def _current_radius(self) -> int:
+        """
+        return the radius of the cells currently occupied by the bomb (0
+        before detonation).
+        """
+        return self._radius if self._detonated else 0
+
+    def _radius_after(self, turns: int) -> int:
+        """
+        :param turns: amount of future turns, i.e. calls to "move".
+        :return: the radius of the cells which would be occupied by the bomb
+                 after the given amount of turns (0 before detonation).
+        """
+        if not self._detonated:
+            countdown = self._turns_until_explosion - self.EXPLOSION_THRESHOLD
+            if turns <= countdown:
+                return 0
+            # the detonation itself takes a single turn.
+            return turns - countdown - 1
+        return self._radius + turns
+
+    def hits(self, cell: Tuple[int, int]) -> bool:
+        """
+        check whether or not a cell is currently occupied either by the bomb
+        itself or by its shock-wave ripples, without evaluating the cells.
+
+        :param cell: coordinates of a cell.
+        """
+        return self._distance(cell) == self._current_radius()
+
+    def hits_after(self, cell: Tuple[int, int], turns: int) -> bool:
+        """
+        check whether or not a cell would be occupied either by the bomb
+        itself or by its shock-wave ripples after the given amount of turns.
+
+        :param cell: coordinates of a cell.
+        :param turns: amount of future turns, i.e. calls to "move".
+        """
+        return self._distance(cell) == self._radius_after(turns)
+
+    def _distance(self, cell: Tuple[int, int]) -> int:
+        """
+        return the manhattan distance between a cell & the bomb location.
+        """
+        return abs(cell[0] - self._location[0]) + \
+            abs(cell[1] - self._location[1])
+
+    def get_bounding_box(self) -> Tuple[int, int, int, int]:
+        """
+        return the smallest rectangle containing the cells currently occupied
+        by the bomb, as (min column, min row, max column, max row).
+        """
+        radius = self._current_radius()
+        x, y = self._location
+        return x - radius, y - radius, x + radius, y + radius
+
+    def cells_in_rect(self,
+                      min_column: int,
+                      min_row: int,
+                      max_column: int,
+                      max_row: int) -> List[Tuple[int, int]]:
+        """
+        find the cells within a rectangle (bounds included) which are
+        currently occupied by the bomb, without evaluating the cells outside
+        of it.
+
+        :return: list of coordinates of the occupied cells within the
+                 rectangle.
+        """
+        radius = self._current_radius()
+        x, y = self._location
+        cells = []  # type: List[Tuple[int, int]]
 
-        for i in range(0, radius + 1, 1):  # [0, radius]
-            for k in range(0, i + 1, 1):  # [0 , i]
-                points.add((x + k, y + (radius - k)))
-                points.add((x + k, y - (radius - k)))
-                points.add((x - k, y + (radius - k)))
-                points.add((x - k, y - (radius - k)))
+        for row in range(max(min_row, y - radius),
+                         min(max_row, y + radius) + 1):
+            dx = radius - abs(row - y)
+            for column in {x - dx, x + dx}:
+                if min_column <= column <= max_column:
+                    cells.append((column, row))
 
-        return list(points)
+        return cells
 
     def attack_is_over(self) -> bool:
         """
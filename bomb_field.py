@@ -0,0 +1,239 @@
+import copy
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from bomb import Bomb
+
+# the location, explosion radius & detonation step of a detonated bomb.
+Detonation = Tuple[Tuple[int, int], int, int]
+
+
+@lru_cache(maxsize=1 << 16)
+def ring_mask(length: int,
+              height: int,
+              location: Tuple[int, int],
+              radius: int) -> int:
+    """
+    evaluate the bitmask of the in-board cells occupied by the shock-wave
+    ripples of a bomb (see "Bomb.shockwave_ripples"), where the cell
+    (column, row) is represented by the bit column * height + row.
+
+    :param length: the length of the board.
+    :param height: the height of the board.
+    :param location: the bomb coordinates.
+    :param radius: current explosion radius.
+    """
+    x, y = location
+    mask = 0
+
+    for dx, dy in Bomb.ring_offsets(radius):
+        column, row = x + dx, y + dy
+        if 0 <= column < length and 0 <= row < height:
+            mask |= 1 << (column * height + row)
+
+    return mask
+
+
+class BombField:
+    """
+    all the bombs of a board, stored as parallel arrays (one entry per bomb)
+    rather than as separate "Bomb" objects.
+
+    the whole field advances in a single step per turn, which yields the
+    combined bitmasks of the cells occupied by un-detonated bombs & by the
+    shock-wave ripples (see "BitBoard" for the bitmasks layout).
+
+    each bomb is stored along with the step in which it detonates, so its
+    countdown & radius follow from the amount of steps taken. a step only
+    touches the bombs which change in it: the bombs which detonate in it
+    (found by a timing wheel, like "Game" does) are toggled out of the
+    bitmask of the un-detonated bombs, & the shock-wave ripples are combined
+    out of the detonated bombs alone. the bombs keep distinct locations while
+    un-detonated (they are placed on empty cells).
+    """
+
+    def __init__(self, length: int, height: int) -> None:
+        """
+        create an empty bomb field.
+
+        :param length: the length of the board.
+        :param height: the height of the board.
+        """
+        self._length = length
+        self._height = height
+        # the amount of steps taken.
+        self._turn = 0
+        self._next_key = 0
+
+        # every bomb gets a key, which identifies it regardless of its index.
+        self._keys = array("q")
+        self._columns = array("i")
+        self._rows = array("i")
+        self._max_radii = array("i")
+        # the step in which each bomb detonates (or have detonated).
+        self._detonations = array("q")
+
+        # step -> the keys of the bombs which detonate in it.
+        self._wheel = {}  # type: Dict[int, List[int]]
+        # key -> the detonation of a bomb, for the detonated bombs.
+        self._detonated = {}  # type: Dict[int, Detonation]
+
+        self._bombs_mask = 0
+        # None once a detonated bomb was removed, until it's re-evaluated.
+        self._shockwave_mask = 0  # type: Optional[int]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def copy(self) -> 'BombField':
+        """
+        create an independent copy of the field.
+        """
+        field = copy.copy(self)
+        for name in ("_keys", "_columns", "_rows", "_max_radii",
+                     "_detonations"):
+            setattr(field, name, array(getattr(self, name).typecode,
+                                       getattr(self, name)))
+        field._wheel = {step: list(keys) for step, keys in self._wheel.items()}
+        field._detonated = dict(self._detonated)
+        return field
+
+    def add(self,
+            location: Tuple[int, int],
+            max_radius: int,
+            turns_until_explosion: int,
+            detonated: bool = False,
+            radius: int = 0) -> None:
+        """
+        add a bomb to the field.
+
+        :param location: the bomb coordinates.
+        :param max_radius: the bomb explosion radius.
+        :param turns_until_explosion: how many turns are left before the bomb
+                                      detonation.
+        :param detonated: whether or not the bomb have already detonated.
+        :param radius: the current radius of the shock-wave.
+        """
+        key = self._next_key
+        self._next_key += 1
+        # a bomb detonates in the step which follows its last countdown.
+        detonation = self._turn - radius if detonated else \
+            self._turn + max(turns_until_explosion - Bomb.EXPLOSION_THRESHOLD,
+                             0) + 1
+
+        column, row = location
+        self._keys.append(key)
+        self._columns.append(column)
+        self._rows.append(row)
+        self._max_radii.append(max_radius)
+        self._detonations.append(detonation)
+
+        if detonated:
+            self._detonated[key] = (location, max_radius, detonation)
+            if self._shockwave_mask is not None:
+                self._shockwave_mask |= ring_mask(self._length, self._height,
+                                                  location, radius)
+        else:
+            self._wheel.setdefault(detonation, []).append(key)
+            self._bombs_mask ^= ring_mask(self._length, self._height,
+                                          location, 0)
+
+    def get(self, index: int) -> Tuple[Tuple[int, int], int, int, bool, int]:
+        """
+        :param index: the index of a bomb within the field.
+        :return: the location, explosion radius, turns until explosion,
+                 whether or not the bomb have detonated & the current radius
+                 of the shock-wave of the bomb.
+        """
+        detonation = self._detonations[index]
+        detonated = detonation <= self._turn
+        return ((self._columns[index], self._rows[index]),
+                self._max_radii[index],
+                Bomb.EXPLOSION_THRESHOLD if detonated else
+                detonation - self._turn + Bomb.EXPLOSION_THRESHOLD - 1,
+                detonated,
+                self._turn - detonation if detonated else 0)
+
+    def remove(self, index: int) -> None:
+        """
+        remove a bomb from the field.
+
+        :param index: the index of a bomb within the field, the indices of
+                      the following bombs are decreased by one.
+        """
+        key = self._keys[index]
+        if key in self._detonated:
+            del self._detonated[key]
+            # the ripples of other bombs might share cells with its ripple.
+            self._shockwave_mask = None
+        else:
+            detonation = self._detonations[index]
+            self._wheel[detonation].remove(key)
+            if not self._wheel[detonation]:
+                del self._wheel[detonation]
+            self._bombs_mask ^= ring_mask(self._length, self._height,
+                                          (self._columns[index],
+                                           self._rows[index]), 0)
+
+        for column in (self._keys, self._columns, self._rows,
+                       self._max_radii, self._detonations):
+            del column[index]
+
+    def get_bombs_mask(self) -> int:
+        """
+        return the bitmask of the cells occupied by un-detonated bombs.
+        """
+        return self._bombs_mask
+
+    def get_shockwave_mask(self) -> int:
+        """
+        return the bitmask of the cells occupied by shock-wave ripples.
+        """
+        if self._shockwave_mask is None:
+            self._shockwave_mask = self._ripples()[0]
+        return self._shockwave_mask
+
+    def get_hazard_mask(self) -> int:
+        """
+        return the bitmask of all the cells occupied by the field.
+        """
+        return self._bombs_mask | self.get_shockwave_mask()
+
+    def step(self) -> List[int]:
+        """
+        advance all the bombs by a single turn (see "Bomb.move"), & update
+        the bitmasks of the field.
+
+        :return: the indices of the bombs whose shock-wave have faded, in
+                 increasing order.
+        """
+        self._turn += 1
+        for key in self._wheel.pop(self._turn, ()):
+            index = self._keys.index(key)
+            location = (self._columns[index], self._rows[index])
+            self._detonated[key] = (location, self._max_radii[index],
+                                    self._turn)
+            self._bombs_mask ^= ring_mask(self._length, self._height,
+                                          location, 0)
+
+        self._shockwave_mask, faded = self._ripples()
+        return sorted(self._keys.index(key) for key in faded)
+
+    def _ripples(self) -> Tuple[int, List[int]]:
+        """
+        combine the shock-wave ripples of the detonated bombs.
+
+        :return: the bitmask of the ripples & the keys of the bombs whose
+                 shock-wave have faded.
+        """
+        length, height, turn = self._length, self._height, self._turn
+        mask = 0
+        faded = []  # type: List[int]
+        for key, (location, max_radius, detonation) in \
+                self._detonated.items():
+            radius = turn - detonation
+            mask |= ring_mask(length, height, location, radius)
+            if radius > max_radius:
+                faded.append(key)
+        return mask, faded
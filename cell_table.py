@@ -0,0 +1,244 @@
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# a chunk holds the values of CHUNK_SIZE consecutive cells, a page holds
+# PAGE_SIZE consecutive chunks.
+CHUNK_BITS = 6
+PAGE_BITS = 6
+CHUNK_SIZE = 1 << CHUNK_BITS
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_CELLS = CHUNK_SIZE * PAGE_SIZE
+# the number of a cell shifted by PAGE_SHIFT is the number of its page, the
+# number of its chunk masked by PAGE_MASK is the index of the chunk within
+# the page.
+PAGE_SHIFT = CHUNK_BITS + PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+
+Chunk = Dict[Tuple[int, int], Any]
+Page = List[Optional[Chunk]]
+
+
+class CellTable:
+    """
+    a mapping between the cells of a board to values, which is copied on
+    write chunk by chunk.
+
+    the cells are ordered column by column (the cell (column, row) is the
+    cell number column * height + row), & split into chunks of CHUNK_SIZE
+    consecutive cells, which are grouped into pages of PAGE_SIZE chunks.
+    only pages & chunks holding values are allocated, so the table scales
+    with the amount of cells it holds rather than with the area of the
+    board.
+
+    a copy of the table (see "copy") shares all its pages & chunks with the
+    original table, & either of them copies a page or a chunk only once it
+    first alters it, so altering a single cell after a copy costs about the
+    size of a page, regardless of the size of the table.
+    """
+
+    def __init__(self, length: int, height: int) -> None:
+        """
+        create an empty table.
+
+        :param length: the length of the board.
+        :param height: the height of the board.
+        """
+        self._height = height
+        self._area = length * height
+        self._size = 0
+        # page number -> its chunks (None for empty chunks).
+        self._pages = {}  # type: Dict[int, Page]
+        # page number -> the amount of cells it holds.
+        self._page_counts = {}  # type: Dict[int, int]
+
+        # copy-on-write bookkeeping: whether the tables of the pages are
+        # shared with another table, & the pages & chunks copied since the
+        # table was last copied (None if it was never copied).
+        self._shared = False
+        self._private_pages = None  # type: Optional[Set[int]]
+        self._private_chunks = None  # type: Optional[Set[int]]
+
+    def copy(self) -> 'CellTable':
+        """
+        create a copy of the table, which shares all its pages & chunks with
+        this table until either of them is altered.
+        """
+        table = CellTable.__new__(CellTable)
+        table.__dict__.update(self.__dict__)
+        for clone in (self, table):
+            clone._shared = True
+            clone._private_pages = set()
+            clone._private_chunks = set()
+        return table
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_copied_chunks(self) -> Set[int]:
+        """
+        :return: the numbers of the chunks (i.e. the numbers of their cells
+                 shifted by CHUNK_BITS) which the table has copied or
+                 allocated since it was last copied (none if it was never
+                 copied).
+        """
+        return set(self._private_chunks or ())
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        return self.get(cell) is not None
+
+    def get(self, cell: Tuple[int, int], default: Any = None) -> Any:
+        """
+        :param cell: coordinates of a cell.
+        :param default: what to return if the table doesn't hold the cell.
+        :return: the value of the cell.
+        """
+        column, row = cell
+        if 0 <= row < self._height:
+            number = column * self._height + row
+            # the chunks are keyed by the cells themselves, so the cells of
+            # columns out of the board are never found.
+            page = self._pages.get(number >> PAGE_SHIFT)
+            if page is not None:
+                chunk = page[(number >> CHUNK_BITS) & PAGE_MASK]
+                if chunk is not None:
+                    return chunk.get(cell, default)
+        return default
+
+    def _own_chunk(self, number: int) -> Chunk:
+        """
+        make sure the chunk of a cell isn't shared before altering it,
+        allocating the chunk (& its page) if it's empty.
+
+        :param number: the number of the cell.
+        :return: the chunk.
+        """
+        page_number = number >> PAGE_SHIFT
+        chunk_number = number >> CHUNK_BITS
+        index = chunk_number & PAGE_MASK
+        page = self._pages.get(page_number)
+
+        if self._private_chunks is None:
+            # the table was never copied.
+            if page is None:
+                page = self._pages[page_number] = [None] * PAGE_SIZE
+            chunk = page[index]
+            if chunk is None:
+                chunk = page[index] = {}
+            return chunk
+
+        if self._shared:
+            self._shared = False
+            self._pages = dict(self._pages)
+            self._page_counts = dict(self._page_counts)
+        if page is None:
+            page = [None] * PAGE_SIZE
+            self._private_pages.add(page_number)
+        elif page_number not in self._private_pages:
+            page = list(page)
+            self._private_pages.add(page_number)
+        self._pages[page_number] = page
+
+        chunk = page[index]
+        if chunk is None:
+            chunk = page[index] = {}
+        elif chunk_number not in self._private_chunks:
+            chunk = page[index] = dict(chunk)
+        self._private_chunks.add(chunk_number)
+        return chunk
+
+    def set(self, cell: Tuple[int, int], value: Any) -> None:
+        """
+        set the value of a cell (which must be within the board).
+        """
+        column, row = cell
+        number = column * self._height + row
+        if not (0 <= row < self._height and 0 <= number < self._area):
+            raise ValueError(f"cell {cell} is out of the board")
+        chunk = self._own_chunk(number)
+        if cell not in chunk:
+            page_number = number >> PAGE_SHIFT
+            self._page_counts[page_number] = \
+                self._page_counts.get(page_number, 0) + 1
+            self._size += 1
+        chunk[cell] = value
+
+    def pop(self, cell: Tuple[int, int]) -> Any:
+        """
+        remove a cell (which the table must hold) from the table.
+
+        :return: the value the cell had.
+        """
+        column, row = cell
+        number = column * self._height + row
+        chunk = self._own_chunk(number)
+        value = chunk.pop(cell)
+        self._size -= 1
+
+        page_number = number >> PAGE_SHIFT
+        self._page_counts[page_number] -= 1
+        if self._page_counts[page_number] == 0:
+            del self._page_counts[page_number]
+            del self._pages[page_number]
+        elif not chunk:
+            self._pages[page_number][(number >> CHUNK_BITS) & PAGE_MASK] = \
+                None
+        return value
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Any]]:
+        """
+        iterate over the cells the table holds & their values.
+        """
+        for page in self._pages.values():
+            for chunk in page:
+                if chunk is not None:
+                    yield from chunk.items()
+
+    def to_dict(self) -> Dict[Tuple[int, int], Any]:
+        """
+        return the cells the table holds & their values.
+        """
+        return dict(self.items())
+
+    def missing_cell(self, rank: int) -> Tuple[int, int]:
+        """
+        find a cell of the board which the table doesn't hold, by its rank
+        among all such cells, column by column.
+
+        :param rank: the rank of the cell, smaller than the amount of cells
+                     which the table doesn't hold.
+        :return: the coordinates of the cell.
+        """
+        # skip whole pages, then whole chunks, then single cells.
+        start = 0
+        for page_number in sorted(self._page_counts):
+            page_start = page_number * PAGE_CELLS
+            if rank < page_start - start:
+                break
+            rank -= page_start - start
+            missing = min(PAGE_CELLS, self._area - page_start) - \
+                self._page_counts[page_number]
+            if rank < missing:
+                return self._missing_in_page(page_number, rank)
+            rank -= missing
+            start = page_start + PAGE_CELLS
+        return divmod(start + rank, self._height)
+
+    def _missing_in_page(self, page_number: int, rank: int) -> Tuple[int, int]:
+        """
+        find a cell which the table doesn't hold within a single page (see
+        "missing_cell").
+        """
+        page = self._pages[page_number]
+        chunk_start = page_number * PAGE_CELLS
+        for chunk in page:
+            cells = min(CHUNK_SIZE, self._area - chunk_start)
+            missing = cells - (len(chunk) if chunk is not None else 0)
+            if rank < missing:
+                for number in range(chunk_start, chunk_start + cells):
+                    cell = divmod(number, self._height)
+                    if chunk is None or cell not in chunk:
+                        if rank == 0:
+                            return cell
+                        rank -= 1
+            rank -= missing
+            chunk_start += CHUNK_SIZE
+        raise ValueError("the rank exceeds the amount of missing cells")
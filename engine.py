@@ -0,0 +1,106 @@
+from itertools import islice
+from typing import Callable, Iterable, NamedTuple, Optional, Union
+
+from game import Game
+from game_config import GameConfig
+from profiler import Profiler
+from snake import Direction
+
+# either the directions of the successive turns (None keeps the current
+# direction), or a callback which picks the direction of each turn given
+# the game.
+Directions = Union[Iterable[Optional[Direction]],
+                   Callable[[Game], Optional[Direction]]]
+
+
+class GameResult(NamedTuple):
+    """
+    the outcome of a headless game.
+    """
+    score: int
+    turns: int
+    # why the game have ended (see "Game.get_death_cause"), None if it was
+    # stopped while still playing.
+    death_cause: Optional[str]
+    length: int
+
+
+def setup_game(config: Optional[GameConfig] = None,
+               seed: Optional[int] = None) -> Game:
+    """
+    setup a new game: a snake at the middle of the board, a bomb & the
+    apples.
+
+    :param config: the configuration of the game (the default configuration
+                   if None).
+    :param seed: the seed of the random draws of the game (None for a seed
+                 drawn by the operating system).
+    """
+    game = Game(config, seed)
+    game.create_snake()
+    game.create_bomb()
+    for _ in range(game.get_config().apples):
+        game.create_apple()
+
+    return game
+
+
+def play(game: Game,
+         directions: Directions,
+         max_turns: Optional[int] = None) -> int:
+    """
+    execute turns of a game, back to back, until it ends, the directions
+    are exhausted or the maximal amount of turns is reached.
+
+    :param game: the game to play.
+    :param directions: the directions of the turns (see "Directions"). a
+                       callback is called once per turn, so without a
+                       maximal amount of turns the game is played until it
+                       ends.
+    :param max_turns: maximal amount of turns to execute (None for no limit).
+    :return: the amount of executed turns.
+    """
+    turns = 0
+    if callable(directions):
+        while game.is_playing() and (max_turns is None or turns < max_turns):
+            game.single_turn(directions(game))
+            turns += 1
+        return turns
+
+    for direction in islice(directions, max_turns):
+        if not game.is_playing():
+            break
+        game.single_turn(direction)
+        turns += 1
+    return turns
+
+
+def run(seed: int,
+        directions: Directions,
+        max_turns: Optional[int] = None,
+        config: Optional[GameConfig] = None,
+        profiler: Optional[Profiler] = None) -> GameResult:
+    """
+    play a whole game without displaying it: no drawing & no waiting between
+    the turns.
+
+    :param seed: the seed of the random draws of the game, a seed & the
+                 directions fully define a game.
+    :param directions: the directions of the turns (see "play").
+    :param max_turns: maximal amount of turns to execute (None for no limit).
+    :param config: the configuration of the game (the default configuration
+                   if None).
+    :param profiler: where to record the durations of the phases of the
+                     turns (None for no profiling, see "Game.set_profiler").
+    """
+    game = setup_game(config, seed)
+    # nobody draws the board.
+    game.get_board().set_change_tracking(False)
+    game.set_profiler(profiler)
+
+    turns = play(game, directions, max_turns)
+
+    return GameResult(game.get_score(),
+                      turns,
+                      game.get_death_cause(),
+                      game.get_snake().get_length())
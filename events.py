@@ -0,0 +1,63 @@
+from typing import Callable, NamedTuple, Tuple, Union
+
+# the events a game emits (see "Game.add_sink"). the snake id is always 0 in
+# a single snake game (see "Arena" for games of many snakes).
+
+
+class AppleEaten(NamedTuple):
+    """
+    a snake have eaten an apple.
+    """
+    cell: Tuple[int, int]
+    score: int
+    snake_id: int = 0
+
+
+class AppleExploded(NamedTuple):
+    """
+    an apple was destroyed by a shock-wave.
+    """
+    cell: Tuple[int, int]
+
+
+class BombDetonated(NamedTuple):
+    """
+    a bomb have exploded, i.e. its shock-wave started to spread.
+    """
+    cell: Tuple[int, int]
+    radius: int
+
+
+class BombFaded(NamedTuple):
+    """
+    the shock-wave of a bomb have faded.
+    """
+    cell: Tuple[int, int]
+
+
+class SnakeGrew(NamedTuple):
+    """
+    a snake have become longer.
+    """
+    length: int
+    snake_id: int = 0
+
+
+class SnakeDied(NamedTuple):
+    """
+    a snake have died.
+    """
+    # see "Game.get_death_cause".
+    cause: str
+    snake_id: int = 0
+
+
+class BoardFull(NamedTuple):
+    """
+    the game have ended since there is no room for a new apple.
+    """
+
+
+Event = Union[AppleEaten, AppleExploded, BombDetonated, BombFaded,
+              SnakeGrew, SnakeDied, BoardFull]
+EventSink = Callable[[Event], None]
@@ -1,12 +1,16 @@
-from typing import List, Optional
-from collections import Counter
-
-import game_parameters
+import copy
+from typing import Any, List, Optional, Tuple, Dict, cast
 
 from snake import Snake, Direction
 from apple import Apple
 from board import Board
+from printable_object import PrintableObject
 from bomb import Bomb
+from profiler import Profiler
+from events import AppleEaten, AppleExploded, BombDetonated, BombFaded, \
+    BoardFull, Event, EventSink, SnakeDied, SnakeGrew
+from game_config import GameConfig
+from random_stream import RandomStream
 
 
 class Game:
@@ -14,26 +18,194 @@ class Game:
     a class which is responsible for enforcing the rules of the game.
     """
 
-    AMOUNT_OF_APPLES = 3
-    COLOR_STRENGTHS = {
-        "green": 0,  # apple.
-        "black": 1,  # snake.
-        "red": 2,  # un-detonated bomb.
-        "orange": 3,  # detonated bomb.
-    }
+    # the reasons for the game to end.
+    WALL_CRASH = "wall"
+    SELF_CRASH = "self"
+    BOMB_CRASH = "bomb"
+    BOARD_FULL = "board full"
 
-    def __init__(self, length: int, height: int):
+    def __init__(self,
+                 config: Optional[GameConfig] = None,
+                 seed: Optional[int] = None) -> None:
         """
         create a new game.
 
-        :param length: the length of the board of the new game.
-        :param height: the height of the board of the new game.
+        :param config: the configuration of the new game (the default
+                       configuration if None).
+        :param seed: the seed of the random draws of the game (None for a
+                     seed drawn by the operating system).
         """
-        self._board = Board(length, height, Game.COLOR_STRENGTHS)
+        self._config = config or GameConfig()
+        # the board isn't compact, so its cost scales with the amount of
+        # occupied cells on any board size (see "CellTable").
+        self._board = Board.from_config(self._config)
+        self._snake = None  # type: Optional[Snake]
         self._playing = True
+        # why the game have ended (see "get_death_cause").
+        self._death_cause = None  # type: Optional[str]
         self._score = 0
+        self._random = RandomStream(seed,
+                                    self._config.apple_scores,
+                                    self._config.bomb_radii,
+                                    self._config.bomb_times)
         self._bombs = []  # type: List[Bomb]
         self._apples = []  # type: List[Apple]
+        # bombs are only moved on turns in which they change (see
+        # "_schedule_bomb").
+        # the amount of turns in which the bombs were "detonated".
+        self._turn = 0
+        # turn -> the bombs which should change in that turn, along with the
+        # turn the state of each bomb was last brought up to date.
+        self._bomb_wheel = {}  # type: Dict[int, List[Tuple[Bomb, int]]]
+        # the receivers of the events of the game (see "add_sink"). events
+        # are only created when there is someone to receive them.
+        self._sinks = []  # type: List[EventSink]
+        # records the durations of the phases of the turns (see
+        # "set_profiler"), None when profiling is off.
+        self._profiler = None  # type: Optional[Profiler]
+
+    @classmethod
+    def restore(cls,
+                config: GameConfig,
+                snake: Snake,
+                apples: List[Apple],
+                bombs: List[Bomb],
+                score: int,
+                playing: bool,
+                stream: Optional[RandomStream] = None) -> 'Game':
+        """
+        create a game in the middle of its course (e.g. when restoring a
+        saved game).
+
+        :param config: the configuration of the game.
+        :param snake: the snake of the game.
+        :param apples: the apples of the game.
+        :param bombs: the bombs of the game.
+        :param score: the player score.
+        :param playing: whether or not the game is still playing.
+        :param stream: the random draws of the game (see "get_random"), a
+                       new unseeded stream by default.
+        """
+        game = cls(config)
+        if stream is not None:
+            game._random = stream
+        game._snake = snake
+        game._board.add_element(snake, allow_overlap=True)
+        for apple in apples:
+            game._apples.append(apple)
+            game._board.add_element(apple, allow_overlap=True)
+        for bomb in bombs:
+            game._bombs.append(bomb)
+            game._board.add_element(bomb, allow_overlap=True)
+            game._schedule_bomb(bomb)
+        game._score = score
+        game._playing = playing
+        return game
+
+    def clone(self) -> 'Game':
+        """
+        create a snapshot of the game, which can be played independently of
+        this game (e.g. in order to evaluate a candidate move).
+
+        apples never change, so they are shared by both games. the board is
+        shared as well until either of the games alters it (see
+        "Board.clone"), only the snake & the bombs are copied right away.
+        """
+        game = copy.copy(self)
+        game._random = copy.copy(self._random)
+        game._sinks = []
+        game._profiler = None
+        replacements = {}  # type: Dict[int, PrintableObject]
+        self._clone_snakes(game, replacements)
+
+        game._bombs = []
+        for bomb in self._bombs:
+            bomb_clone = bomb.clone()
+            replacements[id(bomb)] = bomb_clone
+            game._bombs.append(bomb_clone)
+        game._bomb_wheel = {
+            turn: [(cast(Bomb, replacements[id(bomb)]), synced)
+                   for bomb, synced in bombs]
+            for turn, bombs in self._bomb_wheel.items()
+        }
+
+        game._apples = list(self._apples)
+        game._board = self._board.clone(replacements)
+        return game
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        the state of a pickled game, without its event sinks & profiler.
+        """
+        state = dict(self.__dict__)
+        state["_sinks"] = []
+        state["_profiler"] = None
+        return state
+
+    def add_sink(self, sink: EventSink) -> None:
+        """
+        register a receiver of the events of the game (see "events"), which
+        is called with each event as soon as it occurs.
+        snapshots of the game (see "clone") have no sinks.
+
+        :param sink: the receiver.
+        """
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: EventSink) -> None:
+        """
+        unregister a receiver of the events of the game.
+
+        :param sink: a previously registered receiver.
+        """
+        self._sinks.remove(sink)
+
+    def set_profiler(self, profiler: Optional[Profiler]) -> None:
+        """
+        switch the profiling of the turns on or off. the phases of a turn
+        are recorded as "direction", "move", "collide", "eat" & "bombs"
+        (see "single_turn"), the whole turn as "turn". replacing apples &
+        bombs is recorded as "replace" as well, within "eat" & "bombs".
+        snapshots of the game (see "clone") aren't profiled.
+
+        :param profiler: where to record the durations of the phases, None
+                         to switch the profiling off.
+        """
+        self._profiler = profiler
+
+    def get_profiler(self) -> Optional[Profiler]:
+        """
+        return where the durations of the phases are recorded, None when
+        profiling is off.
+        """
+        return self._profiler
+
+    def _emit(self, event: Event) -> None:
+        """
+        pass an event to all the sinks.
+        """
+        for sink in self._sinks:
+            sink(event)
+
+    def _clone_snakes(self,
+                      game: 'Game',
+                      replacements: Dict[int, PrintableObject]) -> None:
+        """
+        copy the snakes of the game into a snapshot of it (see "clone").
+
+        :param game: the snapshot.
+        :param replacements: mapping between ids of the original snakes to
+                             their copies, to fill.
+        """
+        if self._snake is not None:
+            game._snake = self._snake.clone()
+            replacements[id(self._snake)] = game._snake
+
+    def _snakes_length(self) -> int:
+        """
+        return the amount of cells occupied by the snakes of the game.
+        """
+        return cast(Snake, self._snake).get_length()
 
     def get_score(self) -> int:
         """
@@ -44,40 +216,59 @@ class Game:
     def create_snake(self) -> None:
         """
         create a new snake object.
+        the game ends right away if the snake doesn't fit into the board
+        (i.e. on boards lower than 4 cells), as it's born into a wall.
         """
         x = self._board.get_length() // 2
         y = self._board.get_height() // 2
         self._snake = Snake((x, y))
-        self._board.add_element(self._snake)
+        if not self._board.add_element(self._snake):
+            self._end(Game.WALL_CRASH)
 
     def create_apple(self) -> None:
         """
         create a new apple object.
         """
-        if self._board.is_full():
-            self._playing = False
+        cell = self._board.random_empty_cell(self._random)
+        if cell is None:
+            # the board is full.
+            self._end(Game.BOARD_FULL)
             return
 
-        added = False
-        while not added:
-            x, y, score = game_parameters.get_random_apple_data()
-            apple = Apple((x, y), score)
-            added = self._board.add_element(apple)
-
+        apple = Apple(cell, self._random.apple_score())
+        self._board.add_element(apple)
         self._apples.append(apple)
 
     def create_bomb(self) -> None:
         """
         create a new bomb object.
+        no bomb is created if the board is full.
         """
-        added = False
-        while not added:
-            x, y, radius, time_to_explode = \
-                game_parameters.get_random_bomb_data()
-            bomb = Bomb((x, y), radius, time_to_explode)
-            added = self._board.add_element(bomb)
+        cell = self._board.random_empty_cell(self._random)
+        if cell is None:
+            return
 
+        radius, time_to_explode = self._random.bomb_timing()
+        bomb = Bomb(cell, radius, time_to_explode)
+        self._board.add_element(bomb)
         self._bombs.append(bomb)
+        self._schedule_bomb(bomb)
+
+    def _schedule_bomb(self, bomb: Bomb) -> None:
+        """
+        schedule the next turn in which the given (up to date) bomb changes.
+        """
+        turn = self._turn + bomb.turns_until_change()
+        self._bomb_wheel.setdefault(turn, []).append((bomb, self._turn))
+
+    def _sync_bombs(self) -> None:
+        """
+        bring the state of all the bombs up to date.
+        """
+        for bombs in self._bomb_wheel.values():
+            for index, (bomb, synced) in enumerate(bombs):
+                bomb.advance(self._turn - synced)
+                bombs[index] = (bomb, self._turn)
 
     def single_turn(self, direction: Optional[Direction]) -> None:
         """
@@ -93,72 +284,179 @@ class Game:
            shock-wave ripples).
         7) replacing exploded apples & faded-out bombs.
 
+        collisions are only looked for within the cells which have changed,
+        i.e. the cell the snake's head have entered & the cells the
+        shock-wave ripples have entered.
+
         :param direction: in which direction the snake should move.
         """
+        start = lap = self._profiler.clock() \
+            if self._profiler is not None else 0
+
         if direction is not None:
             self._snake.change_direction(direction)
-        self._snake.move()
-
-        if self._did_snake_died():
-            self._playing = False
+        if self._profiler is not None:
+            lap = self._lap("direction", lap)
+
+        head = self._move_snake()
+        if self._profiler is not None:
+            lap = self._lap("move", lap)
+
+        death_cause, eaten_apples = self._collide(head)
+        if self._profiler is not None:
+            lap = self._lap("collide", lap)
+        if death_cause is not None:
+            self._end(death_cause)
+            if self._profiler is not None:
+                self._lap("turn", start)
             return
 
-        self._snake_ate_apple()
+        self._snake_ate_apple(eaten_apples)
+        if self._profiler is not None:
+            lap = self._lap("eat", lap)
+        if not self._playing:
+            # the board is full.
+            if self._profiler is not None:
+                self._lap("turn", start)
+            return
 
         self._detonate_bombs()
+        if self._profiler is not None:
+            self._lap("bombs", lap)
+            self._lap("turn", start)
+
+    def _lap(self, phase: str, start: int) -> int:
+        """
+        record the duration of a phase, by the profiler of the game.
+
+        :param phase: the name of the phase.
+        :param start: when the phase have started (see "Profiler.clock").
+        :return: when the phase have ended.
+        """
+        profiler = cast(Profiler, self._profiler)
+        end = profiler.clock()
+        profiler.record(phase, end - start)
+        return end
+
+    def _move_snake(self) -> List[Tuple[int, int]]:
+        """
+        move the snake & let the board know which cells have changed.
+
+        :return: the cells entered by the snake, i.e. its new head (which
+                 might be out of the bounds of the board).
+        """
+        self._snake.move()
+        head = self._snake.get_head()
+        vacated = self._snake.get_vacated_cell()
+        self._board.move_element(self._snake,
+                                 [head],
+                                 [vacated] if vacated is not None else [])
+        if vacated is None and self._sinks:
+            self._emit(SnakeGrew(self._snake.get_length()))
+        return [head]
+
+    def _end(self, cause: str) -> None:
+        """
+        end the game.
 
-    def _did_snake_died(self) -> bool:
+        :param cause: why the game have ended.
         """
-        check if the snake have died.
+        if not self._playing:
+            # the game have already ended (e.g. the snake was born into a
+            # wall, & then no apple could be created).
+            return
+        self._playing = False
+        self._death_cause = cause
+        if self._sinks:
+            if cause == Game.BOARD_FULL:
+                self._emit(BoardFull())
+            else:
+                self._emit(SnakeDied(cause))
+
+    def _collide(
+            self,
+            cells: List[Tuple[int, int]]) -> Tuple[Optional[str], List[Apple]]:
+        """
+        settle all the collisions within the given (changed) cells.
 
         there are numerous reasons for the snake to die:
         1) the snake have crash into himself.
         2) the snake have crash into a wall.
         3) the snake have exploded by a bomb.
+        an apple sharing a cell with either the snake or a bomb is hit, i.e.
+        eaten or exploded.
 
-        :return: whether or not the snake have died.
+        :param cells: the cells which have changed.
+        :return: the cause of the snake death (None if it's still alive) &
+                 the apples that have been hit.
         """
-        # check if snake crash into himself.
-        counter = Counter(self._snake.get_coordinates())
-        _, occurences = counter.most_common(1)[0]
-
-        if occurences > 1:
-            return True
+        hit_apples = []  # type: List[Apple]
 
-        # check if snake crash into a wall.
-        for cell in self._snake.get_coordinates():
+        for cell in cells:
             if not self._board.is_cell_in_board(cell):
-                return True
-
-        # check if snake went kaboom.
-        snake_cells = set(self._snake.get_coordinates())
-        for bomb in self._bombs:
-            bomb_cells = set(bomb.get_coordinates())
-            if snake_cells.intersection(bomb_cells):
-                return True
-
-        return False
-
-    def _snake_ate_apple(self) -> None:
+                # only the snake can leave the board, i.e. crash into a wall.
+                return Game.WALL_CRASH, hit_apples
+
+            snake_found = bomb_found = False
+            apples = []  # type: List[Apple]
+            for element in self._board.get_elements_at(cell):
+                if element is self._snake:
+                    snake_found = True
+                    # check if snake crash into himself.
+                    if self._snake.get_occupancy(cell) > 1:
+                        return Game.SELF_CRASH, hit_apples
+                elif isinstance(element, Bomb):
+                    bomb_found = True
+                elif isinstance(element, Apple):
+                    apples.append(element)
+
+            # check if snake went kaboom.
+            if snake_found and bomb_found:
+                return Game.BOMB_CRASH, hit_apples
+
+            if snake_found or bomb_found:
+                hit_apples.extend(apples)
+
+        return None, hit_apples
+
+    def _shockwaves_hits(
+            self,
+            bombs: List[Bomb]) -> Tuple[Optional[str], List[Apple]]:
         """
-        check if the snake ate an apple & act accordingly.
+        check if the given bombs hit the snake or any apple, without
+        evaluating the cells of their shock-wave ripples.
+
+        :param bombs: bombs which have just moved.
+        :return: the cause of the snake death (None if it's still alive) &
+                 the apples that have been exploded.
         """
-        found_apple = None
+        for cell in cast(Snake, self._snake).get_coordinates():
+            for bomb in bombs:
+                if bomb.hits(cell):
+                    return Game.BOMB_CRASH, []
 
-        head = set([self._snake.get_head()])
+        exploded_apples = []  # type: List[Apple]
         for apple in self._apples:
-            apple_cells = set(apple.get_coordinates())
-            if head.intersection(apple_cells):
-                found_apple = apple
-                break
+            for bomb in bombs:
+                if bomb.hits(apple.coordinate):
+                    exploded_apples.append(apple)
+                    break
 
-        if found_apple:
+        return None, exploded_apples
+
+    def _snake_ate_apple(self, eaten_apples: List[Apple]) -> None:
+        """
+        act accordingly to the apples the snake have eaten.
+        """
+        for apple in eaten_apples:
             # increment the player score.
-            self._score += found_apple.get_score()
+            self._score += apple.get_score()
+            if self._sinks:
+                self._emit(AppleEaten(apple.coordinate, apple.get_score()))
             # increment the snake's length.
-            self._snake.eat_apple()
-            # create a new apple instead of the eaten one.
-            self._replace_apples([found_apple])
+            self._snake.eat_apple(self._config.apple_growth)
+        # create new apples instead of the eaten ones.
+        self._replace_apples(eaten_apples)
 
     def _replace_apples(self, apples_to_replace: List[Apple]) -> None:
         """
@@ -168,10 +466,25 @@ class Game:
         :param apples_to_replace: list of eaten apples to replace with
                                   new bombs.
         """
+        if not apples_to_replace:
+            return
+
+        start = self._profiler.clock() if self._profiler is not None else 0
+        removed = set(id(apple) for apple in apples_to_replace)
+        # the apples are replaced in the order they were created, regardless
+        # of the order they were hit in.
+        apples_to_replace = [apple for apple in self._apples
+                             if id(apple) in removed]
+        self._apples = [apple for apple in self._apples
+                        if id(apple) not in removed]
         for apple in apples_to_replace:
-            self._apples.remove(apple)
             self._board.remove_element(apple)
             self.create_apple()
+            if not self._playing:
+                # the board is full.
+                break
+        if self._profiler is not None:
+            self._profiler.record("replace", self._profiler.clock() - start)
 
     def _replace_bombs(self, bombs_to_replace: List[Bomb]) -> None:
         """
@@ -181,47 +494,98 @@ class Game:
         :param bombs_to_remove: list of exploded bombs (which already faded
                                 away) to replace with new bombs.
         """
+        if not bombs_to_replace:
+            return
+
+        start = self._profiler.clock() if self._profiler is not None else 0
+        removed = set(id(bomb) for bomb in bombs_to_replace)
+        # the bombs are replaced in the order they were created, regardless
+        # of the order they faded in.
+        bombs_to_replace = [bomb for bomb in self._bombs
+                            if id(bomb) in removed]
+        self._bombs = [bomb for bomb in self._bombs
+                       if id(bomb) not in removed]
         for bomb in bombs_to_replace:
-            self._bombs.remove(bomb)
             self._board.remove_element(bomb)
             self.create_bomb()
+        if self._profiler is not None:
+            self._profiler.record("replace", self._profiler.clock() - start)
 
     def _detonate_bombs(self) -> None:
         """
         "detonate" each & every bomb.
+        only the bombs which change in this turn are actually moved, the
+        others keep counting-down silently.
         """
         bombs_to_remove = []  # type: List[Bomb]
-        apples_to_remove = []  # type: List[Apple]
-
-        for bomb in self._bombs:
-            bomb.move()
-            apples_to_remove = self._find_exploded_apples(bomb)
+        moved_bombs = []  # type: List[Bomb]
+        changed_cells = []  # type: List[Tuple[int, int]]
+
+        self._turn += 1
+        for bomb, synced in self._bomb_wheel.pop(self._turn, []):
+            cells = bomb.get_coordinates()
+            color = bomb.get_color()
+            bomb.advance(self._turn - synced)
+            if bomb.get_coordinates() is not cells or \
+                    bomb.get_color() != color:
+                moved_bombs.append(bomb)
+                if self._sinks and bomb.get_color() != color:
+                    self._emit(BombDetonated(bomb.get_location(),
+                                             bomb.get_max_radius()))
+                changed_cells.extend(self._board.move_element(
+                    bomb, bomb.get_coordinates(), cells))
             if bomb.attack_is_over():
                 bombs_to_remove.append(bomb)
-
-        if self._did_snake_died():
-            self._playing = False
+                if self._sinks:
+                    self._emit(BombFaded(bomb.get_location()))
+            else:
+                self._schedule_bomb(bomb)
+
+        # either look for collisions within the cells the shock-waves have
+        # entered, or test the snake & the apples against the moved bombs,
+        # whichever is cheaper.
+        tests = (self._snakes_length() + len(self._apples)) * len(moved_bombs)
+        if tests < len(changed_cells):
+            death_cause, exploded_apples = self._shockwaves_hits(moved_bombs)
+        else:
+            death_cause, exploded_apples = self._collide(changed_cells)
+        if death_cause is not None:
+            self._end(death_cause)
             return
 
         self._replace_bombs(bombs_to_remove)
 
-        self._replace_apples(apples_to_remove)
+        # an apple might be hit by several shock-waves.
+        unique_apples = {id(apple): apple for apple in exploded_apples}
+        if self._sinks:
+            for apple in unique_apples.values():
+                self._emit(AppleExploded(apple.coordinate))
+        self._replace_apples(list(unique_apples.values()))
 
-    def _find_exploded_apples(self, bomb: Bomb) -> List[Apple]:
+    def get_snake(self) -> Snake:
         """
-        find all apples which have exploded by a specific bomb.
+        return the game's snake.
+        """
+        return cast(Snake, self._snake)
 
-        :param bomb: a bomb.
-        :return: list of all apples exploded by the given bomb.
+    def get_apples(self) -> List[Apple]:
+        """
+        return the game's apples.
         """
-        apples_to_remove = []  # type: List[Apple]
+        return list(self._apples)
 
-        for apple in self._apples:
-            apple_cells = set(apple.get_coordinates())
-            if apple_cells.intersection(set(bomb.get_coordinates())):
-                apples_to_remove.append(apple)
+    def get_bombs(self) -> List[Bomb]:
+        """
+        return the game's bombs.
+        """
+        self._sync_bombs()
+        return list(self._bombs)
 
-        return apples_to_remove
+    def get_config(self) -> GameConfig:
+        """
+        return the game's configuration.
+        """
+        return self._config
 
     def get_board(self) -> Board:
         """
@@ -229,8 +593,23 @@ class Game:
         """
         return self._board
 
+    def get_random(self) -> RandomStream:
+        """
+        return the stream of the random draws of the game.
+        """
+        return self._random
+
     def is_playing(self) -> bool:
         """
         check if the game is still playing.
         """
         return self._playing
+
+    def get_death_cause(self) -> Optional[str]:
+        """
+        return why the game have ended: the snake crashed into a wall
+        ("WALL_CRASH"), into himself ("SELF_CRASH") or into a bomb
+        ("BOMB_CRASH"), or there is no room for a new apple ("BOARD_FULL").
+        None if the game is still playing.
+        """
+        return self._death_cause
@@ -0,0 +1,48 @@
+from typing import Dict, NamedTuple, Tuple
+
+import game_parameters
+
+from snake import Snake
+
+
+class GameConfig(NamedTuple):
+    """
+    the parameters of a game: the size of its board, the ranges its spawn
+    parameters are drawn from & its rules.
+
+    each object of a game (the game itself, its board & its display) is
+    given the configuration of the game, so games of different
+    configurations coexist in a single process. configurations are
+    immutable & hashable, thus tables which depend only on a configuration
+    are evaluated once & shared by all the games of that configuration.
+    """
+    length: int = game_parameters.WIDTH
+    height: int = game_parameters.HEIGHT
+    # the (inclusive) ranges the spawn parameters are drawn from.
+    apple_scores: Tuple[int, int] = game_parameters.APPLE_SCORE_RANGE
+    bomb_radii: Tuple[int, int] = game_parameters.BOMB_RADIUS_RANGE
+    bomb_times: Tuple[int, int] = game_parameters.BOMB_TIME_RANGE
+    # the amount of apples on the board.
+    apples: int = 3
+    # by how many cells the snake grows per eaten apple.
+    apple_growth: int = Snake.APPLE_WAS_EATEN_GROWTH
+    # color -> displaying precedence (see "Board"), as pairs so the
+    # configuration is hashable.
+    color_strengths: Tuple[Tuple[str, int], ...] = (
+        ("green", 0),  # apple.
+        ("black", 1),  # snake.
+        ("red", 2),  # un-detonated bomb.
+        ("orange", 3),  # detonated bomb.
+    )
+
+    def get_area(self) -> int:
+        """
+        return the amount of cells of the board.
+        """
+        return self.length * self.height
+
+    def get_color_strengths(self) -> Dict[str, int]:
+        """
+        return a mapping between colors to their displaying precedences.
+        """
+        return dict(self.color_strengths)
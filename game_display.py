@@ -3,17 +3,23 @@ import time
 import tkinter as tki
 from typing import Any, Optional, List, Tuple, Dict
 
-import game_parameters
+from game_config import GameConfig
+from profiler import Profiler
 
 CELL_SIZE = 15
 ROUND_TIME = 0.1
 
 
 class GameDisplay:
-    def __init__(self) -> None:
-        """Creates a new game display object and initializes it"""
+    def __init__(self, config: Optional[GameConfig] = None) -> None:
+        """
+        Creates a new game display object and initializes it
+        :param config: the configuration of the displayed game (the default
+                       configuration if None)
+        """
         # placed this import in here to solve circular import issues.
         import snake_main
+        self._config = config or GameConfig()
         self._round_num = 0
         self._root = tki.Tk()
         self._root.title('Snake')
@@ -24,11 +30,11 @@ class GameDisplay:
         self._init_score_frame()
 
         self._canvas = tki.Canvas(
-            self._root, bg="white", width=game_parameters.WIDTH * CELL_SIZE,
-            height=game_parameters.HEIGHT * CELL_SIZE)
+            self._root, bg="white", width=self._config.length * CELL_SIZE,
+            height=self._config.height * CELL_SIZE)
         self._canvas.pack()
-        self._to_draw: List[Tuple[int, int, str]] = list()
-        self._already_drawn: Dict[Tuple[int, int, str], int] = dict()
+        self._to_draw: List[Tuple[int, int, Optional[str]]] = list()
+        self._already_drawn: Dict[Tuple[int, int], int] = dict()
 
         self._root.resizable(False, False)
         self.key_click: Optional[str] = None
@@ -38,6 +44,7 @@ class GameDisplay:
             target=snake_main.main_loop, args=(self,))
         self._game_control_thread.daemon = True
         self._round_start_time = time.time()
+        self._profiler: Optional[Profiler] = None
 
     def _init_score_frame(self) -> None:
         """
@@ -88,6 +95,23 @@ class GameDisplay:
             self.key_click = e.keysym
             self._key_click_round = self._round_num
 
+    def get_config(self) -> GameConfig:
+        """
+        This method returns the configuration of the displayed game
+        :return: the configuration
+        """
+        return self._config
+
+    def set_profiler(self, profiler: Optional[Profiler]) -> None:
+        """
+        Switches the profiling of the rounds on or off, the drawing at the
+        end of a round is recorded as "render" & the waiting as "sleep"
+        :param profiler: where to record the durations, None to switch the
+                         profiling off
+        :return: None
+        """
+        self._profiler = profiler
+
     def get_key_clicked(self) -> Optional[str]:
         """
         This method returns which key is clicked
@@ -100,7 +124,9 @@ class GameDisplay:
 
     def draw_cell(self, x: int, y: int, color: str) -> None:
         """
-        Sets the cell at the given coordinates to draw in given color
+        Sets the cell at the given coordinates to draw in given color.
+        The cell keeps its color in the following rounds, until it is drawn
+        again or cleared.
         :param x: coordinate at x
         :param y: coordinate at y
         :param color: the color we wish to draw
@@ -108,6 +134,15 @@ class GameDisplay:
         """
         self._to_draw.append((x, y, color))
 
+    def clear_cell(self, x: int, y: int) -> None:
+        """
+        Sets the cell at the given coordinates to be erased
+        :param x: coordinate at x
+        :param y: coordinate at y
+        :return: None
+        """
+        self._to_draw.append((x, y, None))
+
     def _buffer_draw_cell(self, x: int, y: int, color: str) -> int:
         """
         Internal: internal method to draw the x,y cell in color
@@ -116,15 +151,15 @@ class GameDisplay:
         :param color: the color we wish to draw
         :return: None
         """
-        if x < 0 or x >= game_parameters.WIDTH or \
-                y < 0 or y >= game_parameters.HEIGHT:
+        if x < 0 or x >= self._config.length or \
+                y < 0 or y >= self._config.height:
             raise ValueError(
                 "cell index out of bounds of the board: " + str((x, y)))
 
         # setting the coordinates of the board correctly,
         # the y axis needs to point up.
         # the following line adjusts this.
-        y = game_parameters.HEIGHT - y
+        y = self._config.height - y
         return self._canvas.create_rectangle(
             x * CELL_SIZE, (y - 1) * CELL_SIZE, (x + 1) * CELL_SIZE,
             y * CELL_SIZE,
@@ -132,22 +167,18 @@ class GameDisplay:
 
     def _update_drawing(self) -> None:
         """
-        Internal: method to update drawing
+        Internal: method to update drawing, only the cells drawn or cleared
+        during this round are touched
         :return: None
         """
-        to_draw = set(self._to_draw)
-        for rect in self._already_drawn:
-            if rect not in to_draw:
-                self._canvas.delete(self._already_drawn[rect])
-
-        cur_drawn: Dict[Tuple[int, int, str], int] = dict()
         for x, y, color in self._to_draw:
-            ind = self._already_drawn.get((x, y, color), None)
-            if ind is None:
-                ind = self._buffer_draw_cell(x, y, color)
-            cur_drawn[(x, y, color)] = ind
+            ind = self._already_drawn.pop((x, y), None)
+            if ind is not None:
+                self._canvas.delete(ind)
+            if color is not None:
+                self._already_drawn[(x, y)] = \
+                    self._buffer_draw_cell(x, y, color)
 
-        self._already_drawn = cur_drawn
         self._to_draw = list()
 
     def end_round(self) -> None:
@@ -155,7 +186,12 @@ class GameDisplay:
         This method ends the current round.
         :return:None
         """
+        profiler = self._profiler
+        start = profiler.clock() if profiler is not None else 0
         self._update_drawing()
+        if profiler is not None:
+            rendered = profiler.clock()
+            profiler.record("render", rendered - start)
 
         self._round_start_time += ROUND_TIME
         now = time.time()
@@ -163,6 +199,8 @@ class GameDisplay:
             time.sleep(self._round_start_time - now)
             now = time.time()
         self._round_num += 1
+        if profiler is not None:
+            profiler.record("sleep", profiler.clock() - rendered)
 
     def show_score(self, val: Any) -> None:
         """
@@ -1,8 +1,33 @@
 import random
-from typing import Tuple, Any
+from typing import Optional, Tuple
+
+# a module rather than a class import, as the stream itself reads the ranges
+# below.
+import random_stream
 
 WIDTH = 40
 HEIGHT = 30
+# the (inclusive) ranges the spawn parameters are drawn from.
+APPLE_SCORE_RANGE = (1, 5)
+BOMB_RADIUS_RANGE = (2, 5)
+BOMB_TIME_RANGE = (20, 30)
+
+# the stream of the draws below, created on the first draw (see "_stream").
+_STREAM = None  # type: Optional[random_stream.RandomStream]
+
+
+def _stream() -> 'random_stream.RandomStream':
+    """
+    return the stream of the draws of this module, seeded by the global
+    random state once it's first needed.
+    the games draw their spawn parameters from streams of their own (see
+    "RandomStream"), this one is kept for the callers of the functions
+    below.
+    """
+    global _STREAM
+    if _STREAM is None:
+        _STREAM = random_stream.RandomStream(random.getrandbits(64))
+    return _STREAM
 
 
 def get_random_apple_data() -> Tuple[int, int, int]:
@@ -10,21 +35,39 @@ def get_random_apple_data() -> Tuple[int, int, int]:
     This method returns randomly drawn data for the apple
     :return: (x,y,score) - Random location on the board and initial score
     """
-    x = random.randint(0, WIDTH - 1)
-    y = random.randint(0, HEIGHT - 1)
-    score = random.randint(1, 5)
+    stream = _stream()
+    x = stream.randrange(WIDTH)
+    y = stream.randrange(HEIGHT)
+    score = get_random_apple_score()
 
     return x, y, score
 
 
+def get_random_apple_score() -> int:
+    """
+    This method returns a randomly drawn score for the apple
+    :return: score - initial score
+    """
+    return _stream().apple_score()
+
+
 def get_random_bomb_data() -> Tuple[int, int, int, int]:
     """
     This method returns randomly drawn data for the bomb
     :return: (x,y,radius,time) Random location, bomb radius and time to explode
     """
-    x = random.randint(0, WIDTH - 1)
-    y = random.randint(0, HEIGHT - 1)
-    radius = random.randint(2, 5)
-    time = random.randint(20, 30)
+    stream = _stream()
+    x = stream.randrange(WIDTH)
+    y = stream.randrange(HEIGHT)
+    radius, time = get_random_bomb_timing()
+
+    return x, y, radius, time
 
-    return x, y, radius, time
\ No newline at end of file
+
+def get_random_bomb_timing() -> Tuple[int, int]:
+    """
+    This method returns randomly drawn data for the bomb, regardless of its
+    location
+    :return: (radius,time) Random bomb radius and time to explode
+    """
+    return _stream().bomb_timing()
@@ -0,0 +1,181 @@
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+# the durations are histogrammed logarithmically: bucket i counts the
+# durations (in nanoseconds) of i bits, i.e. within [2 ** (i - 1), 2 ** i),
+# the last bucket counts all the longer durations as well.
+BUCKETS = 40
+
+
+class PhaseStats:
+    """
+    the durations of all the calls of a single phase.
+    """
+
+    def __init__(self) -> None:
+        self._calls = 0
+        self._total = 0
+        self._min = None  # type: Optional[int]
+        self._max = 0
+        self._histogram = [0] * BUCKETS
+
+    def add(self, duration: int) -> None:
+        """
+        account for a single call.
+
+        :param duration: the duration of the call, in nanoseconds.
+        """
+        self._calls += 1
+        self._total += duration
+        if self._min is None or duration < self._min:
+            self._min = duration
+        if duration > self._max:
+            self._max = duration
+        self._histogram[min(duration.bit_length(), BUCKETS - 1)] += 1
+
+    def get_calls(self) -> int:
+        """
+        return the amount of calls.
+        """
+        return self._calls
+
+    def get_total(self) -> int:
+        """
+        return the total duration of the calls, in nanoseconds.
+        """
+        return self._total
+
+    def get_mean(self) -> float:
+        """
+        return the mean duration of a call, in nanoseconds.
+        """
+        return self._total / self._calls if self._calls else 0.0
+
+    def get_max(self) -> int:
+        """
+        return the longest duration of a call, in nanoseconds.
+        """
+        return self._max
+
+    def get_histogram(self) -> List[int]:
+        """
+        return the amount of calls within each bucket (see "BUCKETS").
+        """
+        return list(self._histogram)
+
+    def percentile(self, fraction: float) -> int:
+        """
+        estimate a percentile of the durations, by the upper bound of the
+        bucket it falls into (bounded by the longest duration).
+
+        :param fraction: the percentile, between 0 & 1.
+        :return: the duration, in nanoseconds.
+        """
+        rank = fraction * self._calls
+        seen = 0
+        for bucket, count in enumerate(self._histogram):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << bucket) - 1, self._max)
+        return self._max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        return the statistics as plain values (all durations are in
+        nanoseconds).
+        """
+        return {
+            "calls": self._calls,
+            "total": self._total,
+            "mean": self.get_mean(),
+            "min": self._min or 0,
+            "max": self._max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "histogram": self.get_histogram(),
+        }
+
+
+class Profiler:
+    """
+    records the wall time of the phases of a run (e.g. the phases of a turn,
+    see "Game.set_profiler"), into a histogram per phase.
+
+    profiling is switched on by handing a profiler to the profiled objects,
+    which otherwise only pay for checking that they have none.
+    """
+
+    def __init__(self, labels: Optional[Dict[str, Any]] = None) -> None:
+        """
+        create a new profiler, with no recorded phases.
+
+        :param labels: describe the profiled run (e.g. the size of the
+                       board), exported along with the statistics.
+        """
+        self._labels = dict(labels or {})
+        # phase -> its statistics, in the order the phases were first
+        # recorded.
+        self._phases = {}  # type: Dict[str, PhaseStats]
+
+    @staticmethod
+    def clock() -> int:
+        """
+        return the current time of the clock the phases are measured with,
+        in nanoseconds.
+        """
+        return time.perf_counter_ns()
+
+    def record(self, phase: str, duration: int) -> None:
+        """
+        account for a single call of a phase.
+
+        :param phase: the name of the phase.
+        :param duration: the duration of the call, in nanoseconds.
+        """
+        stats = self._phases.get(phase)
+        if stats is None:
+            stats = self._phases[phase] = PhaseStats()
+        stats.add(duration)
+
+    def get_phases(self) -> Dict[str, PhaseStats]:
+        """
+        return the statistics of the recorded phases, by their names.
+        """
+        return dict(self._phases)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        return the labels & the statistics of all the phases as plain values.
+        """
+        return {
+            "labels": self._labels,
+            "phases": {phase: stats.to_dict()
+                       for phase, stats in self._phases.items()},
+        }
+
+    def export(self, path: str) -> None:
+        """
+        write the labels & the statistics of all the phases into a json
+        file.
+
+        :param path: the path of the file.
+        """
+        with open(path, "w") as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=2)
+
+    def report(self) -> str:
+        """
+        return a human readable table of the phases (durations are in
+        microseconds).
+        """
+        lines = [f"{'phase':<12}{'calls':>10}{'total':>14}{'mean':>10}"
+                 f"{'p50':>10}{'p99':>10}{'max':>10}"]
+        for phase, stats in self._phases.items():
+            lines.append(f"{phase:<12}{stats.get_calls():>10}"
+                         f"{stats.get_total() / 1000:>14.1f}"
+                         f"{stats.get_mean() / 1000:>10.2f}"
+                         f"{stats.percentile(0.5) / 1000:>10.2f}"
+                         f"{stats.percentile(0.99) / 1000:>10.2f}"
+                         f"{stats.get_max() / 1000:>10.2f}")
+        return "\n".join(lines)
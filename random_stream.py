@@ -0,0 +1,103 @@
+import random
+from typing import Any, List, Optional, Tuple
+
+import game_parameters
+
+
+class RandomStream(random.Random):
+    """
+    the stream of random draws of a single game, so games never disturb
+    each other & a seed fully defines a game.
+
+    the spawn parameters (apple scores & bomb timings) are drawn ahead in
+    blocks, so each spawn merely pops pre-generated values. the blocks are
+    drawn from the stream whenever they run out, thus the sequence of draws
+    is deterministic as well.
+    """
+    BLOCK_SIZE = 256
+
+    def __init__(self,
+                 seed: Optional[int] = None,
+                 apple_scores: Optional[Tuple[int, int]] = None,
+                 bomb_radii: Optional[Tuple[int, int]] = None,
+                 bomb_times: Optional[Tuple[int, int]] = None) -> None:
+        """
+        create a new stream.
+
+        :param seed: the seed of the stream (None for a seed drawn by the
+                     operating system).
+        :param apple_scores: the (inclusive) range of the apple scores, the
+                             one of "game_parameters" by default.
+        :param bomb_radii: the (inclusive) range of the bomb radii, the one
+                           of "game_parameters" by default.
+        :param bomb_times: the (inclusive) range of the bomb times to
+                           explode, the one of "game_parameters" by default.
+        """
+        self._ranges = (apple_scores or game_parameters.APPLE_SCORE_RANGE,
+                        bomb_radii or game_parameters.BOMB_RADIUS_RANGE,
+                        bomb_times or game_parameters.BOMB_TIME_RANGE)
+        # pre-generated draws, consumed from their end.
+        self._apple_scores = []  # type: List[int]
+        self._bomb_radii = []  # type: List[int]
+        self._bomb_times = []  # type: List[int]
+        super().__init__(seed)
+
+    def seed(self, *args: Any, **kwargs: Any) -> None:
+        """
+        re-seed the stream, discarding the pre-generated draws.
+        """
+        super().seed(*args, **kwargs)
+        self._apple_scores = []
+        self._bomb_radii = []
+        self._bomb_times = []
+
+    def getstate(self) -> Tuple:
+        """
+        return the state of the stream, including the pre-generated draws.
+        """
+        return (super().getstate(),
+                tuple(self._apple_scores),
+                tuple(self._bomb_radii),
+                tuple(self._bomb_times))
+
+    def setstate(self, state: Tuple) -> None:
+        """
+        restore a state of the stream (see "getstate").
+        """
+        generator, apple_scores, bomb_radii, bomb_times = state
+        super().setstate(generator)
+        self._apple_scores = list(apple_scores)
+        self._bomb_radii = list(bomb_radii)
+        self._bomb_times = list(bomb_times)
+
+    def __reduce__(self) -> Tuple:
+        return type(self), (0, *self._ranges), self.getstate()
+
+    def _block(self, bounds: Tuple[int, int]) -> List[int]:
+        """
+        draw a block of integers uniformly at random.
+
+        :param bounds: the (inclusive) range of the integers.
+        """
+        low, high = bounds
+        return self.choices(range(low, high + 1), k=self.BLOCK_SIZE)
+
+    def apple_score(self) -> int:
+        """
+        draw the score of a new apple, within the range of the apple
+        scores of the game (see "GameConfig.apple_scores").
+        """
+        if not self._apple_scores:
+            self._apple_scores = self._block(self._ranges[0])
+        return self._apple_scores.pop()
+
+    def bomb_timing(self) -> Tuple[int, int]:
+        """
+        draw the radius & the time to explode of a new bomb, within the
+        ranges of the game (see "GameConfig.bomb_radii" &
+        "GameConfig.bomb_times").
+        """
+        if not self._bomb_radii:
+            self._bomb_radii = self._block(self._ranges[1])
+            self._bomb_times = self._block(self._ranges[2])
+        return self._bomb_radii.pop(), self._bomb_times.pop()
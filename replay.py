@@ -0,0 +1,477 @@
+import struct
+import zlib
+from bisect import bisect_right
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+import engine
+
+from apple import Apple
+from bomb import Bomb
+from game import Game
+from game_config import GameConfig
+from random_stream import RandomStream
+from snake import Snake, Direction
+
+MAGIC = b"SNKR"
+VERSION = 5
+# magic, version, seed, board length & height, the (inclusive) ranges of
+# the apple scores, bomb radii & bomb times to explode, the amount of apples
+# & the growth per apple.
+HEADER = struct.Struct("<4sBQII8H")
+# the amount of turns between keyframes, which follows the header, so the
+# keyframes of a file which wasn't closed properly can be found without its
+# index (see "ReplayReader").
+LAYOUT = struct.Struct("<I")
+# a keyframe is the compressed state of the game before a turn, prefixed by
+# its size.
+KEYFRAME = struct.Struct("<I")
+# the state of a game within a keyframe: the turn, the score, whether or not
+# the game is playing, the direction code & the growth counter of the
+# snake, & the amounts of the cells of the snake, of the apples & of the
+# bombs. it's followed by the cells of the snake (from its tail to its
+# head), the apples, the bombs & the state of the random draws of the game.
+# cells are numbered column by column (column * height + row).
+STATE = struct.Struct("<QqBBIIII")
+# the cell & the score of an apple.
+APPLE = struct.Struct("<Ii")
+# the cell, the explosion radius, the turns until explosion, whether or not
+# the bomb have detonated & the current radius of the shock-wave of a bomb.
+BOMB = struct.Struct("<IiiBi")
+# the state of the random generator: its 624 words & its position, whether
+# or not a gaussian draw is pending & that draw, followed by the amounts of
+# the pre-generated apple scores, bomb radii & bomb times (see
+# "RandomStream"), which follow as well.
+GENERATOR = struct.Struct("<625IBdIII")
+# the index of the keyframes: turn & file offset of each keyframe. it's
+# preceded by a byte which isn't a direction code (see "DIRECTION_CODES"),
+# so the turns are told apart from an index which was cut short.
+END_OF_TURNS = 0xFF
+INDEX_ENTRY = struct.Struct("<QQ")
+# the end of the file: the offset of the index, the amount of keyframes &
+# the amount of turns.
+TRAILER_MAGIC = b"SNKI"
+TRAILER = struct.Struct("<QIQ4s")
+
+# each turn is recorded as a single byte: the code of its direction.
+DIRECTION_CODES = {
+    None: 0,
+    Direction.UP: 1,
+    Direction.DOWN: 2,
+    Direction.RIGHT: 3,
+    Direction.LEFT: 4,
+}
+CODE_DIRECTIONS = {code: direction
+                   for direction, code in DIRECTION_CODES.items()}
+
+
+class ReplayHeader(NamedTuple):
+    """
+    everything which defines a game, besides the directions of its turns.
+    """
+    seed: int
+    # the colors aren't recorded, as they don't affect the course of the
+    # game.
+    config: GameConfig = GameConfig()
+
+    def pack(self) -> bytes:
+        """
+        serialize the header (see "HEADER").
+        """
+        config = self.config
+        return HEADER.pack(MAGIC, VERSION, self.seed, config.length,
+                           config.height, *config.apple_scores,
+                           *config.bomb_radii, *config.bomb_times,
+                           config.apples, config.apple_growth)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'ReplayHeader':
+        """
+        deserialize a header (see "HEADER").
+        """
+        (magic, version, seed, length, height,
+         min_score, max_score, min_radius, max_radius, min_time, max_time,
+         apples, apple_growth) = HEADER.unpack(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        return cls(seed, GameConfig(length, height,
+                                    (min_score, max_score),
+                                    (min_radius, max_radius),
+                                    (min_time, max_time),
+                                    apples, apple_growth))
+
+
+class ReplayWriter:
+    """
+    records the turns of a game into a replay file, through a buffer so
+    recording a turn rarely touches the disk.
+
+    the turns are interleaved with periodic keyframes, i.e. full snapshots
+    of the game, which are indexed at the end of the file so any turn can be
+    reached by re-simulating at most a single keyframe interval (see
+    "ReplayReader.seek"). the buffer is flushed before each keyframe, so
+    if the writer is killed at most a keyframe interval is lost.
+    """
+    BUFFER_SIZE = 1 << 16
+    KEYFRAME_INTERVAL = 4096
+
+    def __init__(self,
+                 path: str,
+                 header: ReplayHeader,
+                 keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        """
+        create a new replay file.
+
+        :param path: the path of the file.
+        :param header: the parameters of the recorded game.
+        :param keyframe_interval: the amount of turns between keyframes.
+        """
+        if keyframe_interval <= 0:
+            raise ValueError("keyframe interval must be greater than zero")
+
+        self._keyframe_interval = keyframe_interval
+        self._turns = 0
+        self._index = []  # type: List[Tuple[int, int]]
+        self._file = open(path, "wb", buffering=self.BUFFER_SIZE)
+        self._file.write(header.pack())
+        self._file.write(LAYOUT.pack(keyframe_interval))
+
+    def __enter__(self) -> 'ReplayWriter':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def record(self, game: Game, direction: Optional[Direction]) -> None:
+        """
+        append a single turn, preceded by a keyframe once every keyframe
+        interval.
+
+        :param game: the game, before the turn is played.
+        :param direction: the direction the turn is played with.
+        """
+        if self._turns % self._keyframe_interval == 0:
+            self._file.flush()
+            self._index.append((self._turns, self._file.tell()))
+            state = zlib.compress(pack_game(game, self._turns))
+            self._file.write(KEYFRAME.pack(len(state)))
+            self._file.write(state)
+
+        self._file.write(bytes((DIRECTION_CODES[direction],)))
+        self._turns += 1
+
+    def close(self) -> None:
+        """
+        write the index of the keyframes, flush the buffered turns & close
+        the file.
+        """
+        if self._file.closed:
+            return
+
+        self._file.write(bytes((END_OF_TURNS,)))
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(TRAILER.pack(index_offset, len(self._index),
+                                      self._turns, TRAILER_MAGIC))
+        self._file.close()
+
+
+class ReplayReader:
+    """
+    random access into a replay file.
+
+    a file which wasn't closed properly (e.g. its writer was killed) has no
+    index, so the keyframes are found by skipping from one to the next by
+    their sizes, & the turns which follow the last complete keyframe are
+    recovered as well.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        open a replay file & load its index (or recover it).
+
+        :param path: the path of the file.
+        """
+        self._file = open(path, "rb")
+        try:
+            self._header = ReplayHeader.unpack(
+                _read_exactly(self._file, HEADER.size))
+            interval, = LAYOUT.unpack(_read_exactly(self._file, LAYOUT.size))
+            end = self._file.seek(0, 2)
+
+            entries = None  # type: Optional[List[Tuple[int, int]]]
+            if end >= HEADER.size + LAYOUT.size + TRAILER.size:
+                self._file.seek(-TRAILER.size, 2)
+                index_offset, keyframes, self._turns, magic = \
+                    TRAILER.unpack(_read_exactly(self._file, TRAILER.size))
+                index_size = keyframes * INDEX_ENTRY.size
+                if magic == TRAILER_MAGIC and \
+                        index_offset + index_size + TRAILER.size == end:
+                    self._file.seek(index_offset)
+                    entries = list(INDEX_ENTRY.iter_unpack(
+                        _read_exactly(self._file, index_size)))
+            if entries is None:
+                entries, turns_end, self._turns = self._scan(interval, end)
+            else:
+                turns_end = index_offset - 1
+        except BaseException:
+            self._file.close()
+            raise
+
+        # the offset of the end of the recorded turns.
+        self._turns_end = turns_end
+        self._keyframe_turns = [turn for turn, _ in entries]
+        self._keyframe_offsets = [offset for _, offset in entries]
+
+    def __enter__(self) -> 'ReplayReader':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        close the file.
+        """
+        self._file.close()
+
+    def get_header(self) -> ReplayHeader:
+        """
+        return the parameters of the recorded game.
+        """
+        return self._header
+
+    def get_turns(self) -> int:
+        """
+        return the amount of recorded turns.
+        """
+        return self._turns
+
+    def _scan(self,
+              interval: int,
+              end: int) -> Tuple[List[Tuple[int, int]], int, int]:
+        """
+        recover the index of a file which wasn't closed properly. a
+        keyframe which was cut short is dropped, along with the turns after
+        it, & the turns end before an index which was cut short (see
+        "END_OF_TURNS").
+
+        :param interval: the amount of turns between keyframes.
+        :param end: the size of the file.
+        :return: the entries of the index (see "INDEX_ENTRY"), the offset
+                 of the end of the recovered turns & the amount of turns.
+        """
+        entries = []  # type: List[Tuple[int, int]]
+        offset = HEADER.size + LAYOUT.size
+        turns = 0
+        while offset + KEYFRAME.size <= end:
+            self._file.seek(offset)
+            size, = KEYFRAME.unpack(_read_exactly(self._file, KEYFRAME.size))
+            codes_offset = offset + KEYFRAME.size + size
+            if codes_offset > end:
+                break
+            entries.append((turns, offset))
+            self._file.seek(codes_offset)
+            codes = self._file.read(interval)
+            recorded = codes.find(END_OF_TURNS)
+            if recorded == -1:
+                recorded = len(codes)
+            turns += recorded
+            offset = codes_offset + recorded
+            if recorded < interval:
+                break
+        return entries, offset, turns
+
+    def _codes_end(self, keyframe: int) -> int:
+        """
+        :param keyframe: the position of a keyframe within the index.
+        :return: the offset of the end of the turns which follow the
+                 keyframe.
+        """
+        if keyframe + 1 < len(self._keyframe_offsets):
+            return self._keyframe_offsets[keyframe + 1]
+        return self._turns_end
+
+    def _read_keyframe(self, keyframe: int) -> Tuple[Game, bytes]:
+        """
+        :param keyframe: the position of a keyframe within the index.
+        :return: the game at the turn of the keyframe & the codes of the
+                 directions of the turns until the next keyframe.
+        """
+        self._file.seek(self._keyframe_offsets[keyframe])
+        size, = KEYFRAME.unpack(_read_exactly(self._file, KEYFRAME.size))
+        turn, game = unpack_game(
+            zlib.decompress(_read_exactly(self._file, size)),
+            self._header.config)
+        if turn != self._keyframe_turns[keyframe]:
+            raise ValueError("corrupted replay file")
+
+        codes = _read_exactly(self._file,
+                              self._codes_end(keyframe) - self._file.tell())
+        return game, codes
+
+    def codes(self) -> bytes:
+        """
+        return the codes of the directions of all the recorded turns (see
+        "DIRECTION_CODES"). the keyframes are skipped by their sizes, rather
+        than decoded.
+        """
+        parts = []  # type: List[bytes]
+        for keyframe, offset in enumerate(self._keyframe_offsets):
+            self._file.seek(offset)
+            size, = KEYFRAME.unpack(_read_exactly(self._file, KEYFRAME.size))
+            start = offset + KEYFRAME.size + size
+            self._file.seek(start)
+            parts.append(_read_exactly(self._file,
+                                       self._codes_end(keyframe) - start))
+        return b"".join(parts)
+
+    def seek(self, turn: int) -> Game:
+        """
+        restore the game before the given turn, by re-simulating the turns
+        since the preceding keyframe.
+
+        :param turn: the amount of turns played (up to the amount of
+                     recorded turns, which yields the final game).
+        """
+        if not 0 <= turn <= self._turns:
+            raise ValueError(f"turn {turn} is out of the range [0, "
+                             f"{self._turns}]")
+
+        if not self._keyframe_turns:
+            raise ValueError("the replay doesn't contain any keyframe")
+
+        keyframe = bisect_right(self._keyframe_turns, turn) - 1
+        game, codes = self._read_keyframe(keyframe)
+        skipped = turn - self._keyframe_turns[keyframe]
+        engine.play(game, directions(codes[:skipped]))
+        return game
+
+
+def read_replay(path: str) -> Tuple[ReplayHeader, bytes]:
+    """
+    read a replay file.
+
+    :param path: the path of the file.
+    :return: the parameters of the recorded game & the codes of the
+             directions of its turns (see "DIRECTION_CODES").
+    """
+    with ReplayReader(path) as reader:
+        return reader.get_header(), reader.codes()
+
+
+def pack_game(game: Game, turn: int) -> bytes:
+    """
+    serialize the state of a game (see "STATE").
+
+    :param game: the game.
+    :param turn: the amount of turns the game have lasted.
+    """
+    height = game.get_config().height
+    snake = game.get_snake()
+    body = snake.get_coordinates()
+    apples = game.get_apples()
+    bombs = game.get_bombs()
+    generator, apple_scores, bomb_radii, bomb_times = \
+        game.get_random().getstate()
+    _, words, gauss = generator
+
+    parts = [STATE.pack(turn, game.get_score(), game.is_playing(),
+                        DIRECTION_CODES[snake.get_direction()],
+                        snake.get_growth_counter(), len(body), len(apples),
+                        len(bombs)),
+             struct.pack(f"<{len(body)}I", *(column * height + row
+                                             for column, row in body))]
+    for apple in apples:
+        column, row = apple.get_coordinates()[0]
+        parts.append(APPLE.pack(column * height + row, apple.get_score()))
+    for bomb in bombs:
+        column, row = bomb.get_location()
+        parts.append(BOMB.pack(column * height + row, bomb.get_max_radius(),
+                               bomb.get_turns_until_explosion(),
+                               bomb.is_detonated(), bomb.get_radius()))
+    parts.append(GENERATOR.pack(*words, gauss is not None, gauss or 0.0,
+                                len(apple_scores), len(bomb_radii),
+                                len(bomb_times)))
+    draws = apple_scores + bomb_radii + bomb_times
+    parts.append(struct.pack(f"<{len(draws)}i", *draws))
+    return b"".join(parts)
+
+
+def unpack_game(data: bytes, config: GameConfig) -> Tuple[int, Game]:
+    """
+    deserialize the state of a game (see "pack_game").
+
+    :param data: the serialized state.
+    :param config: the configuration of the game.
+    :return: the amount of turns the game have lasted & the game.
+    """
+    height = config.height
+    (turn, score, playing, direction, growth_counter,
+     length, apples_amount, bombs_amount) = STATE.unpack_from(data)
+    offset = STATE.size
+
+    body = [divmod(cell, height)
+            for cell in struct.unpack_from(f"<{length}I", data, offset)]
+    offset += 4 * length
+    snake = Snake.from_body(body, CODE_DIRECTIONS[direction],
+                            growth_counter)
+
+    apples = []  # type: List[Apple]
+    for cell, apple_score in APPLE.iter_unpack(
+            data[offset:offset + apples_amount * APPLE.size]):
+        apples.append(Apple(divmod(cell, height), apple_score))
+    offset += apples_amount * APPLE.size
+
+    bombs = []  # type: List[Bomb]
+    for cell, max_radius, turns, detonated, radius in BOMB.iter_unpack(
+            data[offset:offset + bombs_amount * BOMB.size]):
+        bombs.append(Bomb.restore(divmod(cell, height), max_radius, turns,
+                                  bool(detonated), radius))
+    offset += bombs_amount * BOMB.size
+
+    *words, pending, gauss, scores, radii, times = \
+        GENERATOR.unpack_from(data, offset)
+    offset += GENERATOR.size
+    draws = struct.unpack_from(f"<{scores + radii + times}i", data, offset)
+    stream = RandomStream(0, config.apple_scores, config.bomb_radii,
+                          config.bomb_times)
+    stream.setstate(((RandomStream.VERSION, tuple(words),
+                      gauss if pending else None),
+                     draws[:scores], draws[scores:scores + radii],
+                     draws[scores + radii:]))
+
+    return turn, Game.restore(config, snake, apples, bombs, score,
+                              bool(playing), stream)
+
+
+def _read_exactly(replay_file: BinaryIO, size: int) -> bytes:
+    """
+    read the given amount of bytes from a file, which must not end before.
+    """
+    data = replay_file.read(size)
+    if len(data) != size:
+        raise ValueError("truncated replay file")
+    return data
+
+
+def directions(codes: bytes) -> Iterator[Optional[Direction]]:
+    """
+    decode the directions of recorded turns.
+    """
+    return map(CODE_DIRECTIONS.__getitem__, codes)
+
+
+def replay(path: str, max_turns: Optional[int] = None) -> engine.GameResult:
+    """
+    re-simulate a recorded game without displaying it.
+
+    :param path: the path of the replay file.
+    :param max_turns: maximal amount of turns to re-simulate (None for the
+                      whole game).
+    """
+    header, codes = read_replay(path)
+    return engine.run(header.seed, directions(codes), max_turns,
+                      header.config)
@@ -1,5 +1,7 @@
+import copy
+from collections import deque
 from enum import Enum
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Dict, Deque
 
 from moving import Moving
 
@@ -29,13 +31,51 @@ class Snake(Moving):
         """
 
         self._head = location
-        self._coordinates = [
+        # the body of the snake, from its tail to its head.
+        self._coordinates = deque([
             (self._head[0], self._head[1] - 2),
             (self._head[0], self._head[1] - 1),
             self._head
-        ]
+        ])  # type: Deque[Tuple[int, int]]
+        # cell -> how many parts of the snake occupy it.
+        self._cells = {}  # type: Dict[Tuple[int, int], int]
+        for cell in self._coordinates:
+            self._cells[cell] = self._cells.get(cell, 0) + 1
         self._direction = Direction.UP
         self._growth_counter = 0
+        self._vacated = None  # type: Optional[Tuple[int, int]]
+
+    @classmethod
+    def from_body(cls,
+                  body: List[Tuple[int, int]],
+                  direction: Direction,
+                  growth_counter: int) -> 'Snake':
+        """
+        create a snake in the middle of a game (e.g. when restoring a saved
+        game).
+
+        :param body: the cells occupied by the snake, from its tail to its
+                     head.
+        :param direction: in which direction the snake is moving.
+        :param growth_counter: by how many cells the snake should still grow.
+        """
+        snake = cls(body[-1])
+        snake._coordinates = deque(body)
+        snake._cells = {}
+        for cell in body:
+            snake._cells[cell] = snake._cells.get(cell, 0) + 1
+        snake._direction = direction
+        snake._growth_counter = growth_counter
+        return snake
+
+    def clone(self) -> 'Snake':
+        """
+        create an independent copy of the snake.
+        """
+        snake = copy.copy(self)
+        snake._coordinates = deque(self._coordinates)
+        snake._cells = dict(self._cells)
+        return snake
 
     def get_color(self) -> str:
         """
@@ -47,15 +87,32 @@ class Snake(Moving):
         """
         return a list of cells coordinates occupied by the snake body.
         """
-        return self._coordinates
+        return list(self._coordinates)
+
+    def get_length(self) -> int:
+        """
+        return the amount of cells occupied by the snake body.
+        """
+        return len(self._coordinates)
+
+    def get_occupancy(self, cell: Tuple[int, int]) -> int:
+        """
+        :param cell: coordinates of a cell.
+        :return: how many parts of the snake body occupy the given cell.
+        """
+        return self._cells.get(cell, 0)
 
     def move(self) -> None:
         """
         move the snake.
         """
         if self._growth_counter == 0:
-            self._coordinates.pop(0)
+            self._vacated = self._coordinates.popleft()
+            self._cells[self._vacated] -= 1
+            if self._cells[self._vacated] == 0:
+                del self._cells[self._vacated]
         else:
+            self._vacated = None
             self._growth_counter -= 1
 
         if self._direction is Direction.UP:
@@ -67,6 +124,7 @@ class Snake(Moving):
         elif self._direction is Direction.LEFT:
             self._coordinates.append((self._head[0] - 1, self._head[1]))
         self._head = self._coordinates[-1]
+        self._cells[self._head] = self._cells.get(self._head, 0) + 1
 
     def get_head(self) -> Tuple[int, int]:
         """
@@ -74,6 +132,25 @@ class Snake(Moving):
         """
         return self._head
 
+    def get_direction(self) -> Direction:
+        """
+        return the direction in which the snake is moving.
+        """
+        return self._direction
+
+    def get_growth_counter(self) -> int:
+        """
+        return by how many cells the snake should still grow.
+        """
+        return self._growth_counter
+
+    def get_vacated_cell(self) -> Optional[Tuple[int, int]]:
+        """
+        return the coordinates of the cell left by the snake's tail during the
+        last move, or None if the snake have grown instead.
+        """
+        return self._vacated
+
     def _valid_move(self, move: Direction) -> bool:
         all_moves = [[Direction.DOWN, Direction.UP],
                      [Direction.RIGHT, Direction.LEFT]]
@@ -97,8 +174,10 @@ class Snake(Moving):
         self._direction = move
         return True
 
-    def eat_apple(self) -> None:
+    def eat_apple(self, growth: int = APPLE_WAS_EATEN_GROWTH) -> None:
         """
         "eat an apple" & increment the snake's body length.
+
+        :param growth: by how many cells the snake should grow.
         """
-        self._growth_counter += self.APPLE_WAS_EATEN_GROWTH
+        self._growth_counter += growth
@@ -1,12 +1,26 @@
-from typing import Optional
+import random
+from typing import Optional, cast
 
-import game_parameters
 from game_display import GameDisplay
 
+import engine
+from autopilot import Autopilot
 from game import Game
+from profiler import Profiler
+from replay import ReplayHeader, ReplayWriter
 from snake import Direction
 from board import Board
 
+# where to record the replay of the last game (None for no recording, e.g.
+# "last_game.replay").
+REPLAY_PATH = None  # type: Optional[str]
+# where to export the profile of the phases of the rounds of the last game
+# (None for no profiling, see "Profiler").
+PROFILE_PATH = None  # type: Optional[str]
+# whether the snake is played by an autopilot (see "Autopilot") rather than
+# by the keyboard.
+AUTOPILOT = False
+
 KEY_TO_DIRECTION = {
     "Up": Direction.UP,
     "Down": Direction.DOWN,
@@ -17,14 +31,21 @@ KEY_TO_DIRECTION = {
 
 def draw(board: Board, gd: GameDisplay, score: int) -> None:
     """
-    draw all the board cells & display the player score.
+    draw the board cells which have changed since the previous call &
+    display the player score.
 
     :param board: the board to draw.
     :param gd: drawing & display object.
     :param score: the score of the player
     """
-    board.update()
-    for cell, color in board.get_cells().items():
+    changes = board.pop_changes()
+    for cell in changes.vacated:
+        column, row = cell
+        gd.clear_cell(column, row)
+    for cell, color in changes.occupied.items():
+        column, row = cell
+        gd.draw_cell(column, row, color)
+    for cell, color in changes.recolored.items():
         column, row = cell
         gd.draw_cell(column, row, color)
 
@@ -44,28 +65,55 @@ def get_direction_from_user(gd: GameDisplay) -> Optional[Direction]:
     return KEY_TO_DIRECTION.get(key_clicked)
 
 
-def setup_game(gd: GameDisplay) -> Game:
+def setup_game(gd: GameDisplay, seed: Optional[int] = None) -> Game:
     """
     setup the game, initialize all the required object & elements of the game.
 
     :param gd: drawing & display object.
+    :param seed: the seed of the random draws of the game.
     """
-    game = Game(game_parameters.WIDTH, game_parameters.HEIGHT)
-    game.create_snake()
-    game.create_bomb()
-    for _ in range(Game.AMOUNT_OF_APPLES):
-        game.create_apple()
-
-    return game
+    return engine.setup_game(gd.get_config(), seed)
 
 
 def main_loop(gd: GameDisplay) -> None:
-    game = setup_game(gd)
-    while game.is_playing():
-        draw(game.get_board(), gd, game.get_score())
-        gd.end_round()
-        direction = get_direction_from_user(gd)
-        game.single_turn(direction)
+    seed = random.getrandbits(64)
+    game = setup_game(gd, seed)
+    recorder = None  # type: Optional[ReplayWriter]
+    if REPLAY_PATH is not None:
+        recorder = ReplayWriter(REPLAY_PATH,
+                                ReplayHeader(seed, game.get_config()))
+    profiler = None  # type: Optional[Profiler]
+    if PROFILE_PATH is not None:
+        config = game.get_config()
+        profiler = Profiler({"seed": seed,
+                             "length": config.length,
+                             "height": config.height})
+        game.set_profiler(profiler)
+        gd.set_profiler(profiler)
+    autopilot = Autopilot() if AUTOPILOT else None
+
+    try:
+        while game.is_playing():
+            if profiler is not None:
+                start = profiler.clock()
+            draw(game.get_board(), gd, game.get_score())
+            if profiler is not None:
+                profiler.record("draw", profiler.clock() - start)
+            gd.end_round()
+            if autopilot is not None:
+                direction = autopilot(game)
+            else:
+                direction = get_direction_from_user(gd)
+            if recorder is not None:
+                recorder.record(game, direction)
+            game.single_turn(direction)
+            if profiler is not None:
+                profiler.record("round", profiler.clock() - start)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if profiler is not None:
+            profiler.export(cast(str, PROFILE_PATH))
     draw(game.get_board(), gd, game.get_score())
     gd.end_round()
 
@@ -0,0 +1,126 @@
+import csv
+import os
+import random
+import time
+from itertools import islice, product
+from multiprocessing import Pool
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import engine
+
+from game_config import GameConfig
+from snake import Direction
+
+COLUMNS = (
+    "seed",
+    "length",
+    "height",
+    "min_apple_score",
+    "max_apple_score",
+    "min_bomb_radius",
+    "max_bomb_radius",
+    "min_bomb_time",
+    "max_bomb_time",
+    "apples",
+    "apple_growth",
+    "score",
+    "snake_length",
+    "turns",
+    "death_cause",
+    "wall_time",
+)
+
+
+# given the seed of a game, create the directions of its turns (see
+# "engine.Directions"). must be picklable, i.e. a module level function.
+Policy = Callable[[int], engine.Directions]
+
+
+def random_policy(seed: int) -> engine.Directions:
+    """
+    a policy which mostly keeps the current direction, & otherwise turns to
+    a random direction.
+
+    :param seed: the seed of the game.
+    """
+    rng = random.Random(seed)
+    choices = list(Direction) + [None] * 6
+    return lambda game: rng.choice(choices)
+
+
+def play(task: Tuple[GameConfig, int, Policy, Optional[int]]) -> Tuple:
+    """
+    play a single headless game.
+
+    :param task: the configuration of the game, its seed, the policy which
+                 plays it & the maximal amount of turns.
+    :return: a row of the results (see "COLUMNS").
+    """
+    config, seed, policy, max_turns = task
+
+    start = time.perf_counter()
+    result = engine.run(seed, policy(seed), max_turns, config)
+    wall_time = time.perf_counter() - start
+
+    return (seed, config.length, config.height,
+            *config.apple_scores, *config.bomb_radii, *config.bomb_times,
+            config.apples, config.apple_growth,
+            result.score, result.length, result.turns, result.death_cause,
+            wall_time)
+
+
+def sweep(seeds: Iterable[int],
+          configs: Iterable[GameConfig],
+          path: str,
+          policy: Policy = random_policy,
+          max_turns: Optional[int] = 10000,
+          processes: Optional[int] = None,
+          window: int = 4096) -> int:
+    """
+    play a headless game for each of the seeds under each of the configs,
+    spread over a pool of processes, & stream the results into a csv file
+    (one column per entry of "COLUMNS").
+
+    the rows are written in the order of the games, i.e. all the seeds of
+    the first config, then all the seeds of the second config & so on, so
+    the output (but the wall times) depends only on the seeds, no matter
+    how many processes have played the games.
+
+    :param seeds: the seeds of the games.
+    :param configs: the configurations of the games.
+    :param path: the path of the output file.
+    :param policy: the policy which plays the games.
+    :param max_turns: maximal amount of turns per game (None for no limit).
+    :param processes: the amount of processes (None for one per cpu).
+    :param window: the maximal amount of games in flight, which bounds the
+                   memory consumed by pending results.
+    :return: the amount of played games.
+    """
+    seeds = list(seeds)
+    tasks = ((config, seed, policy, max_turns)
+             for config, seed in product(configs, seeds))
+    played = 0
+    workers = processes or os.cpu_count() or 1
+
+    with open(path, "w", newline="") as output, Pool(processes) as pool:
+        writer = csv.writer(output)
+        writer.writerow(COLUMNS)
+        for batch in _windows(tasks, window):
+            chunksize = max(1, len(batch) // (4 * workers))
+            writer.writerows(pool.imap(play, batch, chunksize))
+            output.flush()
+            played += len(batch)
+
+    return played
+
+
+def _windows(tasks: Iterator, size: int) -> Iterator[List]:
+    """
+    split the tasks into consecutive lists of the given size (the last one
+    might be shorter).
+    """
+    while True:
+        batch = list(islice(tasks, size))
+        if not batch:
+            return
+        yield batch
@@ -1,6 +1,8 @@
 import tkinter as tki
 from typing import Any, Optional, List, Tuple, Dict
 
+from game_config import GameConfig
+
 INPUT = [12,
          [None, 'Right', None, None, None, None, 'Down', None, None, None, None, None, None, None, None, 'Right', None,
           None, None, None, None, 'Up'], 33]
@@ -222,15 +224,17 @@ ACTUAL = [
                                                                                                                        7): 'green'}),
     (0, {(0, 21): 'green', (24, 0): 'green', (29, 8): 'orange', (30, 7): 'orange', (30, 9): 'orange', (31, 7): 'black',
          (31, 8): 'orange', (31, 9): 'black', (38, 7): 'green'})]
-WIDTH = 40
-HEIGHT = 30
 CELL_SIZE = 15
 
 
 class GameDisplay:
-    def __init__(self) -> None:
-        """Creates a new game display object and initializes it"""
-        # placed this import in here to solve circular import issues.
+    def __init__(self, config: Optional[GameConfig] = None) -> None:
+        """
+        Creates a new game display object and initializes it
+        :param config: the configuration of the compared games (the default
+                       configuration if None)
+        """
+        self._config = config or GameConfig()
         self._round_num = 0
         self._root = tki.Tk()
         self._root.title('Snake Compare')
@@ -248,16 +252,16 @@ class GameDisplay:
         self._init_score_frame()
         # self._init_input_frame()
 
-        self._expected_canvas = tki.Canvas(self._root, bg="white",
-                                           width=WIDTH * CELL_SIZE,
-                                           height=HEIGHT * CELL_SIZE)
+        self._expected_canvas = tki.Canvas(
+            self._root, bg="white", width=self._config.length * CELL_SIZE,
+            height=self._config.height * CELL_SIZE)
         self._expected_canvas.pack(side=tki.RIGHT)
         self._expected_to_draw: List[Tuple[int, int, str]] = list()
         self._expected_already_drawn: Dict[Tuple[int, int, str], int] = dict()
 
-        self._actual_canvas = tki.Canvas(self._root, bg="white",
-                                         width=WIDTH * CELL_SIZE,
-                                         height=HEIGHT * CELL_SIZE)
+        self._actual_canvas = tki.Canvas(
+            self._root, bg="white", width=self._config.length * CELL_SIZE,
+            height=self._config.height * CELL_SIZE)
         self._actual_canvas.pack(side=tki.LEFT)
         self._actual_to_draw: List[Tuple[int, int, str]] = list()
         self._actual_already_drawn: Dict[Tuple[int, int, str], int] = dict()
@@ -372,7 +376,7 @@ class GameDisplay:
             "w", lambda _, __, ___, sv=self._actual_var: self._actual_input_changed())
         self._actual_input = tki.Entry(self._input_frame,
                                        borderwidth=2,
-                                       width=WIDTH,
+                                       width=self._config.length,
                                        relief="ridge",
                                        font=("Courier", 22),
                                        textvariable=self._actual_var)
@@ -382,7 +386,7 @@ class GameDisplay:
             "w", lambda _, __, ___, sv=self._actual_var: self._expected_input_changed())
         self._expected_input = tki.Entry(self._input_frame,
                                          borderwidth=2,
-                                         width=WIDTH,
+                                         width=self._config.length,
                                          relief="ridge",
                                          font=("Courier", 22),
                                          textvariable=self._expected_var)
@@ -434,15 +438,15 @@ class GameDisplay:
         :param color: the color we wish to draw
         :return: None
         """
-        if x < 0 or x >= WIDTH or \
-                y < 0 or y >= HEIGHT:
+        if x < 0 or x >= self._config.length or \
+                y < 0 or y >= self._config.height:
             raise ValueError(
                 "cell index out of bounds of the board: " + str((x, y)))
 
         # setting the coordinates of the board correctly,
         # the y axis needs to point up.
         # the following line adjusts this.
-        y = HEIGHT - y
+        y = self._config.height - y
         return canvas.create_rectangle(
             x * CELL_SIZE, (y - 1) * CELL_SIZE,
             (x + 1) * CELL_SIZE, y * CELL_SIZE,
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the modules of the game live at the root of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,134 @@
+from itertools import count
+from typing import Tuple
+
+from arena import Arena
+from bomb import Bomb
+from events import SnakeDied
+from game_config import GameConfig
+from snake import Direction
+
+# no apples, & bombs which explode 3 turns after being created, with
+# shock-waves of radius 2.
+CONFIG = GameConfig(10, 10, apples=0, bomb_radii=(2, 2), bomb_times=(3, 3))
+
+
+def _arena_with_bomb() -> Tuple[Arena, Bomb]:
+    """
+    an arena with a single bomb, with room for snakes below it & to its
+    right.
+    """
+    for seed in count():
+        arena = Arena(CONFIG, seed)
+        arena.create_bomb()
+        bomb = arena.get_bombs()[0]
+        column, row = bomb.get_location()
+        if 3 <= row < CONFIG.height - 1 and column < CONFIG.length - 2:
+            return arena, bomb
+    raise AssertionError("unreachable")
+
+
+def test_game_ends_by_the_cause_of_the_last_snake_to_die() -> None:
+    arena = Arena(GameConfig(4, 4), 0)
+    # crashes into the body of the other snake.
+    first = arena.add_snake((1, 2))
+    # crashes into the wall.
+    second = arena.add_snake((2, 3))
+    deaths = []
+    arena.add_sink(lambda event: isinstance(event, SnakeDied) and
+                   deaths.append(event))
+
+    arena.single_turn({first: Direction.RIGHT, second: None})
+
+    assert not arena.is_playing()
+    assert arena.get_snake_death_cause(first) == Arena.SNAKE_CRASH
+    assert arena.get_snake_death_cause(second) == Arena.WALL_CRASH
+    assert arena.get_death_cause() == deaths[-1].cause
+
+
+def test_heads_entering_the_same_cell_both_crash() -> None:
+    arena = Arena(CONFIG, 0)
+    first = arena.add_snake((2, 5))
+    second = arena.add_snake((4, 5))
+
+    arena.single_turn({first: Direction.RIGHT, second: Direction.LEFT})
+
+    assert arena.get_snake_death_cause(first) == Arena.SNAKE_CRASH
+    assert arena.get_snake_death_cause(second) == Arena.SNAKE_CRASH
+    assert not arena.is_playing()
+    assert arena.get_death_cause() == Arena.SNAKE_CRASH
+
+
+def test_heads_swapping_cells_both_crash() -> None:
+    arena = Arena(CONFIG, 0)
+    first = arena.add_snake((2, 5))
+    second = arena.add_snake((3, 5))
+
+    # each head enters the cell which has just become the neck of the other
+    # snake.
+    arena.single_turn({first: Direction.RIGHT, second: Direction.LEFT})
+
+    assert arena.get_snake_death_cause(first) == Arena.SNAKE_CRASH
+    assert arena.get_snake_death_cause(second) == Arena.SNAKE_CRASH
+    assert not arena.is_playing()
+
+
+def test_head_entering_the_body_of_another_snake_crashes() -> None:
+    arena = Arena(CONFIG, 0)
+    first = arena.add_snake((2, 5))
+    second = arena.add_snake((3, 6))
+
+    arena.single_turn({first: Direction.RIGHT, second: None})
+
+    assert arena.get_snake_death_cause(first) == Arena.SNAKE_CRASH
+    assert arena.is_alive(second)
+    assert arena.is_playing()
+    assert arena.get_board().get_elements_at((3, 5)) == \
+        [arena.get_snakes()[second]]
+
+
+def test_head_may_enter_the_cell_a_tail_leaves_in_the_same_turn() -> None:
+    # either the snake whose tail leaves moves first, or the one whose head
+    # enters.
+    for leaving_first in (True, False):
+        arena = Arena(CONFIG, 0)
+        if leaving_first:
+            leaving = arena.add_snake((3, 5))
+            entering = arena.add_snake((2, 3))
+        else:
+            entering = arena.add_snake((2, 3))
+            leaving = arena.add_snake((3, 5))
+
+        arena.single_turn({entering: Direction.RIGHT, leaving: None})
+
+        assert arena.is_alive(entering)
+        assert arena.is_alive(leaving)
+        assert arena.get_board().get_elements_at((3, 3)) == \
+            [arena.get_snakes()[entering]]
+
+
+def test_head_entering_a_bomb_explodes() -> None:
+    arena, bomb = _arena_with_bomb()
+    column, row = bomb.get_location()
+    snake_id = arena.add_snake((column, row - 1))
+
+    arena.single_turn({snake_id: None})
+
+    assert arena.get_snake_death_cause(snake_id) == Arena.BOMB_CRASH
+    assert arena.get_death_cause() == Arena.BOMB_CRASH
+
+
+def test_shock_wave_explodes_the_snakes_it_reaches() -> None:
+    arena, bomb = _arena_with_bomb()
+    column, row = bomb.get_location()
+    # circles around the square to the right of the bomb, whose cells are
+    # within the reach of the shock-wave.
+    snake_id = arena.add_snake((column + 2, row + 1))
+    circle = [Direction.LEFT, Direction.DOWN, Direction.RIGHT, Direction.UP]
+
+    for turn in range(20):
+        if not arena.is_playing():
+            break
+        arena.single_turn({snake_id: circle[turn % len(circle)]})
+
+    assert arena.get_snake_death_cause(snake_id) == Arena.BOMB_CRASH
+    assert bomb.is_detonated()
@@ -0,0 +1,121 @@
+import random
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+import engine
+from autopilot import UNREACHABLE, Autopilot, DistanceField
+from bomb import Bomb
+from game import Game
+from game_config import GameConfig
+
+LENGTH, HEIGHT = 15, 12
+
+
+def _distances(field: DistanceField,
+               obstacles: List[int],
+               sources: List[int]) -> List[int]:
+    """
+    the distances from the sources through the cells which aren't blocked,
+    up to the horizon of a field, evaluated from scratch.
+    """
+    distances = [UNREACHABLE] * (LENGTH * HEIGHT)
+    queue = deque()  # type: Deque[int]
+    for index in sources:
+        if not obstacles[index]:
+            distances[index] = 0
+            queue.append(index)
+    while queue:
+        index = queue.popleft()
+        if distances[index] == field.get_horizon():
+            continue
+        for neighbor in field.get_neighbors(index):
+            if distances[neighbor] == UNREACHABLE and not obstacles[neighbor]:
+                distances[neighbor] = distances[index] + 1
+                queue.append(neighbor)
+    return distances
+
+
+def test_repaired_field_matches_a_fresh_search() -> None:
+    area = LENGTH * HEIGHT
+    for seed in range(10):
+        generator = random.Random(seed)
+        # a horizon shorter than the board, every other game.
+        field = DistanceField(LENGTH, HEIGHT,
+                              5 if seed % 2 else DistanceField.HORIZON)
+        obstacles = [0] * area
+        sources = []  # type: List[int]
+        for _ in range(200):
+            # a cell might be entered by several obstacles at once.
+            blocked = [generator.randrange(area)
+                       for _ in range(generator.randint(0, 12))]
+            taken = [index for index in range(area) if obstacles[index]
+                     for _ in range(obstacles[index])]
+            freed = generator.sample(
+                taken, min(len(taken), generator.randint(0, 12)))
+            removed = generator.sample(
+                sources, min(len(sources), generator.randint(0, 2)))
+            added = list({generator.randrange(area)
+                          for _ in range(generator.randint(0, 2))} -
+                         set(sources))
+
+            field.update(blocked, freed, added, removed)
+            for index in blocked:
+                obstacles[index] += 1
+            for index in freed:
+                obstacles[index] -= 1
+            sources = [index for index in sources
+                       if index not in removed] + added
+
+            assert [field.get_distance(index) for index in range(area)] == \
+                _distances(field, obstacles, sources)
+
+
+def _is_cornered(game: Game, bomb: Bomb) -> bool:
+    """
+    check if the shock-wave of a bomb would hit the body of the snake
+    however it moves, i.e. before the tail gets past the cells within the
+    blast.
+    """
+    snake = game.get_snake()
+    x, y = bomb.get_location()
+    reach = bomb.get_max_radius() + 1
+    for position, (column, row) in enumerate(snake.get_coordinates()):
+        distance = abs(column - x) + abs(row - y)
+        if distance <= reach and \
+                bomb.get_turns_until_explosion() + distance <= \
+                position + snake.get_growth_counter() + 1:
+            return True
+    return False
+
+
+def test_blasts_only_hit_a_snake_which_cannot_get_away() -> None:
+    lengths = []  # type: List[int]
+    for seed in range(20):
+        game = engine.setup_game(None, seed)
+        autopilot = Autopilot()
+        # id(bomb) -> the bomb, & whether it has cornered the snake as it
+        # appeared.
+        bombs = {}  # type: Dict[int, Tuple[Bomb, bool]]
+        for _ in range(1000):
+            for bomb in game.get_bombs():
+                if id(bomb) not in bombs:
+                    bombs[id(bomb)] = (bomb, _is_cornered(game, bomb))
+            if not game.is_playing():
+                break
+            game.single_turn(autopilot(game))
+
+        if game.get_death_cause() == Game.BOMB_CRASH:
+            assert any(bombs[id(bomb)][1] for bomb in game.get_bombs())
+        lengths.append(game.get_snake().get_length())
+
+    # the snake keeps eating, well beyond the shortest fuse of the bombs.
+    assert sorted(lengths)[len(lengths) // 2] > \
+        GameConfig().bomb_times[0] * 2
+
+
+def test_decisions_on_a_huge_board() -> None:
+    game = engine.setup_game(GameConfig(10000, 10000), 0)
+    autopilot = Autopilot()
+    for _ in range(50):
+        game.single_turn(autopilot(game))
+    assert game.is_playing()
@@ -0,0 +1,94 @@
+import random
+from typing import Any, Tuple
+
+import engine
+from batch_board import BatchBitBoard
+from bitboard import BitBoard
+from game_config import GameConfig
+from snake import Direction
+
+STEPS = {
+    Direction.UP: (0, 1),
+    Direction.DOWN: (0, -1),
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+}
+
+
+def _new_board(config: GameConfig, seeds: random.Random) -> BitBoard:
+    board = BitBoard(config, seeds.getrandbits(64))
+    board.create_snake()
+    board.create_bomb()
+    for _ in range(config.apples):
+        board.create_apple()
+    return board
+
+
+def _steer(board: BitBoard,
+           height: int,
+           generator: random.Random) -> Direction:
+    """
+    pick a random direction which doesn't lead the snake right into a wall,
+    into itself or into a bomb, if there is any.
+    """
+    column, row = divmod(board.get_head_mask().bit_length() - 1, height)
+    blocked = board.get_snake_mask() | board.get_bombs_mask() | \
+        board.get_shockwave_mask()
+    safe = [direction for direction, (step_column, step_row) in STEPS.items()
+            if board.cell_mask((column + step_column, row + step_row)) &
+            ~blocked]
+    return generator.choice(safe or list(Direction))
+
+
+def _state(board: BitBoard) -> Tuple[Any, ...]:
+    game = board.to_game()
+    return (board.get_snake_mask(), board.get_head_mask(),
+            board.get_apples_mask(), board.get_bombs_mask(),
+            board.get_shockwave_mask(), board.get_score(),
+            list(game.get_snake().get_coordinates()),
+            game.get_snake().get_direction(),
+            game.get_snake().get_growth_counter(),
+            [(apple.get_coordinates(), apple.get_score())
+             for apple in game.get_apples()],
+            [(bomb.get_location(), bomb.get_max_radius(),
+              bomb.get_turns_until_explosion(), bomb.get_radius())
+             for bomb in game.get_bombs()],
+            game.get_random().getstate())
+
+
+def test_batch_matches_bit_boards() -> None:
+    # small boards & short fuses, so the games are full of events.
+    for config in (GameConfig(12, 10, bomb_radii=(1, 4), bomb_times=(2, 8),
+                              apples=6), GameConfig()):
+        directions = random.Random(0)
+        seeds = random.Random(1)
+        batch = BatchBitBoard(6, config, 1)
+        boards = [_new_board(config, seeds) for _ in range(len(batch))]
+        episodes = 0
+
+        for _ in range(400):
+            turn = [_steer(board, config.height, directions)
+                    for board in boards]
+            rewards, ended = batch.step(turn)
+            for index, board in enumerate(boards):
+                score = board.get_score()
+                board.single_turn(turn[index])
+                assert rewards[index] == board.get_score() - score
+                assert ended[index] == (not board.is_playing())
+                if not board.is_playing():
+                    boards[index] = _new_board(config, seeds)
+                    episodes += 1
+
+            assert [_state(board) for board in batch.get_boards()] == \
+                [_state(board) for board in boards]
+            assert list(batch.get_scores()) == \
+                [board.get_score() for board in boards]
+        assert batch.get_episodes() == episodes > 0
+
+
+def test_new_games_start_like_setup_game() -> None:
+    batch = BatchBitBoard(1, seed=5)
+    seed = random.Random(5).getrandbits(64)
+    game = BitBoard.from_game(engine.setup_game(None, seed))
+    assert _state(batch.get_boards()[0]) == _state(game)
+    assert list(batch.get_turns()) == [0]
@@ -0,0 +1,72 @@
+import random
+from typing import Any, Tuple
+
+import engine
+from bitboard import BitBoard, popcount
+from game import Game
+from game_config import GameConfig
+from snake import Direction
+
+DIRECTIONS = list(Direction) + [None] * 8
+
+
+def _state(bits: BitBoard) -> Tuple[Any, ...]:
+    return (bits.get_snake_mask(), bits.get_head_mask(),
+            bits.get_apples_mask(), bits.get_bombs_mask(),
+            bits.get_shockwave_mask(), bits.get_score(), bits.is_playing(),
+            bits.to_game().get_apples(), bits.to_game().get_bombs())
+
+
+def _game(seed: int, bombs: int) -> Game:
+    game = engine.setup_game(GameConfig(30, 20), seed)
+    for _ in range(bombs - 1):
+        game.create_bomb()
+    return game
+
+
+def test_bitboard_plays_exactly_like_the_game() -> None:
+    for seed in range(30):
+        directions = random.Random(seed)
+        game = _game(seed, 1 + seed % 8)
+        bits = BitBoard.from_game(game)
+        while game.is_playing():
+            direction = directions.choice(DIRECTIONS)
+            game.single_turn(direction)
+            bits.single_turn(direction)
+            assert _state(bits) == _state(BitBoard.from_game(game))
+            assert bits.to_game().get_random().getstate() == \
+                game.get_random().getstate()
+        assert not bits.is_playing()
+
+
+def test_conversion_round_trip_is_lossless() -> None:
+    for seed in range(30):
+        directions = random.Random(seed)
+        game = _game(seed, 1 + seed % 8)
+        for _ in range(directions.randrange(40)):
+            if game.is_playing():
+                game.single_turn(directions.choice(DIRECTIONS))
+        restored = BitBoard.from_game(game).to_game()
+
+        while game.is_playing():
+            direction = directions.choice(DIRECTIONS)
+            game.single_turn(direction)
+            restored.single_turn(direction)
+            assert restored.get_board().get_cells() == \
+                game.get_board().get_cells()
+            assert restored.get_score() == game.get_score()
+        assert not restored.is_playing()
+
+
+def test_random_empty_cell_matches_the_board() -> None:
+    for seed in range(30):
+        game = _game(seed, 8)
+        bits = BitBoard.from_game(game)
+        assert bits._random_empty_cell() == \
+            game.get_board().random_empty_cell(game.get_random())
+
+
+def test_popcount() -> None:
+    assert popcount(0) == 0
+    assert popcount(0b1011) == 3
+    assert popcount((1 << 5000) - 1) == 5000
@@ -0,0 +1,153 @@
+import random
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import engine
+from apple import Apple
+from board import Board
+from cell_table import CHUNK_BITS, CellTable
+from game import Game
+from game_config import GameConfig
+from snake import Direction
+
+DIRECTIONS = list(Direction) + [None] * 8  # type: List[Optional[Direction]]
+
+
+def _rebuild(game: Game) -> Board:
+    """
+    a board holding the elements of a game, built from scratch.
+    """
+    board = Board.from_config(game.get_config())
+    board.add_element(game.get_snake(), allow_overlap=True)
+    for element in game.get_apples() + game.get_bombs():
+        board.add_element(element, allow_overlap=True)
+    return board
+
+
+def _owners(board: Board) -> Dict[Tuple[int, int], List[int]]:
+    return {cell: sorted(id(element)
+                         for element in board.get_elements_at(cell))
+            for cell in board.get_cells()}
+
+
+def _assert_matches_rebuild(game: Game) -> None:
+    board = game.get_board()
+    rebuilt = _rebuild(game)
+    assert board.get_cells() == rebuilt.get_cells()
+    assert _owners(board) == _owners(rebuilt)
+    assert board.is_full() == rebuilt.is_full()
+
+
+def _games(count: int, config: Optional[GameConfig] = None):
+    for seed in range(count):
+        yield random.Random(seed), engine.setup_game(config, seed)
+
+
+def test_incremental_board_matches_rebuild() -> None:
+    for directions, game in _games(10):
+        board = game.get_board()
+        drawn = board.get_cells()
+        board.pop_changes()
+        while game.is_playing():
+            game.single_turn(directions.choice(DIRECTIONS))
+            _assert_matches_rebuild(game)
+
+            # the changesets replay the board.
+            changes = board.pop_changes()
+            for cell in changes.vacated:
+                del drawn[cell]
+            drawn.update(changes.occupied)
+            drawn.update(changes.recolored)
+            assert drawn == board.get_cells()
+
+
+def test_clones_match_rebuild() -> None:
+    # a board of a couple of pages of cells (see "CellTable").
+    for directions, game in _games(10, GameConfig(100, 50)):
+        clones = []  # type: List[Game]
+        while game.is_playing():
+            clones.append(game.clone())
+            game.single_turn(directions.choice(DIRECTIONS))
+            # the clones diverge from the game & from each other.
+            for clone in clones[-5:]:
+                if clone.is_playing():
+                    clone.single_turn(directions.choice(DIRECTIONS))
+                _assert_matches_rebuild(clone)
+            _assert_matches_rebuild(game)
+
+
+def test_random_empty_cell_ranks_empty_cells_column_by_column() -> None:
+    for directions, game in _games(5, GameConfig(70, 70)):
+        board = game.get_board()
+        while game.is_playing():
+            game.single_turn(directions.choice(DIRECTIONS))
+            occupied = board.get_cells()
+            empty = [cell for cell in board.cells_list()
+                     if cell not in occupied]
+            seed = directions.getrandbits(32)
+            expected = empty[random.Random(seed).randrange(len(empty))]
+            assert board.random_empty_cell(random.Random(seed)) == expected
+
+
+def test_random_empty_cell_of_a_full_board() -> None:
+    board = Board.from_config(GameConfig(2, 1))
+    for rank in range(2):
+        cell = board.random_empty_cell(random.Random(rank))
+        assert board.cell_is_empty(cell)
+        board.add_element(Apple(cell, 1))
+    assert board.is_full()
+    assert board.random_empty_cell() is None
+
+
+def _chunks(board: Board, cells: Iterable[Tuple[int, int]]) -> Set[int]:
+    return {(column * board.get_height() + row) >> CHUNK_BITS
+            for column, row in cells}
+
+
+def test_copied_table_copies_only_the_altered_chunks() -> None:
+    generator = random.Random(0)
+    length = height = 10000
+    table = CellTable(length, height)
+    cells = {(generator.randrange(length), generator.randrange(height))
+             for _ in range(5000)}
+    for cell in cells:
+        table.set(cell, 0)
+
+    for altered in (1, 10, 100):
+        copy = table.copy()
+        touched = generator.sample(sorted(cells), altered)
+        for cell in touched:
+            copy.set(cell, 1)
+        assert copy.get_copied_chunks() == \
+            {(column * height + row) >> CHUNK_BITS for column, row in touched}
+        assert table.get_copied_chunks() == set()
+        assert all(table.get(cell) == 0 for cell in cells)
+
+
+def test_clone_and_turn_copies_only_the_touched_chunks() -> None:
+    for size in ((40, 30), (512, 512)):
+        for directions, game in _games(3, GameConfig(*size)):
+            for _ in range(300):
+                if not game.is_playing():
+                    break
+                direction = directions.choice(DIRECTIONS)
+                before = game.get_board().get_cells()
+                clone = game.clone()
+                clone.single_turn(direction)
+                board = clone.get_board()
+                after = board.get_cells()
+
+                # the chunks of the changed cells are copied, & besides them
+                # only chunks of cells the elements occupied during the turn
+                # (e.g. the last ripple of a bomb which is over), never the
+                # rest of the board.
+                changed = {cell for cell in set(before) | set(after)
+                           if before.get(cell) != after.get(cell)}
+                touched = set(before) | set(after)
+                for bomb in game.get_bombs():
+                    touched.update(bomb.shockwave_ripples(
+                        bomb.get_radius() + 1))
+                copied = board.get_copied_chunks()
+                assert _chunks(board, changed) <= copied
+                assert copied <= _chunks(board, touched)
+                assert game.get_board().get_copied_chunks() == set()
+                game.single_turn(direction)
@@ -0,0 +1,72 @@
+import random
+from typing import List
+
+from bomb import Bomb
+from bomb_field import BombField, ring_mask
+
+LENGTH, HEIGHT = 20, 15
+
+
+def _masks(bombs: List[Bomb]) -> tuple:
+    """
+    the bitmasks of the un-detonated bombs & of the ripples, built from
+    scratch.
+    """
+    bombs_mask = shockwave_mask = 0
+    for bomb in bombs:
+        radius = bomb.get_radius() if bomb.is_detonated() else 0
+        mask = ring_mask(LENGTH, HEIGHT, bomb.get_location(), radius)
+        if bomb.is_detonated():
+            shockwave_mask |= mask
+        else:
+            bombs_mask |= mask
+    return bombs_mask, shockwave_mask
+
+
+def test_field_matches_bombs() -> None:
+    for seed in range(20):
+        generator = random.Random(seed)
+        field = BombField(LENGTH, HEIGHT)
+        bombs = []  # type: List[Bomb]
+        for _ in range(300):
+            taken = {bomb.get_location() for bomb in bombs}
+            while len(bombs) < 12:
+                location = (generator.randrange(LENGTH),
+                            generator.randrange(HEIGHT))
+                if location in taken:
+                    continue
+                taken.add(location)
+                bomb = Bomb(location, generator.randint(1, 6),
+                            generator.randint(2, 12))
+                bombs.append(bomb)
+                field.add(location, bomb.get_max_radius(),
+                          bomb.get_turns_until_explosion())
+
+            faded = field.step()
+            for bomb in bombs:
+                bomb.move()
+            assert faded == [index for index, bomb in enumerate(bombs)
+                             if bomb.attack_is_over()]
+            assert (field.get_bombs_mask(), field.get_shockwave_mask()) == \
+                _masks(bombs)
+
+            for index in reversed(faded):
+                field.remove(index)
+                del bombs[index]
+            # an occasional bomb is removed before it fades.
+            if bombs and generator.random() < 0.1:
+                index = generator.randrange(len(bombs))
+                field.remove(index)
+                del bombs[index]
+
+            assert [field.get(index) for index in range(len(field))] == \
+                [(bomb.get_location(), bomb.get_max_radius(),
+                  bomb.get_turns_until_explosion(), bomb.is_detonated(),
+                  bomb.get_radius() if bomb.is_detonated() else 0)
+                 for bomb in bombs]
+            assert (field.get_bombs_mask(), field.get_shockwave_mask()) == \
+                _masks(bombs)
+
+            copy = field.copy()
+            assert [copy.get(index) for index in range(len(copy))] == \
+                [field.get(index) for index in range(len(field))]
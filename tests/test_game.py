@@ -0,0 +1,58 @@
+import engine
+from apple import Apple
+from bitboard import BitBoard
+from bomb import Bomb
+from events import AppleEaten, BoardFull, SnakeGrew
+from game import Game
+from game_config import GameConfig
+from random_stream import RandomStream
+from snake import Snake, Direction
+
+
+def _filling_game() -> Game:
+    """
+    a 3x3 game whose next turn eats the last apple that fits the board,
+    while a shock-wave reaches the snake.
+    """
+    config = GameConfig(length=3, height=3)
+    snake = Snake.from_body([(2, 0), (2, 1), (2, 2), (1, 2)],
+                            Direction.LEFT, 1)
+    apples = [Apple(cell, 1) for cell in ((0, 2), (0, 1), (1, 0), (0, 0))]
+    bombs = [Bomb.restore((1, 1), 3, Bomb.EXPLOSION_THRESHOLD, True, 0)]
+    return Game.restore(config, snake, apples, bombs, 0, True,
+                        RandomStream(0))
+
+
+def test_turn_ends_once_the_board_is_full() -> None:
+    game = _filling_game()
+    events = []
+    game.add_sink(events.append)
+
+    game.single_turn(None)
+
+    assert not game.is_playing()
+    assert game.get_death_cause() == Game.BOARD_FULL
+    assert events == [SnakeGrew(5), AppleEaten((0, 2), 1), BoardFull()]
+
+
+def test_bitboard_turn_ends_once_the_board_is_full() -> None:
+    bits = BitBoard.from_game(_filling_game())
+
+    bits.single_turn(None)
+
+    assert not bits.is_playing()
+    assert bits.get_score() == 1
+    # the shock-wave was never advanced.
+    assert not bits.get_shockwave_mask() & bits.get_snake_mask()
+
+
+def test_snake_which_does_not_fit_the_board_crashes_into_a_wall() -> None:
+    for size in ((3, 3), (40, 3), (5, 2), (1, 1)):
+        config = GameConfig(*size)
+        result = engine.run(0, [None] * 5, config=config)
+        assert result.turns == 0
+        assert result.death_cause == Game.WALL_CRASH
+
+        bits = BitBoard(config, 0)
+        bits.create_snake()
+        assert not bits.is_playing()
@@ -0,0 +1,48 @@
+import random
+
+import engine
+from arena import Arena
+from game_config import GameConfig
+from profiler import Profiler
+from snake import Direction
+
+
+def _directions(seed: int, turns: int) -> list:
+    generator = random.Random(seed)
+    return [generator.choice(list(Direction) + [None] * 8)
+            for _ in range(turns)]
+
+
+def test_profiling_does_not_change_the_game() -> None:
+    for seed in range(20):
+        directions = _directions(seed, 300)
+        profiler = Profiler()
+
+        plain = engine.run(seed, directions)
+        profiled = engine.run(seed, directions, profiler=profiler)
+
+        assert profiled == plain
+        phases = profiler.get_phases()
+        assert phases["turn"].get_calls() == plain.turns
+        assert phases["move"].get_calls() == plain.turns
+        assert phases["direction"].get_calls() == plain.turns
+
+
+def test_arena_turns_are_profiled() -> None:
+    arena = Arena(GameConfig(30, 30), 7)
+    snake_ids = [arena.add_snake() for _ in range(4)]
+    arena.create_bomb()
+    for _ in range(3):
+        arena.create_apple()
+    profiler = Profiler()
+    arena.set_profiler(profiler)
+
+    turns = 0
+    while arena.is_playing() and turns < 50:
+        arena.single_turn({snake_id: None for snake_id in snake_ids})
+        turns += 1
+
+    phases = profiler.get_phases()
+    assert phases["turn"].get_calls() == turns
+    assert phases["move"].get_calls() == turns
+    assert phases["collide"].get_calls() == turns
@@ -0,0 +1,118 @@
+import os
+import random
+from typing import Any, List, Optional, Tuple
+
+import engine
+from game import Game
+from game_config import GameConfig
+from replay import TRAILER, ReplayHeader, ReplayReader, ReplayWriter, \
+    directions
+from snake import Direction
+
+STEPS = {
+    Direction.UP: (0, 1),
+    Direction.DOWN: (0, -1),
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+}
+
+
+def _steer(game: Game, generator: random.Random) -> Optional[Direction]:
+    """
+    pick a random direction which keeps the snake within the board & out of
+    its own body, if there is any.
+    """
+    config = game.get_config()
+    snake = game.get_snake()
+    column, row = snake.get_head()
+    safe = [direction for direction, (step_column, step_row) in STEPS.items()
+            if 0 <= column + step_column < config.length and
+            0 <= row + step_row < config.height and
+            (column + step_column, row + step_row)
+            not in snake.get_coordinates()]
+    return generator.choice(safe) if safe else None
+
+
+def _state(game: Game) -> Tuple[Any, ...]:
+    snake = game.get_snake()
+    return (list(snake.get_coordinates()), snake.get_direction(),
+            snake.get_growth_counter(),
+            [(apple.get_coordinates(), apple.get_score())
+             for apple in game.get_apples()],
+            [(bomb.get_location(), bomb.get_max_radius(),
+              bomb.get_turns_until_explosion(), bomb.is_detonated(),
+              bomb.get_radius()) for bomb in game.get_bombs()],
+            game.get_score(), game.is_playing(),
+            game.get_random().getstate(), game.get_board().get_cells())
+
+
+CONFIG = GameConfig(12, 10, bomb_times=(2, 8), apples=5)
+
+
+def _record(path: str, seed: int) -> List[Tuple[Any, ...]]:
+    """
+    record a game, keyframing it every 8 turns.
+
+    :return: the states of the game before each turn & the final state.
+    """
+    generator = random.Random(seed)
+    game = engine.setup_game(CONFIG, seed)
+    states = []  # type: List[Tuple[Any, ...]]
+    with ReplayWriter(path, ReplayHeader(seed, CONFIG), 8) as writer:
+        while game.is_playing():
+            direction = _steer(game, generator)
+            states.append(_state(game))
+            writer.record(game, direction)
+            game.single_turn(direction)
+    states.append(_state(game))
+    return states
+
+
+def test_seek_matches_the_live_game(tmp_path) -> None:
+    path = str(tmp_path / "game.replay")
+    for seed in range(8):
+        states = _record(path, seed)
+
+        with ReplayReader(path) as reader:
+            assert reader.get_turns() == len(states) - 1
+            turns = list(directions(reader.codes()))
+            for turn, state in enumerate(states):
+                seeked = reader.seek(turn)
+                assert _state(seeked) == state
+                # the restored game goes on exactly like the live game.
+                for direction, later in zip(turns[turn:turn + 3],
+                                            states[turn + 1:]):
+                    seeked.single_turn(direction)
+                    assert _state(seeked) == later
+
+
+def test_file_which_was_not_closed_is_recovered(tmp_path) -> None:
+    path = str(tmp_path / "game.replay")
+    # a game long enough to be cut within several keyframe intervals.
+    states = next(states for states in map(lambda seed: _record(path, seed),
+                                           range(100))
+                  if len(states) > 60)
+    with ReplayReader(path) as reader:
+        codes = reader.codes()
+    with open(path, "rb") as replay_file:
+        data = replay_file.read()
+    index_offset = TRAILER.unpack(data[-TRAILER.size:])[0]
+
+    # the writer was killed while writing the index, before it, or while
+    # writing turns or keyframes.
+    cuts = [index_offset + 5, index_offset - 1] + random.Random(0).sample(
+        range(index_offset - 200, index_offset - 1), 20)
+    for cut in cuts:
+        killed = str(tmp_path / "killed.replay")
+        with open(killed, "wb") as replay_file:
+            replay_file.write(data[:cut])
+
+        with ReplayReader(killed) as reader:
+            recovered = reader.codes()
+            assert codes.startswith(recovered)
+            assert reader.get_turns() == len(recovered)
+            if cut >= index_offset - 1:
+                assert recovered == codes
+            for turn in range(0, len(recovered) + 1, 5):
+                assert _state(reader.seek(turn)) == states[turn]
+        os.remove(killed)